@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
 
 
 class CommonConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'common'
+
+    def ready(self):
+        from .pooling import close_unusable_connections
+
+        request_started.connect(close_unusable_connections, dispatch_uid='close_unusable_connections')
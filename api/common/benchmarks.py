@@ -0,0 +1,205 @@
+import json
+import math
+import random
+import time
+
+from django.db import connection
+from django.db.models import Max
+from django.core.management.color import no_style
+from django.test.utils import CaptureQueriesContext
+
+import factory.random
+from rest_framework.test import APIClient
+
+from common.test.factories import SettingGroupFactory, SettingItemFactory
+from product.models import Product, ProductColor, Option, ProductImage
+from product.test.factories import (
+    SubCategoryFactory, ProductFactory, ColorFactory, ProductColorFactory, OptionFactory, ProductImageFactory, TagFactory,
+)
+from user.models import Shopper, Cart, ProductLike, ShopperCoupon
+from user.test.factories import ShopperFactory, WholesalerFactory, ShopperCouponFactory
+from order.models import NORMAL_STATUS, PAYMENT_COMPLETION_STATUS, Order, OrderItem
+from order.payloads import get_order_payload
+from order.test.factories import OrderFactory, OrderItemFactory, ShippingAddressFactory, StatusFactory
+from coupon.models import ALL_PRODUCT_COUPON_CLASSIFICATIONS, Coupon
+from coupon.test.factories import CouponFactory, CouponClassificationFactory
+
+
+BENCHMARK_SEED = 20220301
+BENCHMARK_PRODUCT_SIZE = 100
+BULK_CREATE_BATCH_SIZE = 1000
+
+
+def _bulk_create(model, objects):
+    first_id = (model.objects.aggregate(max_id=Max('id'))['max_id'] or 0) + 1
+    for index, obj in enumerate(objects):
+        obj.id = first_id + index
+    model.objects.bulk_create(objects, batch_size=BULK_CREATE_BATCH_SIZE)
+
+    sequence_reset_sql = connection.ops.sequence_reset_sql(no_style(), [model])
+    if sequence_reset_sql:
+        with connection.cursor() as cursor:
+            for sql in sequence_reset_sql:
+                cursor.execute(sql)
+
+    return objects
+
+
+def seed_benchmark_data(scale=1, seed=BENCHMARK_SEED):
+    random.seed(seed)
+    factory.random.reseed_random(seed)
+
+    style = SettingItemFactory(group__main_key='style')
+    target_age_group = SettingItemFactory(group__main_key='target_age_group')
+    sizes = SettingItemFactory.create_batch(4, group=SettingGroupFactory(main_key='sizes'))
+    colors = ColorFactory.create_batch(8)
+    sub_categories = SubCategoryFactory.create_batch(5)
+    wholesalers = WholesalerFactory.create_batch(3)
+    tags = TagFactory.create_batch(10)
+
+    products = _bulk_create(Product, [
+        ProductFactory.build(
+            wholesaler=wholesalers[i % len(wholesalers)], sub_category=sub_categories[i % len(sub_categories)],
+            style=style, target_age_group=target_age_group, name='benchmark product {}'.format(i),
+        )
+        for i in range(BENCHMARK_PRODUCT_SIZE * scale)
+    ])
+    Product.tags.through.objects.bulk_create([
+        Product.tags.through(product_id=product.id, tag_id=tags[index % len(tags)].id) for index, product in enumerate(products)
+    ], batch_size=BULK_CREATE_BATCH_SIZE)
+    _bulk_create(ProductImage, [
+        ProductImageFactory.build(product=product, sequence=sequence) for product in products for sequence in range(1, 6)
+    ])
+    product_colors = _bulk_create(ProductColor, [
+        ProductColorFactory.build(product=product, color=colors[(product.id + i) % len(colors)])
+        for product in products for i in range(2)
+    ])
+    options = _bulk_create(Option, [
+        OptionFactory.build(product_color=product_color, size=size) for product_color in product_colors for size in sizes
+    ])
+
+    shopper = ShopperFactory(point=10000000)
+    shipping_address = ShippingAddressFactory()
+    statuses = {status_id: StatusFactory(id=status_id) for status_id in NORMAL_STATUS}
+
+    _bulk_create(Cart, [Cart(shopper=shopper, option=option, count=1) for option in options[::max(len(options) // 20, 1)][:20]])
+    ProductLike.objects.bulk_create([ProductLike(shopper=shopper, product=product) for product in products[:20]])
+
+    orders = _bulk_create(Order, [
+        OrderFactory.build(shopper=shopper, shipping_address=shipping_address, number='B{:012d}'.format(i))
+        for i in range(30 * scale)
+    ])
+    _bulk_create(OrderItem, [
+        OrderItemFactory.build(
+            order=order, option=options[(order.id * 3 + i) % len(options)], status=statuses[PAYMENT_COMPLETION_STATUS],
+            shopper_coupon=None,
+        )
+        for order in orders for i in range(3)
+    ])
+
+    all_product_coupon_classification = CouponClassificationFactory(id=ALL_PRODUCT_COUPON_CLASSIFICATIONS[0])
+    coupons = _bulk_create(Coupon, [
+        CouponFactory.build(classification=all_product_coupon_classification, is_auto_issue=False) for _ in range(20 * scale)
+    ])
+    _bulk_create(ShopperCoupon, [ShopperCouponFactory.build(shopper=shopper, coupon=coupon, is_used=False) for coupon in coupons[:10]])
+
+    return {
+        'shopper': shopper,
+        'shipping_address': shipping_address,
+        'product': products[len(products) // 2],
+        'order_options': options[:3],
+    }
+
+
+class Endpoint:
+    def __init__(self, name, method, path, data=None, user=None):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.data = data
+        self.user = user
+
+    def request(self, client):
+        client.force_authenticate(user=self.user)
+        data = self.data() if callable(self.data) else self.data
+
+        return getattr(client, self.method)(self.path, data, format='json' if self.method == 'post' else None)
+
+
+def get_benchmark_endpoints(seed_data):
+    shopper = seed_data['shopper']
+
+    def get_order_data():
+        return get_order_payload(
+            seed_data['shipping_address'], seed_data['order_options'], Shopper.objects.select_related('membership').get(id=shopper.id)
+        )
+
+    return [
+        Endpoint('products-list', 'get', '/products'),
+        Endpoint('products-retrieve', 'get', '/products/{}'.format(seed_data['product'].id)),
+        Endpoint('products-search', 'get', '/products', {'search_word': 'product 1'}),
+        Endpoint('orders-create', 'post', '/orders', get_order_data, shopper),
+        Endpoint('orders-list', 'get', '/orders', user=shopper),
+        Endpoint('carts-list', 'get', '/users/shoppers/carts', user=shopper),
+        Endpoint('coupons-list', 'get', '/coupons', user=shopper),
+    ]
+
+
+def get_percentile(values, percentile):
+    values = sorted(values)
+
+    return values[max(math.ceil(len(values) * percentile / 100) - 1, 0)]
+
+
+def run_endpoint_benchmark(endpoint, repeat, warm_up=1, client=None):
+    client = client or APIClient()
+    for _ in range(warm_up):
+        endpoint.request(client)
+
+    durations, query_counts = [], []
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as context:
+            start_time = time.perf_counter()
+            response = endpoint.request(client)
+            durations.append((time.perf_counter() - start_time) * 1000)
+        if response.status_code >= 400:
+            raise RuntimeError('{} responded with {}: {}'.format(endpoint.name, response.status_code, response.content[:200]))
+        query_counts.append(len(context.captured_queries))
+
+    return {
+        'p50_ms': round(get_percentile(durations, 50), 2),
+        'p95_ms': round(get_percentile(durations, 95), 2),
+        'query_count': max(query_counts),
+    }
+
+
+def compare_with_baseline(results, baseline, latency_tolerance=None):
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+
+        if result['query_count'] > baseline[name]['query_count']:
+            regressions.append('{}: query count {} exceeds the baseline {}.'.format(
+                name, result['query_count'], baseline[name]['query_count']
+            ))
+        if latency_tolerance is not None and result['p95_ms'] > baseline[name]['p95_ms'] * (1 + latency_tolerance):
+            regressions.append('{}: p95 latency {:.2f}ms exceeds the baseline {:.2f}ms by more than {:.0%}.'.format(
+                name, result['p95_ms'], baseline[name]['p95_ms'], latency_tolerance
+            ))
+
+    return regressions
+
+
+def read_baseline(path):
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+def write_baseline(path, results):
+    with open(path, 'w') as file:
+        json.dump(results, file, indent=4, sort_keys=True)
+        file.write('\n')
@@ -0,0 +1,36 @@
+import math
+from hashlib import blake2b
+
+
+class BloomFilter:
+    def __init__(self, capacity, false_positive_rate=0.01):
+        if capacity < 1:
+            raise ValueError('capacity must be greater than 0.')
+        elif not 0 < false_positive_rate < 1:
+            raise ValueError('false_positive_rate must be between 0 and 1.')
+
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self.size = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.number_of_hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self.__bits = bytearray((self.size + 7) // 8)
+
+    def __get_positions(self, value):
+        digest = blake2b(value.encode(), digest_size=16).digest()
+        first_hash = int.from_bytes(digest[:8], 'big')
+        second_hash = int.from_bytes(digest[8:], 'big') | 1
+
+        return ((first_hash + i * second_hash) % self.size for i in range(self.number_of_hashes))
+
+    def add(self, value):
+        for position in self.__get_positions(value):
+            self.__bits[position >> 3] |= 1 << (position & 7)
+
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(self.__bits[position >> 3] & (1 << (position & 7)) for position in self.__get_positions(value))
+
+    def get_estimated_false_positive_rate(self):
+        return (1 - math.exp(-self.number_of_hashes * self.count / self.size)) ** self.number_of_hashes
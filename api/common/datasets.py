@@ -0,0 +1,376 @@
+import csv
+import time
+import random
+import tempfile
+from array import array
+from datetime import datetime, timedelta
+
+from django.db import connection, transaction
+from django.db.models import Max
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+
+from common.models import SettingGroup, SettingItem
+from product.models import MainCategory, SubCategory, Color, Product, ProductColor, Option, ProductImage
+from user.models import Membership, User, Shopper, Wholesaler, ProductLike, Cart
+from order.models import NORMAL_STATUS, Status, ShippingAddress, Order, OrderItem, StatusHistory
+
+
+DEFAULT_DATASET_SIZES = {
+    'wholesalers': 20,
+    'products': 2000,
+    'shoppers': 2000,
+    'orders': 5000,
+    'product_likes': 20000,
+    'carts': 6000,
+}
+DATASET_PASSWORD = 'dataset_Password'
+DATASET_END_DATETIME = datetime(2022, 3, 1)
+DATASET_PERIOD_SECONDS = 365 * 24 * 60 * 60
+DEFAULT_DATASET_CHUNK_SIZE = 5000
+
+
+def get_dataset_sizes(scale=1, factors=None):
+    factors = factors or {}
+
+    return {key: max(int(size * scale * factors.get(key, 1)), 1) for key, size in DEFAULT_DATASET_SIZES.items()}
+
+
+class InsertWriter:
+    def __init__(self):
+        self.row_counts = {}
+        self.durations = {}
+
+    def _get_columns(self, model):
+        return list(model._meta.local_concrete_fields)
+
+    def _can_bulk_create(self, model, fields):
+        # bulk_create() can't insert the rows of a child table and overwrites auto_now values with the current time.
+        return not model._meta.parents and not any(
+            getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False) for field in fields
+        )
+
+    def _prepare(self, fields, rows):
+        converters = [
+            (lambda value, field=field: field.get_db_prep_save(value, connection))
+            if field.get_internal_type() in ('DateTimeField', 'DateField', 'BooleanField') else None
+            for field in fields
+        ]
+
+        return [
+            [
+                value if converter is None else converter(value)
+                for value, converter in zip([row.get(field.attname, field.get_default()) for field in fields], converters)
+            ]
+            for row in rows
+        ]
+
+    def _insert(self, model, fields, rows):
+        if self._can_bulk_create(model, fields):
+            model.objects.bulk_create([model(**row) for row in rows])
+            return
+
+        rows = self._prepare(fields, rows)
+        quote_name = connection.ops.quote_name
+        batch_size = max(connection.ops.bulk_batch_size(fields, rows), 1)
+        sql = 'INSERT INTO {} ({}) VALUES '.format(
+            quote_name(model._meta.db_table), ', '.join(quote_name(field.column) for field in fields)
+        )
+        placeholder = '({})'.format(', '.join(['%s'] * len(fields)))
+
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                cursor.execute(sql + ', '.join([placeholder] * len(batch)), [value for row in batch for value in row])
+
+    def write(self, model, rows):
+        if not rows:
+            return
+
+        fields = self._get_columns(model)
+        start_time = time.perf_counter()
+        self._insert(model, fields, rows)
+        self.durations[model] = self.durations.get(model, 0) + time.perf_counter() - start_time
+        self.row_counts[model] = self.row_counts.get(model, 0) + len(rows)
+
+    def reset_sequences(self):
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), list(self.row_counts.keys())):
+                cursor.execute(sql)
+
+
+class LoadDataWriter(InsertWriter):
+    def __get_csv_value(self, value):
+        if value is None:
+            return '\\N'
+        elif isinstance(value, bool):
+            return int(value)
+        elif isinstance(value, str):
+            return value.replace('\\', '\\\\')
+
+        return value
+
+    def _insert(self, model, fields, rows):
+        quote_name = connection.ops.quote_name
+        rows = self._prepare(fields, rows)
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', newline='') as file:
+            writer = csv.writer(file, lineterminator='\n')
+            for row in rows:
+                writer.writerow([self.__get_csv_value(value) for value in row])
+            file.flush()
+
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "LOAD DATA LOCAL INFILE %s INTO TABLE {} CHARACTER SET utf8mb4 FIELDS TERMINATED BY ',' "
+                    "OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' ({})".format(
+                        quote_name(model._meta.db_table), ', '.join(quote_name(field.column) for field in fields)
+                    ),
+                    [file.name],
+                )
+
+
+class DatasetGenerator:
+    """
+    Build consistent object graphs as rows keyed by attname and write them in chunks, each committed on its own.
+
+    Ids are assigned from the current maximum of each table, so rows of different tables can reference each other
+    before they are written and no row has to be read back. Every random choice comes from one seeded generator.
+    """
+    def __init__(self, sizes, seed=0, chunk_size=DEFAULT_DATASET_CHUNK_SIZE, writer=None):
+        self.sizes = sizes
+        self.random = random.Random(seed)
+        self.chunk_size = chunk_size
+        self.writer = writer or InsertWriter()
+        self.__next_ids = {}
+
+    def __get_ids(self, model, size):
+        if model not in self.__next_ids:
+            self.__next_ids[model] = (model.objects.aggregate(max_id=Max('pk'))['max_id'] or 0) + 1
+
+        first_id = self.__next_ids[model]
+        self.__next_ids[model] += size
+
+        return range(first_id, first_id + size)
+
+    def __get_datetime(self):
+        return DATASET_END_DATETIME - timedelta(seconds=self.random.randrange(DATASET_PERIOD_SECONDS))
+
+    def __get_chunks(self, size):
+        for start in range(0, size, self.chunk_size):
+            yield min(self.chunk_size, size - start)
+
+    def __get_setting_items(self, main_key, names):
+        items = list(SettingItem.objects.filter(group__main_key=main_key).values_list('id', flat=True))
+        if items:
+            return items
+
+        group = SettingGroup.objects.create(app='product', main_key=main_key, name='dataset_{}'.format(main_key))
+        return [SettingItem.objects.create(group=group, name=name).id for name in names]
+
+    def __prepare_reference_data(self):
+        if not SubCategory.objects.exists():
+            main_category = MainCategory.objects.create(name='dataset', image_url='category/dataset.svg')
+            SubCategory.objects.bulk_create([SubCategory(main_category=main_category, name='dataset_{}'.format(i)) for i in range(5)])
+        if not Color.objects.exists():
+            Color.objects.bulk_create([
+                Color(name='dataset_color_{}'.format(i), default_image_url='color/{}.svg'.format(i), checked_image_url='color/check_{}.svg'.format(i))
+                for i in range(8)
+            ])
+        if not Membership.objects.exists():
+            Membership.objects.create(id=1, name='NEW', qualification='NEW', discount_rate=1)
+        Status.objects.bulk_create([Status(id=status_id, name=str(status_id)) for status_id in NORMAL_STATUS], ignore_conflicts=True)
+
+        self.__sub_category_ids = list(SubCategory.objects.order_by('id').values_list('id', flat=True))
+        self.__colors = list(Color.objects.order_by('id').values_list('id', 'name'))
+        self.__size_ids = self.__get_setting_items('sizes', ['XS', 'S', 'M', 'L', 'XL'])
+        self.__style_ids = self.__get_setting_items('style', ['casual'])
+        self.__target_age_group_ids = self.__get_setting_items('target_age_group', ['20s'])
+        self.__memberships = dict(Membership.objects.values_list('id', 'discount_rate'))
+        self.__password = make_password(DATASET_PASSWORD)
+
+    def __get_user_rows(self, ids):
+        rows = []
+        for id in ids:
+            created_at = self.__get_datetime()
+            rows.append({
+                'id': id, 'password': self.__password, 'last_login': None, 'username': 'dataset_{}'.format(id), 'is_admin': False,
+                'is_active': True, 'last_update_password': created_at, 'created_at': created_at, 'deleted_at': None,
+            })
+
+        return rows
+
+    def __generate_wholesalers(self):
+        ids = self.__get_ids(User, self.sizes['wholesalers'])
+        with transaction.atomic():
+            self.writer.write(User, self.__get_user_rows(ids))
+            self.writer.write(Wholesaler, [
+                {
+                    'user_id': id, 'name': 'dataset wholesaler {}'.format(id), 'mobile_number': '019{:08d}'.format(id),
+                    'phone_number': '029{:08d}'.format(id), 'email': 'wholesaler{}@omios.com'.format(id),
+                    'company_registration_number': '{:012d}'.format(id), 'business_registration_image_url': 'business_registration/dataset.jpeg',
+                    'zip_code': '04568', 'base_address': '서울특별시 중구 다산로 293', 'detail_address': '디오트 1층', 'is_approved': True,
+                }
+                for id in ids
+            ])
+        self.__wholesaler_ids = list(ids)
+
+    def __generate_shoppers(self):
+        membership_ids = list(self.__memberships.keys())
+        self.__shopper_ids = array('q')
+        self.__shopper_discount_rates = array('b')
+
+        for size in self.__get_chunks(self.sizes['shoppers']):
+            ids = self.__get_ids(User, size)
+            shopper_rows = []
+            for id in ids:
+                membership_id = self.random.choice(membership_ids)
+                shopper_rows.append({
+                    'user_id': id, 'membership_id': membership_id, 'name': 'shopper {}'.format(id), 'nickname': 'ds_shopper_{}'.format(id),
+                    'mobile_number': '019{:08d}'.format(id), 'email': 'shopper{}@omios.com'.format(id), 'gender': self.random.random() < 0.5,
+                    'birthday': datetime(1980 + self.random.randrange(25), 1 + self.random.randrange(12), 1 + self.random.randrange(28)).date(),
+                    'height': None, 'weight': None, 'point': self.random.randrange(0, 10000, 100),
+                })
+                self.__shopper_ids.append(id)
+                self.__shopper_discount_rates.append(self.__memberships[membership_id])
+
+            with transaction.atomic():
+                self.writer.write(User, self.__get_user_rows(ids))
+                self.writer.write(Shopper, shopper_rows)
+
+    def __get_product_row(self, id):
+        price = self.random.randrange(10000, 500000, 100)
+        sale_price = price * 2
+        base_discount_rate = self.random.randrange(0, 51)
+        base_discounted_price = sale_price - int(sale_price * base_discount_rate / 100) // 100 * 100
+
+        return {
+            'id': id, 'wholesaler_id': self.random.choice(self.__wholesaler_ids), 'sub_category_id': self.random.choice(self.__sub_category_ids),
+            'style_id': self.random.choice(self.__style_ids), 'target_age_group_id': self.random.choice(self.__target_age_group_ids),
+            'name': 'product {}'.format(id), 'code': 'AA', 'created_at': self.__get_datetime(), 'price': price, 'sale_price': sale_price,
+            'base_discount_rate': base_discount_rate, 'base_discounted_price': base_discounted_price,
+            'on_sale': self.random.random() < 0.95, 'additional_information_id': None, 'manufacturing_country': '대한민국',
+        }
+
+    def __generate_products(self):
+        self.__product_ids = array('q')
+        self.__product_prices = array('q')
+        self.__option_ids = array('q')
+        self.__option_product_indexes = array('q')
+
+        for size in self.__get_chunks(self.sizes['products']):
+            product_rows, color_rows, option_rows, image_rows = [], [], [], []
+            for id in self.__get_ids(Product, size):
+                product_row = self.__get_product_row(id)
+                product_rows.append(product_row)
+                self.__product_ids.append(id)
+                self.__product_prices.append(product_row['base_discounted_price'])
+
+                image_count = self.random.randint(3, 6)
+                for image_id, sequence in zip(self.__get_ids(ProductImage, image_count), range(1, image_count + 1)):
+                    image_rows.append({
+                        'id': image_id, 'product_id': id, 'image_url': 'product/sample/product_{}.jpg'.format(sequence), 'sequence': sequence,
+                    })
+
+                colors = self.random.sample(self.__colors, min(self.random.randint(1, 3), len(self.__colors)))
+                for product_color_id, (color_id, color_name) in zip(self.__get_ids(ProductColor, len(colors)), colors):
+                    color_rows.append({
+                        'id': product_color_id, 'product_id': id, 'color_id': color_id, 'display_color_name': color_name[:20],
+                        'image_url': 'product/sample/product_1.jpg', 'on_sale': True,
+                    })
+
+                    size_ids = self.random.sample(self.__size_ids, min(self.random.randint(3, 5), len(self.__size_ids)))
+                    for option_id, size_id in zip(self.__get_ids(Option, len(size_ids)), size_ids):
+                        option_rows.append({'id': option_id, 'product_color_id': product_color_id, 'size_id': size_id, 'on_sale': True})
+                        self.__option_ids.append(option_id)
+                        self.__option_product_indexes.append(len(self.__product_ids) - 1)
+
+            with transaction.atomic():
+                self.writer.write(Product, product_rows)
+                self.writer.write(ProductImage, image_rows)
+                self.writer.write(ProductColor, color_rows)
+                self.writer.write(Option, option_rows)
+
+    def __generate_orders(self):
+        statuses = NORMAL_STATUS
+
+        for size in self.__get_chunks(self.sizes['orders']):
+            address_rows, order_rows, item_rows, history_rows = [], [], [], []
+            order_ids = self.__get_ids(Order, size)
+            for order_id, address_id in zip(order_ids, self.__get_ids(ShippingAddress, size)):
+                shopper_index = self.random.randrange(len(self.__shopper_ids))
+                created_at = self.__get_datetime()
+                address_rows.append({
+                    'id': address_id, 'receiver_name': '수령인', 'mobile_number': '019{:08d}'.format(order_id % 100000000), 'phone_number': None,
+                    'zip_code': '04568', 'base_address': '서울특별시 중구 다산로 293', 'detail_address': '디오트 1층',
+                    'shipping_message': '부재 시 집 앞에 놔주세요.',
+                })
+                order_rows.append({
+                    'id': order_id, 'number': '{}{:010d}'.format(created_at.strftime('%Y%m%d'), order_id),
+                    'shopper_id': self.__shopper_ids[shopper_index], 'shipping_address_id': address_id, 'created_at': created_at,
+                })
+
+                item_count = self.random.randint(1, 4)
+                for item_id in self.__get_ids(OrderItem, item_count):
+                    option_index = self.random.randrange(len(self.__option_ids))
+                    base_discounted_price = self.__product_prices[self.__option_product_indexes[option_index]]
+                    count = self.random.randint(1, 3)
+                    membership_discount_price = base_discounted_price * self.__shopper_discount_rates[shopper_index] // 100 * count
+                    payment_price = base_discounted_price * count - membership_discount_price
+                    status_index = self.random.randrange(len(statuses))
+
+                    item_rows.append({
+                        'id': item_id, 'order_id': order_id, 'option_id': self.__option_ids[option_index], 'status_id': statuses[status_index],
+                        'count': count, 'sale_price': base_discounted_price * count, 'base_discount_price': 0,
+                        'membership_discount_price': membership_discount_price, 'shopper_coupon_id': None, 'coupon_discount_price': 0,
+                        'used_point': 0, 'payment_price': payment_price, 'earned_point': payment_price // 100, 'delivery_id': None,
+                    })
+                    for history_id, status_id in zip(self.__get_ids(StatusHistory, status_index + 1), statuses[:status_index + 1]):
+                        history_rows.append({'id': history_id, 'order_item_id': item_id, 'status_id': status_id, 'created_at': created_at})
+
+            with transaction.atomic():
+                self.writer.write(ShippingAddress, address_rows)
+                self.writer.write(Order, order_rows)
+                self.writer.write(OrderItem, item_rows)
+                self.writer.write(StatusHistory, history_rows)
+
+    def __generate_shopper_relations(self, model, size, targets, get_row):
+        average = size / len(self.__shopper_ids)
+        rows = []
+        for shopper_id in self.__shopper_ids:
+            count = min(int(self.random.uniform(0, average * 2) + 0.5), len(targets))
+            for row_id, target in zip(self.__get_ids(model, count), self.random.sample(range(len(targets)), count)):
+                rows.append(get_row(row_id, shopper_id, targets[target]))
+
+            if len(rows) >= self.chunk_size:
+                with transaction.atomic():
+                    self.writer.write(model, rows)
+                rows = []
+        with transaction.atomic():
+            self.writer.write(model, rows)
+
+    def __generate_product_likes(self):
+        self.__generate_shopper_relations(
+            ProductLike, self.sizes['product_likes'], self.__product_ids,
+            lambda id, shopper_id, product_id: {'id': id, 'shopper_id': shopper_id, 'product_id': product_id, 'created_at': self.__get_datetime()},
+        )
+
+    def __generate_carts(self):
+        self.__generate_shopper_relations(
+            Cart, self.sizes['carts'], self.__option_ids,
+            lambda id, shopper_id, option_id: {
+                'id': id, 'option_id': option_id, 'shopper_id': shopper_id, 'created_at': self.__get_datetime(),
+                'count': self.random.randint(1, 5), 'added_base_discounted_price': None,
+            },
+        )
+
+    def generate(self):
+        self.__prepare_reference_data()
+        self.__generate_wholesalers()
+        self.__generate_shoppers()
+        self.__generate_products()
+        self.__generate_orders()
+        self.__generate_product_likes()
+        self.__generate_carts()
+        self.writer.reset_sequences()
+
+        return self.writer.row_counts
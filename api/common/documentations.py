@@ -1,4 +1,4 @@
-from rest_framework.serializers import Serializer, IntegerField, BooleanField, CharField, ListField, URLField
+from rest_framework.serializers import Serializer, IntegerField, BooleanField, CharField, ListField, URLField, DictField
 
 
 class IdResponse(Serializer):
@@ -29,6 +29,20 @@ class Image(Serializer):
     image = ListField(child=URLField())
 
 
+class ImageVariants(Serializer):
+    w360 = URLField(help_text='너비 360px 이하로 축소한 이미지')
+    w720 = URLField(help_text='너비 720px 이하로 축소한 이미지')
+
+    class Meta:
+        ref_name = None
+
+
+class PresignedPost(Serializer):
+    url = URLField()
+    fields = DictField(child=CharField(), help_text='multipart/form-data 요청에 파일보다 먼저 포함해야 하는 필드')
+    image_url = CharField()
+
+
 def get_response(serializer=IdResponse(), code=200):    
     class Response(DefaultResponse):
         data = serializer
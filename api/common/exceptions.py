@@ -2,4 +2,15 @@ from rest_framework.exceptions import APIException
 
 
 class NotExcutableValidationError(APIException):
-    default_detail = 'This serializer cannot validate.'
\ No newline at end of file
+    default_detail = 'This serializer cannot validate.'
+
+class ImageUploadError(APIException):
+    status_code = 503
+    default_detail = 'Some images could not be uploaded, please try again later.'
+
+    def __init__(self, errors):
+        super().__init__({'message': self.default_detail, 'errors': errors})
+
+class InvalidQueryParameterError(APIException):
+    status_code = 400
+    default_detail = 'Query parameter is invalid.'
@@ -0,0 +1,133 @@
+import io
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections
+
+from PIL import Image, ImageOps
+
+from .utils import BASE_IMAGE_URL
+from .models import TemporaryImage, ImageHash
+
+
+IMAGE_VARIANT_WIDTHS = (360, 720)
+IMAGE_VARIANT_QUALITY = 80
+
+logger = logging.getLogger(__name__)
+
+_variant_pool = None
+
+
+def get_image_variant_path(image_url, width, image_format=None):
+    return '{}_w{}.{}'.format(os.path.splitext(image_url)[0], width, (image_format or settings.IMAGE_VARIANT_FORMAT).lower())
+
+
+def get_image_variant_urls(image):
+    if not image.has_variants:
+        return None
+
+    return {'w{}'.format(width): BASE_IMAGE_URL + get_image_variant_path(image.image_url, width) for width in IMAGE_VARIANT_WIDTHS}
+
+
+def mark_image_variants(image_urls):
+    TemporaryImage.objects.filter(image_url__in=image_urls).update(has_variants=True)
+    ImageHash.objects.filter(image_url__in=image_urls).update(has_variants=True)
+    apps.get_model('product.ProductImage').objects.filter(image_url__in=image_urls).update(has_variants=True)
+
+
+def create_image_variants(content, image_format, widths=IMAGE_VARIANT_WIDTHS):
+    with Image.open(io.BytesIO(content)) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if image.mode in ('LA', 'P') else 'RGB')
+
+        variants = {}
+        for width in widths:
+            variant = image
+            if image.width > width:
+                variant = image.resize((width, max(round(image.height * width / image.width), 1)), Image.LANCZOS)
+
+            buffer = io.BytesIO()
+            variant.save(buffer, image_format.upper(), quality=IMAGE_VARIANT_QUALITY)
+            variants[width] = buffer.getvalue()
+
+    return variants
+
+
+def get_image_variant_pool():
+    global _variant_pool
+
+    if _variant_pool is None:
+        _variant_pool = ThreadPoolExecutor(max_workers=settings.IMAGE_PROCESS_MAX_WORKERS, thread_name_prefix='image_variant')
+
+    return _variant_pool
+
+
+def _save_variants(storage, image_url, variants, image_format):
+    try:
+        for width, variant in variants.items():
+            storage.save(get_image_variant_path(image_url, width, image_format), ContentFile(variant))
+    except Exception:
+        logger.warning('Failed to save variants of %s.', image_url, exc_info=True)
+        return False
+
+    return True
+
+
+def save_image_variants(storage, image_contents, executor):
+    image_format = settings.IMAGE_VARIANT_FORMAT
+    futures = {
+        image_url: executor.submit(create_image_variants, content, image_format)
+        for image_url, content in image_contents.items()
+    }
+
+    processed_image_urls = []
+    for image_url, future in futures.items():
+        try:
+            variants = future.result()
+        except Exception:
+            logger.warning('Failed to create variants of %s.', image_url, exc_info=True)
+            continue
+
+        if _save_variants(storage, image_url, variants, image_format):
+            processed_image_urls.append(image_url)
+
+    return processed_image_urls
+
+
+def create_stored_image_variants(storage, variant_storage, image_url):
+    image_format = settings.IMAGE_VARIANT_FORMAT
+    try:
+        with storage.open(image_url) as file:
+            variants = create_image_variants(file.read(), image_format)
+    except Exception:
+        logger.warning('Failed to create variants of %s.', image_url, exc_info=True)
+        return False
+
+    if not _save_variants(variant_storage, image_url, variants, image_format):
+        return False
+
+    try:
+        mark_image_variants([image_url])
+    except Exception:
+        logger.warning('Failed to mark the variants of %s.', image_url, exc_info=True)
+        return False
+    finally:
+        connections.close_all()
+
+    return True
+
+
+def defer_image_variants(storage, variant_storage, image_urls, executor=None):
+    """
+    Create and save the variants of stored images on a background thread pool, so that neither the rendering nor the
+    variant uploads hold up the request. Variants appear shortly after the response, when the image rows are marked
+    as having them, and a failed image is logged and left to the create_image_variants command.
+    """
+    executor = executor or get_image_variant_pool()
+
+    return [executor.submit(create_stored_image_variants, storage, variant_storage, image_url) for image_url in image_urls]
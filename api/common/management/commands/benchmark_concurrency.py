@@ -0,0 +1,134 @@
+import io
+import time
+import tempfile
+import threading
+from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from PIL import Image
+
+from django.core.files.storage import FileSystemStorage
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.test import override_settings
+
+from common.benchmarks import get_percentile
+from common.models import TemporaryImage, ImageHash
+
+
+UPLOAD_PATH = '/users/wholesalers/business_registration_images'
+
+
+class LatencyStorage(FileSystemStorage):
+    def __init__(self, latency, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency
+        self.saved_names = []
+
+    def _save(self, name, content):
+        time.sleep(self.latency)
+        name = super()._save(name, content)
+        self.saved_names.append(name)
+
+        return name
+
+
+class PooledWSGIServer(ThreadedWSGIServer):
+    """
+    Serve requests on a fixed number of threads like a gunicorn worker, a single thread being a sync worker.
+    """
+    def __init__(self, *args, threads, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__executor = ThreadPoolExecutor(max_workers=threads)
+
+    def process_request(self, request, client_address):
+        self.__executor.submit(self.process_request_thread, request, client_address)
+
+    def server_close(self):
+        super().server_close()
+        self.__executor.shutdown()
+
+
+class QuietWSGIRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def get_benchmark_image(index):
+    buffer = io.BytesIO()
+    Image.new('RGB', (8, 8), (index % 256, index // 256 % 256, index // 65536 % 256)).save(buffer, 'PNG')
+
+    return buffer.getvalue()
+
+
+class Command(BaseCommand):
+    help = (
+        'Upload images through an in-process server with injected storage latency, once on a single thread like a '
+        'sync worker and once on a pool of threads like a gthread worker, and compare requests per second.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=40, help='number of upload requests per mode')
+        parser.add_argument('--concurrency', type=int, default=8, help='number of concurrent clients')
+        parser.add_argument('--threads', type=int, default=4, help='number of threads of the gthread mode')
+        parser.add_argument('--latency', type=float, default=50, help='injected latency of each storage save in milliseconds')
+
+    def __upload(self, url, index):
+        start_time = time.perf_counter()
+        response = requests.post(url, files=[('image', ('{}.png'.format(index), get_benchmark_image(index), 'image/png'))])
+        if response.status_code != 201:
+            raise CommandError('{} responded with {}: {}'.format(UPLOAD_PATH, response.status_code, response.content[:200]))
+
+        return (time.perf_counter() - start_time) * 1000
+
+    def __run(self, threads, options, first_index):
+        server = PooledWSGIServer(('localhost', 0), QuietWSGIRequestHandler, threads=threads)
+        server.set_app(WSGIHandler())
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+
+        url = 'http://localhost:{}{}'.format(server.server_port, UPLOAD_PATH)
+        try:
+            start_time = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+                durations = list(executor.map(
+                    lambda index: self.__upload(url, index), range(first_index, first_index + options['requests'])
+                ))
+            elapsed_time = time.perf_counter() - start_time
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        return {
+            'requests_per_second': options['requests'] / elapsed_time,
+            'p50_ms': get_percentile(durations, 50),
+        }
+
+    def handle(self, *args, **options):
+        for key in ('requests', 'concurrency', 'threads'):
+            if options[key] < 1:
+                raise CommandError('{} must be greater than 0.'.format(key))
+        if options['latency'] < 0:
+            raise CommandError('latency must not be negative.')
+
+        modes = [('sync', 1), ('gthread', options['threads'])]
+        results = {}
+        with tempfile.TemporaryDirectory() as location:
+            storage = LatencyStorage(options['latency'] / 1000, location=location, base_url='/media/')
+            try:
+                with patch('common.storage.MediaStorage', lambda: storage), \
+                    override_settings(QUERY_BUDGET_SAMPLE_RATE=0, PROFILING_SAMPLE_RATE=0, ALLOWED_HOSTS=['localhost']):
+                    for index, (name, threads) in enumerate(modes):
+                        results[name] = self.__run(threads, options, index * options['requests'])
+                        self.stdout.write('{:<8} {:>3} threads  {:>8.2f} req/s  p50 {:>8.2f}ms'.format(
+                            name, threads, results[name]['requests_per_second'], results[name]['p50_ms']
+                        ))
+            finally:
+                TemporaryImage.objects.filter(image_url__in=storage.saved_names).delete()
+                ImageHash.objects.filter(image_url__in=storage.saved_names).delete()
+
+        self.stdout.write(self.style.SUCCESS('gthread served {:.2f}x the requests per second of sync workers.'.format(
+            results['gthread']['requests_per_second'] / results['sync']['requests_per_second']
+        )))
@@ -0,0 +1,86 @@
+import time
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import RequestFactory, override_settings
+
+from common.benchmarks import get_percentile
+
+
+DEFAULT_PATH = '/products/main-categories'
+PERSISTENT_CONN_MAX_AGE = 60
+
+
+class Command(BaseCommand):
+    help = (
+        'Serve a read-only endpoint through the WSGI handler against the configured database, with a connection per '
+        'request and with persistent, health-checked connections, and compare p50/p95 latency.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default=DEFAULT_PATH, help='path of an endpoint allowing anonymous GET requests')
+        parser.add_argument('--repeat', type=int, default=200, help='number of measured requests per mode')
+        parser.add_argument('--database', default='default', help='alias of the database to connect to')
+
+    def __count_connection(self, sender, connection, **kwargs):
+        if connection.alias == self.__alias:
+            self.__connection_count += 1
+
+    def __run(self, path, repeat, conn_max_age, health_checks):
+        settings_dict = connections[self.__alias].settings_dict
+        settings_dict['CONN_MAX_AGE'], settings_dict['CONN_HEALTH_CHECKS'] = conn_max_age, health_checks
+        connections[self.__alias].close()
+
+        handler = WSGIHandler()
+        environ = RequestFactory().get(path, HTTP_HOST='localhost').environ
+        self.__connection_count = 0
+        durations = []
+        for index in range(repeat + 1):
+            start_time = time.perf_counter()
+            response = handler(dict(environ), lambda status, headers: None)
+            response.close()
+            if index > 0:
+                durations.append((time.perf_counter() - start_time) * 1000)
+
+            if response.status_code >= 400:
+                raise CommandError('{} responded with {}.'.format(path, response.status_code))
+
+        return {
+            'p50_ms': get_percentile(durations, 50),
+            'p95_ms': get_percentile(durations, 95),
+            'connection_count': self.__connection_count,
+        }
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('repeat must be greater than 0.')
+        elif options['database'] not in connections:
+            raise CommandError('{} is not a configured database.'.format(options['database']))
+
+        self.__alias = options['database']
+        settings_dict = connections[self.__alias].settings_dict
+        original_settings = settings_dict['CONN_MAX_AGE'], settings_dict.get('CONN_HEALTH_CHECKS', False)
+        modes = [
+            ('per-request', 0, False),
+            ('persistent', original_settings[0] or PERSISTENT_CONN_MAX_AGE, True),
+        ]
+
+        results = {}
+        connection_created.connect(self.__count_connection)
+        try:
+            with override_settings(QUERY_BUDGET_SAMPLE_RATE=0, PROFILING_SAMPLE_RATE=0, DATABASE_REPLICAS=[]):
+                for name, conn_max_age, health_checks in modes:
+                    results[name] = self.__run(options['path'], options['repeat'], conn_max_age, health_checks)
+                    self.stdout.write('{:<12} p50 {:>8.2f}ms  p95 {:>8.2f}ms  {:>4} connections'.format(
+                        name, results[name]['p50_ms'], results[name]['p95_ms'], results[name]['connection_count']
+                    ))
+        finally:
+            connection_created.disconnect(self.__count_connection)
+            settings_dict['CONN_MAX_AGE'], settings_dict['CONN_HEALTH_CHECKS'] = original_settings
+            connections[self.__alias].close()
+
+        self.stdout.write(self.style.SUCCESS('Persistent connections saved {:.2f}ms of p50 latency.'.format(
+            results['per-request']['p50_ms'] - results['persistent']['p50_ms']
+        )))
@@ -0,0 +1,78 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from django.test.utils import setup_databases, teardown_databases, setup_test_environment, teardown_test_environment
+
+from common.benchmarks import (
+    seed_benchmark_data, get_benchmark_endpoints, run_endpoint_benchmark, compare_with_baseline, read_baseline, write_baseline,
+)
+
+
+DEFAULT_BASELINE_PATH = settings.BASE_DIR / 'benchmarks' / 'baseline.json'
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a test database, measure p50/p95 latency and query counts of the hot endpoints '
+        'and fail when their query counts regress against the committed baseline. '
+        'Latency is only compared when --latency-tolerance is given, since it depends on the machine.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('endpoints', nargs='*', help='names of endpoints to benchmark, all endpoints by default')
+        parser.add_argument('--repeat', type=int, default=20, help='number of measured requests per endpoint')
+        parser.add_argument('--scale', type=int, default=1, help='multiplier of seeded data volumes')
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE_PATH), help='path of the baseline file')
+        parser.add_argument(
+            '--latency-tolerance', type=float, help='allowed ratio of p95 latency above the baseline, latency is not compared by default'
+        )
+        parser.add_argument('--update-baseline', action='store_true', help='write the results to the baseline file')
+
+    def __run(self, options):
+        endpoints = get_benchmark_endpoints(seed_benchmark_data(options['scale']))
+        if options['endpoints']:
+            invalid_names = set(options['endpoints']) - set(endpoint.name for endpoint in endpoints)
+            if invalid_names:
+                raise CommandError('Invalid endpoint names: {}.'.format(', '.join(sorted(invalid_names))))
+            endpoints = [endpoint for endpoint in endpoints if endpoint.name in options['endpoints']]
+
+        results = {}
+        for endpoint in endpoints:
+            try:
+                results[endpoint.name] = run_endpoint_benchmark(endpoint, options['repeat'])
+            except RuntimeError as e:
+                raise CommandError(str(e))
+
+            self.stdout.write('{:<20} p50 {:>8.2f}ms  p95 {:>8.2f}ms  {:>3} queries'.format(
+                endpoint.name, results[endpoint.name]['p50_ms'], results[endpoint.name]['p95_ms'], results[endpoint.name]['query_count']
+            ))
+
+        return results
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('repeat must be greater than 0.')
+        elif options['scale'] < 1:
+            raise CommandError('scale must be greater than 0.')
+        elif options['latency_tolerance'] is not None and options['latency_tolerance'] < 0:
+            raise CommandError('latency-tolerance must not be negative.')
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            with override_settings(QUERY_BUDGET_SAMPLE_RATE=0, PROFILING_SAMPLE_RATE=0):
+                results = self.__run(options)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        if options['update_baseline']:
+            write_baseline(options['baseline'], dict(read_baseline(options['baseline']), **results))
+            self.stdout.write(self.style.SUCCESS('Updated the baseline of {} endpoints.'.format(len(results))))
+            return
+
+        regressions = compare_with_baseline(results, read_baseline(options['baseline']), options['latency_tolerance'])
+        if regressions:
+            raise CommandError('Benchmark regressions:\n' + '\n'.join(regressions))
+
+        self.stdout.write(self.style.SUCCESS('No regressions in {} endpoints.'.format(len(results))))
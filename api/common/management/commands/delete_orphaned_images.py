@@ -0,0 +1,131 @@
+import time
+from itertools import chain
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from common.models import TemporaryImage, ImageHash, PresignedUpload
+from common.storage import MediaStorage, S3_DELETE_OBJECTS_LIMIT, get_stored_image_paths, delete_files
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete temporary images that were never claimed, together with their stored files and variants, in keyset chunks. '
+        'Files that are shared with claimed references of the same content are kept. '
+        'Presigned uploads that expired without being completed are deleted as well.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=float, default=24, help='age in hours after which an unclaimed temporary image is orphaned')
+        parser.add_argument('--chunk-size', type=int, default=S3_DELETE_OBJECTS_LIMIT, help='number of temporary images handled per chunk')
+        parser.add_argument('--batch-size', type=int, default=S3_DELETE_OBJECTS_LIMIT, help='number of files deleted per storage request')
+        parser.add_argument('--workers', type=int, default=settings.IMAGE_UPLOAD_MAX_WORKERS, help='number of parallel storage requests')
+        parser.add_argument('--dry-run', action='store_true', help='report orphaned images without deleting them')
+
+    def __get_rate(self, count, elapsed_time):
+        return count / elapsed_time if elapsed_time else 0
+
+    def __get_orphaned_images(self, expired_at):
+        return TemporaryImage.objects.filter(created_at__lt=expired_at).order_by('image_url')
+
+    def __iterate_chunks(self, expired_at, chunk_size):
+        last_image_url = ''
+        while True:
+            chunk = list(self.__get_orphaned_images(expired_at).filter(image_url__gt=last_image_url).values_list('image_url', flat=True)[:chunk_size])
+            if not chunk:
+                return
+
+            yield chunk
+            last_image_url = chunk[-1]
+
+    def __delete_chunk(self, expired_at, image_urls, batch_size, max_workers):
+        with transaction.atomic():
+            image_urls = list(
+                self.__get_orphaned_images(expired_at).select_for_update(skip_locked=True)
+                .filter(image_url__in=image_urls).values_list('image_url', flat=True)
+            )
+            referenced_image_urls = set(
+                ImageHash.objects.select_for_update().filter(image_url__in=image_urls, reference_count__gt=0)
+                .values_list('image_url', flat=True)
+            )
+            TemporaryImage.objects.filter(image_url__in=referenced_image_urls).delete()
+
+            stored_paths = {
+                image_url: get_stored_image_paths(image_url) for image_url in image_urls if image_url not in referenced_image_urls
+            }
+            deleted_paths = set(delete_files(self.__storage, list(chain.from_iterable(stored_paths.values())), batch_size, max_workers))
+
+            deleted_image_urls = [
+                image_url for image_url, paths in stored_paths.items() if all(path in deleted_paths for path in paths)
+            ]
+            ImageHash.objects.filter(image_url__in=deleted_image_urls).delete()
+            TemporaryImage.objects.filter(image_url__in=deleted_image_urls).delete()
+
+        return len(referenced_image_urls) + len(deleted_image_urls), len(deleted_paths), len(stored_paths) - len(deleted_image_urls)
+
+    def __delete_expired_presigned_uploads(self, chunk_size, batch_size, max_workers):
+        expired_uploads = PresignedUpload.objects.filter(expires_at__lt=timezone.now()).order_by('image_url')
+        deleted_count = 0
+        last_image_url = ''
+        while True:
+            image_urls = list(expired_uploads.filter(image_url__gt=last_image_url).values_list('image_url', flat=True)[:chunk_size])
+            if not image_urls:
+                return deleted_count
+
+            deleted_image_urls = delete_files(self.__storage, image_urls, batch_size, max_workers)
+            deleted_count += PresignedUpload.objects.filter(image_url__in=deleted_image_urls).delete()[0]
+            last_image_url = image_urls[-1]
+
+    def handle(self, *args, **options):
+        if options['hours'] < 0:
+            raise CommandError('hours must not be negative.')
+        elif options['chunk_size'] < 1:
+            raise CommandError('chunk-size must be greater than 0.')
+        elif not 0 < options['batch_size'] <= S3_DELETE_OBJECTS_LIMIT:
+            raise CommandError('batch-size must be between 1 and {}.'.format(S3_DELETE_OBJECTS_LIMIT))
+        elif options['workers'] < 1:
+            raise CommandError('workers must be greater than 0.')
+
+        self.__storage = MediaStorage()
+        expired_at = timezone.now() - timedelta(hours=options['hours'])
+        image_count = file_count = failed_count = 0
+        start_time = time.perf_counter()
+
+        for image_urls in self.__iterate_chunks(expired_at, options['chunk_size']):
+            if options['dry_run']:
+                image_count += len(image_urls)
+                file_count += sum(len(get_stored_image_paths(image_url)) for image_url in image_urls)
+                continue
+
+            chunk_start_time = time.perf_counter()
+            deleted_image_count, deleted_file_count, chunk_failed_count = self.__delete_chunk(
+                expired_at, image_urls, options['batch_size'], options['workers']
+            )
+            image_count += deleted_image_count
+            file_count += deleted_file_count
+            failed_count += chunk_failed_count
+
+            self.stdout.write('Deleted {} temporary images and {} files ({:.1f} files/sec, {} failed).'.format(
+                deleted_image_count, deleted_file_count,
+                self.__get_rate(deleted_file_count, time.perf_counter() - chunk_start_time), chunk_failed_count,
+            ))
+
+        if not options['dry_run']:
+            presigned_upload_count = self.__delete_expired_presigned_uploads(options['chunk_size'], options['batch_size'], options['workers'])
+            self.stdout.write('Deleted {} expired presigned uploads.'.format(presigned_upload_count))
+
+        elapsed_time = time.perf_counter() - start_time
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(
+                'Found {} orphaned temporary images with up to {} files in {:.2f}s.'.format(image_count, file_count, elapsed_time)
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                'Deleted {} orphaned temporary images and {} files in {:.2f}s ({:.1f} images/sec, {} failed).'.format(
+                    image_count, file_count, elapsed_time, self.__get_rate(image_count, elapsed_time), failed_count,
+                )
+            ))
+
@@ -0,0 +1,66 @@
+import time
+
+from django.db import connection
+from django.core.management.base import BaseCommand, CommandError
+
+from common.datasets import DEFAULT_DATASET_SIZES, DEFAULT_DATASET_CHUNK_SIZE, get_dataset_sizes, InsertWriter, LoadDataWriter, DatasetGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a deterministic synthetic dataset of shoppers, products, orders, likes and carts for load testing. '
+        'Rows are built in memory and written in chunks, each committed in its own transaction.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1, help='multiplier of every dataset size')
+        parser.add_argument(
+            '--factor', action='append', default=[], metavar='NAME=MULTIPLIER',
+            help='additional multiplier of one dataset size: {}'.format(', '.join(DEFAULT_DATASET_SIZES.keys())),
+        )
+        parser.add_argument('--seed', type=int, default=0, help='seed of the random generator')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_DATASET_CHUNK_SIZE, help='number of rows built in memory at once')
+        parser.add_argument('--load-data', action='store_true', help='write rows with LOAD DATA LOCAL INFILE, which needs local_infile enabled on MySQL')
+
+    def __get_factors(self, factors):
+        result = {}
+        for factor in factors:
+            name, _, multiplier = factor.partition('=')
+            if name not in DEFAULT_DATASET_SIZES:
+                raise CommandError('Invalid factor name: {}.'.format(name))
+
+            try:
+                result[name] = float(multiplier)
+            except ValueError:
+                raise CommandError('factor {} must be a number.'.format(name))
+            if result[name] <= 0:
+                raise CommandError('factor {} must be greater than 0.'.format(name))
+
+        return result
+
+    def handle(self, *args, **options):
+        if options['scale'] <= 0:
+            raise CommandError('scale must be greater than 0.')
+        elif options['chunk_size'] < 1:
+            raise CommandError('chunk-size must be greater than 0.')
+        elif options['load_data'] and connection.vendor != 'mysql':
+            raise CommandError('load-data is only supported on MySQL.')
+
+        sizes = get_dataset_sizes(options['scale'], self.__get_factors(options['factor']))
+        writer = LoadDataWriter() if options['load_data'] else InsertWriter()
+        generator = DatasetGenerator(sizes, options['seed'], options['chunk_size'], writer)
+
+        start_time = time.perf_counter()
+        row_counts = generator.generate()
+        duration = time.perf_counter() - start_time
+
+        for model, count in row_counts.items():
+            model_duration = writer.durations[model]
+            self.stdout.write('{:<20} {:>10} rows  {:>10.0f} rows/sec'.format(
+                model.__name__, count, count / model_duration if model_duration else count
+            ))
+
+        total_count = sum(row_counts.values())
+        self.stdout.write(self.style.SUCCESS('Generated {} rows in {:.1f} seconds ({:.0f} rows/sec).'.format(
+            total_count, duration, total_count / duration if duration else total_count
+        )))
@@ -0,0 +1,74 @@
+import os
+import re
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from common.profiling import COLLAPSED_STACKS_EXTENSION, read_collapsed_stacks, get_frame_samples, get_hot_paths
+
+
+class Command(BaseCommand):
+    help = (
+        'Merge the collapsed stacks sampled by ProfilingMiddleware and render the hottest call paths and the share '
+        'of samples spent in serializer frames.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('views', nargs='*', help='names of profiled views, all views by default')
+        parser.add_argument('--directory', default=settings.PROFILING_DIRECTORY, help='directory of the collapsed stacks')
+        parser.add_argument('--limit', type=int, default=10, help='number of hot paths and frames to render')
+        parser.add_argument('--depth', type=int, default=6, help='number of innermost frames of a hot path')
+        parser.add_argument('--focus', default='Serializer', help='regular expression of frames to break down')
+        parser.add_argument('--output', help='write the merged collapsed stacks to this path for flamegraph tools')
+
+    def __get_paths(self, directory, views):
+        if not os.path.isdir(directory):
+            raise CommandError('{} does not exist.'.format(directory))
+
+        paths = {
+            file_name[:-len(COLLAPSED_STACKS_EXTENSION)]: os.path.join(directory, file_name)
+            for file_name in sorted(os.listdir(directory)) if file_name.endswith(COLLAPSED_STACKS_EXTENSION)
+        }
+        if views:
+            invalid_views = set(views) - set(paths.keys())
+            if invalid_views:
+                raise CommandError('No profiles of views: {}.'.format(', '.join(sorted(invalid_views))))
+            paths = {view: paths[view] for view in views}
+
+        return paths
+
+    def __render(self, view, stacks, options):
+        total_count = sum(stacks.values())
+        self.stdout.write(self.style.MIGRATE_HEADING('{} ({} samples)'.format(view, total_count)))
+
+        self.stdout.write('  hot paths')
+        for path, count in get_hot_paths(stacks, options['depth']).most_common(options['limit']):
+            self.stdout.write('  {:>6.1%}  {}'.format(count / total_count, path.replace(';', ' > ')))
+
+        self.stdout.write('  {} frames'.format(options['focus']))
+        for label, count in get_frame_samples(stacks, options['focus']).most_common(options['limit']):
+            self.stdout.write('  {:>6.1%}  {}'.format(count / total_count, label))
+
+    def handle(self, *args, **options):
+        if options['limit'] < 1:
+            raise CommandError('limit must be greater than 0.')
+        elif options['depth'] < 1:
+            raise CommandError('depth must be greater than 0.')
+
+        try:
+            re.compile(options['focus'])
+        except re.error:
+            raise CommandError('focus must be a valid regular expression.')
+
+        merged_stacks = Counter()
+        for view, path in self.__get_paths(options['directory'], options['views']).items():
+            stacks = read_collapsed_stacks(path)
+            if stacks:
+                self.__render(view, stacks, options)
+                merged_stacks.update(stacks)
+
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                file.writelines('{} {}\n'.format(stack, count) for stack, count in merged_stacks.most_common())
+            self.stdout.write(self.style.SUCCESS('Wrote {} collapsed stacks to {}.'.format(len(merged_stacks), options['output'])))
@@ -0,0 +1,159 @@
+import re
+import json
+import time
+import random
+import logging
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from rest_framework.exceptions import APIException
+
+from user.authentication import CachedJWTAuthentication
+from .profiling import StackSampler, write_collapsed_stacks
+
+
+logger = logging.getLogger(__name__)
+
+_placeholder_list_regex = re.compile(r'\(\s*%s(?:\s*,\s*%s)*\s*\)')
+_string_literal_regex = re.compile(r"'(?:[^']|'')*'")
+_number_literal_regex = re.compile(r'\b\d+(?:\.\d+)?\b')
+
+
+def get_query_shape(sql):
+    sql = _string_literal_regex.sub('%s', sql)
+    sql = _number_literal_regex.sub('%s', sql)
+
+    return _placeholder_list_regex.sub('(%s)', sql)
+
+
+def _get_view_name(request):
+    resolver_match = getattr(request, 'resolver_match', None)
+    if resolver_match is None:
+        return None
+
+    view_class = getattr(resolver_match.func, 'cls', None)
+    if view_class is None:
+        return resolver_match.view_name
+
+    view_name = '{}.{}'.format(view_class.__module__, view_class.__name__)
+    action = getattr(resolver_match.func, 'actions', {}).get(request.method.lower())
+
+    return '{}.{}'.format(view_name, action) if action else view_name
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start_time = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start_time
+            self.count += 1
+            self.shapes[get_query_shape(sql)] += 1
+
+    def get_repeated_queries(self, threshold):
+        return [{'sql': shape, 'count': count} for shape, count in self.shapes.most_common() if count > threshold]
+
+
+class QueryBudgetMiddleware:
+    """
+    Record query count, database time and repeated query shapes of sampled requests.
+
+    The numbers are sent in the Server-Timing header and logged as one JSON line per request. Requests that run more
+    than QUERY_BUDGET_MAX_QUERIES queries, or repeat one query shape more than QUERY_BUDGET_REPEATED_QUERY_THRESHOLD
+    times, are logged as warnings.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __is_sampled(self):
+        sample_rate = settings.QUERY_BUDGET_SAMPLE_RATE
+
+        return sample_rate >= 1 or (sample_rate > 0 and random.random() < sample_rate)
+
+    def __call__(self, request):
+        if not self.__is_sampled():
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        start_time = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(recorder))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start_time
+
+        response['Server-Timing'] = 'db;dur={:.2f};desc="{} queries", app;dur={:.2f}'.format(
+            recorder.duration * 1000, recorder.count, duration * 1000
+        )
+        self.__log(request, response, recorder, duration)
+
+        return response
+
+    def __log(self, request, response, recorder, duration):
+        repeated_queries = recorder.get_repeated_queries(settings.QUERY_BUDGET_REPEATED_QUERY_THRESHOLD)
+        over_budget = recorder.count > settings.QUERY_BUDGET_MAX_QUERIES
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': _get_view_name(request),
+            'status': response.status_code,
+            'query_count': recorder.count,
+            'db_time_ms': round(recorder.duration * 1000, 2),
+            'total_time_ms': round(duration * 1000, 2),
+            'over_budget': over_budget,
+            'repeated_queries': repeated_queries,
+        }
+
+        if over_budget or repeated_queries:
+            logger.warning(json.dumps(record))
+        else:
+            logger.info(json.dumps(record))
+
+
+class ProfilingMiddleware:
+    """
+    Sample the call stacks of profiled requests and append them as collapsed stacks to one file per view under
+    PROFILING_DIRECTORY, which render_profiles merges into the hottest call paths.
+
+    Requests are profiled at PROFILING_SAMPLE_RATE, or when an admin sends the X-Profile header.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __is_admin(self, request):
+        try:
+            user_auth_tuple = CachedJWTAuthentication().authenticate(request)
+        except APIException:
+            return False
+
+        return user_auth_tuple is not None and user_auth_tuple[0].is_admin
+
+    def __is_profiled(self, request):
+        if 'HTTP_X_PROFILE' in request.META:
+            return self.__is_admin(request)
+
+        sample_rate = settings.PROFILING_SAMPLE_RATE
+
+        return sample_rate >= 1 or (sample_rate > 0 and random.random() < sample_rate)
+
+    def __call__(self, request):
+        if not self.__is_profiled(request):
+            return self.get_response(request)
+
+        with StackSampler(settings.PROFILING_INTERVAL) as sampler:
+            response = self.get_response(request)
+
+        if sampler.stacks:
+            write_collapsed_stacks(settings.PROFILING_DIRECTORY, _get_view_name(request) or 'unresolved', sampler.stacks)
+        response['X-Profile-Samples'] = sum(sampler.stacks.values())
+
+        return response
@@ -0,0 +1,19 @@
+# Generated by Django 4.0.2 on 2026-10-18 12:00
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0009_rename_key_settinggroup_main_key_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='temporaryimage',
+            name='created_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+    ]
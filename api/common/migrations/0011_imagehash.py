@@ -0,0 +1,28 @@
+# Generated by Django 4.0.2 on 2026-10-19 08:45
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0010_temporaryimage_created_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageHash',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('upload_path_prefix', models.CharField(max_length=100)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('image_url', models.CharField(max_length=200, unique=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'image_hash',
+                'unique_together': {('upload_path_prefix', 'content_hash')},
+            },
+        ),
+    ]
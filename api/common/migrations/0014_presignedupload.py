@@ -0,0 +1,23 @@
+# Generated by Django 4.0.2 on 2026-10-19 10:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0011_imagehash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PresignedUpload',
+            fields=[
+                ('image_url', models.CharField(max_length=200, primary_key=True, serialize=False)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'db_table': 'presigned_upload',
+            },
+        ),
+    ]
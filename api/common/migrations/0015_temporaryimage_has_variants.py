@@ -0,0 +1,18 @@
+# Generated by Django 4.0.2 on 2026-10-19 10:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0014_presignedupload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='temporaryimage',
+            name='has_variants',
+            field=models.BooleanField(default=False),
+        ),
+    ]
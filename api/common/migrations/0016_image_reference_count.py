@@ -0,0 +1,28 @@
+# Generated by Django 4.0.2 on 2026-10-19 10:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0015_temporaryimage_has_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imagehash',
+            name='has_variants',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='imagehash',
+            name='reference_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='temporaryimage',
+            name='reference_count',
+            field=models.IntegerField(default=1),
+        ),
+    ]
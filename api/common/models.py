@@ -1,13 +1,41 @@
-from django.db.models import Model, AutoField, ForeignKey, DO_NOTHING, CharField, DateField
+from django.utils import timezone
+from django.db.models import (
+    Model, AutoField, ForeignKey, DO_NOTHING, CharField, DateField, DateTimeField, BooleanField, IntegerField,
+)
 
 
 class TemporaryImage(Model):
     image_url = CharField(primary_key=True, max_length=200)
+    created_at = DateTimeField(default=timezone.now, db_index=True)
+    has_variants = BooleanField(default=False)
+    reference_count = IntegerField(default=1)
 
     class Meta:
         db_table = 'temporary_image'
 
 
+class PresignedUpload(Model):
+    image_url = CharField(primary_key=True, max_length=200)
+    expires_at = DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = 'presigned_upload'
+
+
+class ImageHash(Model):
+    id = AutoField(primary_key=True)
+    upload_path_prefix = CharField(max_length=100)
+    content_hash = CharField(max_length=64)
+    image_url = CharField(max_length=200, unique=True)
+    created_at = DateTimeField(default=timezone.now)
+    has_variants = BooleanField(default=False)
+    reference_count = IntegerField(default=0)
+
+    class Meta:
+        db_table = 'image_hash'
+        unique_together = (('upload_path_prefix', 'content_hash'))
+
+
 class SettingGroup(Model):
     id = AutoField(primary_key=True)
     app = CharField(max_length=30)
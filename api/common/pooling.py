@@ -0,0 +1,147 @@
+import contextvars
+from contextlib import ExitStack
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .profiling import SampledThread
+
+
+DEFAULT_THREADS_PER_WORKER = 2
+
+_query_pool = None
+
+
+def get_worker_policy(cpu_count, alias_count, connection_budget, workers=None, threads=None, query_threads=0):
+    """
+    Derive the gunicorn workers and threads per worker from the CPU count. Each request thread and query pool thread
+    holds a persistent connection to every database alias, so the derived worker count is capped to keep all
+    connections within the budget. Explicit workers are not capped.
+    """
+    threads = threads or DEFAULT_THREADS_PER_WORKER
+    if workers is None:
+        max_workers = max(connection_budget // ((threads + query_threads) * alias_count), 1)
+        workers = min(cpu_count * 2 + 1, max_workers)
+
+    return workers, threads
+
+
+def get_pool_configuration(workers, threads):
+    aliases = {
+        alias: {
+            'conn_max_age': database.get('CONN_MAX_AGE', 0),
+            'health_checks': database.get('CONN_HEALTH_CHECKS', False),
+        } for alias, database in settings.DATABASES.items()
+    }
+    connections_per_worker = (threads + settings.DB_QUERY_MAX_WORKERS) * len(aliases)
+
+    return {
+        'workers': workers,
+        'threads': threads,
+        'query_threads': settings.DB_QUERY_MAX_WORKERS,
+        'aliases': aliases,
+        'connections_per_worker': connections_per_worker,
+        'max_connections': workers * connections_per_worker,
+        'connection_budget': settings.DB_MAX_CONNECTIONS,
+    }
+
+
+def check_pool_configuration(configuration):
+    warnings = []
+    if configuration['max_connections'] > configuration['connection_budget']:
+        warnings.append('{} workers with {} connections each exceed the budget of {} connections.'.format(
+            configuration['workers'], configuration['connections_per_worker'], configuration['connection_budget']
+        ))
+
+    for alias, pool in configuration['aliases'].items():
+        if pool['conn_max_age'] == 0:
+            warnings.append('Connections to {} are opened and closed on every request.'.format(alias))
+        elif not pool['health_checks']:
+            warnings.append('Persistent connections to {} are reused without health checks.'.format(alias))
+
+    return warnings
+
+
+def close_unusable_connections(**kwargs):
+    """
+    Close persistent connections which fail a ping at the start of a request, so that the request reconnects instead
+    of failing on a connection dropped by the database server. Connections with CONN_HEALTH_CHECKS disabled are left
+    to close_old_connections.
+    """
+    for conn in connections.all():
+        if conn.settings_dict.get('CONN_HEALTH_CHECKS') and conn.connection is not None and not conn.in_atomic_block \
+            and not conn.is_usable():
+            conn.close()
+
+
+def get_query_pool():
+    global _query_pool
+
+    if _query_pool is None:
+        _query_pool = ThreadPoolExecutor(max_workers=settings.DB_QUERY_MAX_WORKERS, thread_name_prefix='query')
+
+    return _query_pool
+
+
+def _close_unusable_pool_connections():
+    """
+    Close the connections of a pool thread which are broken or past CONN_MAX_AGE. A CONN_MAX_AGE of 0 closes
+    connections at the end of each request, which pool threads do not have, so those are pinged before each task
+    instead and closed if the ping fails, rather than reused until a query fails on them.
+    """
+    for conn in connections.all():
+        if conn.connection is None:
+            continue
+
+        if conn.settings_dict['CONN_MAX_AGE'] != 0:
+            conn.close_if_unusable_or_obsolete()
+        elif conn.is_usable():
+            conn.errors_occurred = False
+        else:
+            conn.close()
+
+
+def _get_query_recording():
+    return {
+        conn.alias: (list(conn.execute_wrappers), conn.force_debug_cursor, conn.queries_log)
+        for conn in connections.all() if conn.execute_wrappers or conn.queries_logged
+    }
+
+
+def _run_query(recording, func, *args, **kwargs):
+    _close_unusable_pool_connections()
+    with SampledThread(), ExitStack() as stack:
+        for alias, (execute_wrappers, force_debug_cursor, queries_log) in recording.items():
+            conn = connections[alias]
+            for execute_wrapper in execute_wrappers:
+                stack.enter_context(conn.execute_wrapper(execute_wrapper))
+
+            original_queries_log, original_force_debug_cursor = conn.queries_log, conn.force_debug_cursor
+            stack.callback(setattr, conn, 'queries_log', original_queries_log)
+            stack.callback(setattr, conn, 'force_debug_cursor', original_force_debug_cursor)
+            conn.queries_log, conn.force_debug_cursor = queries_log, force_debug_cursor
+
+        return func(*args, **kwargs)
+
+
+def submit_query(func, *args, **kwargs):
+    """
+    Run independent read queries on the bounded query pool while the request thread runs its own, with the context of
+    the request so that replica routing applies. The execute wrappers and query log of the request's connections are
+    lent to the pool thread, so that query budgets and captured queries include its queries, and the pool thread is
+    sampled along with a profiled request.
+
+    Pool threads have their own connections, which cannot see uncommitted writes of the request, so inside a
+    transaction, or without pool threads, func runs inline and the returned future is already done.
+    """
+    if settings.DB_QUERY_MAX_WORKERS < 1 or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+        future = Future()
+        try:
+            future.set_result(func(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+
+        return future
+
+    return get_query_pool().submit(contextvars.copy_context().run, _run_query, _get_query_recording(), func, *args, **kwargs)
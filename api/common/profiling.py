@@ -0,0 +1,133 @@
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from contextvars import ContextVar
+
+
+COLLAPSED_STACKS_EXTENSION = '.folded'
+
+_file_name_regex = re.compile(r'[^\w.-]')
+_sampler = ContextVar('sampler', default=None)
+
+
+def get_frame_label(frame):
+    code = frame.f_code
+    name = code.co_name
+    if code.co_argcount and code.co_varnames[0] in ('self', 'cls'):
+        owner = frame.f_locals.get(code.co_varnames[0])
+        if owner is not None:
+            name = '{}.{}'.format((owner if isinstance(owner, type) else type(owner)).__name__, name)
+
+    return '{}:{}'.format(frame.f_globals.get('__name__', '?'), name)
+
+
+class StackSampler:
+    """
+    Sample the stack of the thread entering the context at a fixed interval from a background thread, and of threads
+    entering SampledThread in a copy of the context, such as query pool threads.
+
+    Only frames called below the frame entering the context are kept, and samples are counted as collapsed stacks,
+    the outermost frame first and frames separated by semicolons.
+    """
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = Counter()
+        self.__stop_event = threading.Event()
+        self.__base_frames = {}
+
+    def __get_stack(self, frame, base_frame):
+        labels = []
+        while frame is not None and frame is not base_frame:
+            labels.append(get_frame_label(frame))
+            frame = frame.f_back
+
+        return ';'.join(reversed(labels))
+
+    def __sample(self):
+        while not self.__stop_event.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id, base_frame in list(self.__base_frames.items()):
+                frame = frames.get(thread_id)
+                stack = self.__get_stack(frame, base_frame) if frame is not None else ''
+                if stack:
+                    self.stacks[stack] += 1
+
+    def add_thread(self, thread_id, base_frame):
+        self.__base_frames[thread_id] = base_frame
+
+    def remove_thread(self, thread_id):
+        self.__base_frames.pop(thread_id, None)
+
+    def __enter__(self):
+        self.add_thread(threading.get_ident(), sys._getframe(1))
+        self.__token = _sampler.set(self)
+        self.__thread = threading.Thread(target=self.__sample, daemon=True)
+        self.__thread.start()
+
+        return self
+
+    def __exit__(self, *args):
+        _sampler.reset(self.__token)
+        self.__stop_event.set()
+        self.__thread.join()
+
+
+class SampledThread:
+    """
+    Add the thread entering the context to the StackSampler of its context, if any, until it exits.
+    """
+    def __enter__(self):
+        self.__sampler = _sampler.get()
+        if self.__sampler is not None:
+            self.__sampler.add_thread(threading.get_ident(), sys._getframe(1))
+
+        return self
+
+    def __exit__(self, *args):
+        if self.__sampler is not None:
+            self.__sampler.remove_thread(threading.get_ident())
+
+
+def get_collapsed_stacks_path(directory, name):
+    return os.path.join(directory, _file_name_regex.sub('_', name) + COLLAPSED_STACKS_EXTENSION)
+
+
+def write_collapsed_stacks(directory, name, stacks):
+    os.makedirs(directory, exist_ok=True)
+    lines = ''.join('{} {}\n'.format(stack, count) for stack, count in stacks.items())
+
+    with open(get_collapsed_stacks_path(directory, name), 'a') as file:
+        file.write(lines)
+
+
+def read_collapsed_stacks(path):
+    stacks = Counter()
+    with open(path) as file:
+        for line in file:
+            stack, _, count = line.rstrip('\n').rpartition(' ')
+            if stack and count.isdigit():
+                stacks[stack] += int(count)
+
+    return stacks
+
+
+def get_frame_samples(stacks, pattern=None):
+    regex = re.compile(pattern) if pattern else None
+    samples = Counter()
+    for stack, count in stacks.items():
+        labels = set(stack.split(';'))
+        for label in labels:
+            if regex is None or regex.search(label):
+                samples[label] += count
+
+    return samples
+
+
+def get_hot_paths(stacks, depth):
+    paths = Counter()
+    for stack, count in stacks.items():
+        paths[';'.join(stack.split(';')[-depth:])] += count
+
+    return paths
@@ -0,0 +1,71 @@
+import math
+
+import orjson
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+ENVELOPE_KEYS = {'code', 'message', 'data'}
+SUCCESS_MESSAGE = 'success'
+
+_encoder = JSONEncoder()
+
+
+def _has_non_finite_float(data):
+    values = [data]
+    while values:
+        value = values.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            values.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            values.extend(value)
+
+    return False
+
+
+class EnvelopeJSONRenderer(JSONRenderer):
+    """
+    Render with orjson, falling back to the DRF encoder for types orjson does not support.
+
+    Success envelopes built by get_response are written from a pre-encoded head per status code, so only data is
+    encoded. Datetimes are passed to the DRF encoder, and data orjson can't encode the way JSONRenderer does, such as
+    integers beyond 64 bits or NaN which orjson writes as null, is rendered by JSONRenderer itself.
+    """
+    __options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    __success_heads = {}
+
+    def __get_success_head(self, code):
+        if code not in self.__success_heads:
+            self.__success_heads[code] = b'{"code":%d,"message":"success","data":' % code
+
+        return self.__success_heads[code]
+
+    def __is_success_envelope(self, data):
+        return isinstance(data, dict) and data.keys() == ENVELOPE_KEYS and data['message'] == SUCCESS_MESSAGE \
+            and type(data['code']) is int
+
+    def __dumps(self, data, options):
+        return orjson.dumps(data, default=_encoder.default, option=options)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        try:
+            if self.get_indent(accepted_media_type, renderer_context or {}):
+                ret = self.__dumps(data, self.__options | orjson.OPT_INDENT_2)
+            elif self.__is_success_envelope(data):
+                ret = self.__get_success_head(data['code']) + self.__dumps(data['data'], self.__options) + b'}'
+            else:
+                ret = self.__dumps(data, self.__options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if b'null' in ret and _has_non_finite_float(data):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
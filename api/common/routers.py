@@ -0,0 +1,92 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+REPLICA_PIN_COOKIE_NAME = 'replica_pin'
+REPLICA_PIN_COOKIE_SALT = 'common.routers.replica_pin'
+
+_read_alias = ContextVar('read_alias', default=None)
+
+
+def read_replica(view_func):
+    view_func.read_replica = True
+
+    return view_func
+
+
+def _is_read_replica_view(request, view_func):
+    if getattr(view_func, 'read_replica', False):
+        return True
+
+    view_class = getattr(view_func, 'cls', None)
+    action = getattr(view_func, 'actions', {}).get(request.method.lower())
+
+    return action is not None and action in getattr(view_class, 'read_replica_actions', ())
+
+
+class ReplicaRouter:
+    """
+    Send reads to the replica chosen by ReplicaRoutingMiddleware for the current request, and everything else to the
+    primary. Reads inside a transaction on the primary stay on the primary, as do select_for_update querysets, which
+    Django routes as writes.
+    """
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Route reads of safe-method requests to a random replica when the view opts in, with read_replica_actions on a
+    viewset or the read_replica decorator on a function view.
+
+    A client is pinned to the primary for REPLICA_PIN_SECONDS after each unsafe-method request, so it reads its own
+    writes while the replicas catch up. The pin is a signed cookie with a timestamp, so any worker can check it
+    without a shared store, and it survives token rotation.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __is_pinned(self, request):
+        return request.get_signed_cookie(
+            REPLICA_PIN_COOKIE_NAME, None, salt=REPLICA_PIN_COOKIE_SALT, max_age=settings.REPLICA_PIN_SECONDS
+        ) is not None
+
+    def __pin(self, request, response):
+        response.set_signed_cookie(
+            REPLICA_PIN_COOKIE_NAME, '1', salt=REPLICA_PIN_COOKIE_SALT, max_age=settings.REPLICA_PIN_SECONDS,
+            secure=request.is_secure(), httponly=True, samesite='Lax',
+        )
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if settings.DATABASE_REPLICAS and request.method in SAFE_METHODS and _is_read_replica_view(request, view_func) \
+            and not self.__is_pinned(request):
+            request.read_alias_token = _read_alias.set(random.choice(settings.DATABASE_REPLICAS))
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            if hasattr(request, 'read_alias_token'):
+                _read_alias.reset(request.read_alias_token)
+
+        if settings.DATABASE_REPLICAS and request.method not in SAFE_METHODS:
+            self.__pin(request, response)
+
+        return response
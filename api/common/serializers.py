@@ -1,13 +1,24 @@
-from collections import defaultdict
+import copy
+from operator import attrgetter
+from collections import OrderedDict, defaultdict
+from collections.abc import Mapping
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.utils.functional import cached_property
 
 from rest_framework.exceptions import APIException
-from rest_framework.serializers import Serializer, ListSerializer, ModelSerializer, ImageField
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject, RelatedField, ManyRelatedField
+from rest_framework.serializers import (
+    Serializer, ListSerializer, ModelSerializer, ImageField, PrimaryKeyRelatedField, ListField, CharField,
+)
 
 from .models import SettingGroup, SettingItem
-from .validators import validate_file_size
+from .validators import validate_file_size, validate_image_file_name
 
 
 MAXIMUM_NUMBER_OF_ITEMS = 100
+MAXIMUM_NUMBER_OF_FIELD_PLANS = 1000
 
 
 def has_duplicate_element(array):
@@ -77,7 +88,17 @@ def get_separated_data_by_create_update_delete(data_array):
 
 
 class SerializerMixin:
+    """
+    Serializer with allow_fields or exclude_fields.
+
+    The fields left for each (serializer class, allow_fields, exclude_fields) are compiled once into a plan, which new
+    instances copy instead of building and dropping every field, and outputs are built from a getter per field.
+    Field sets are keyed regardless of order, and once MAXIMUM_NUMBER_OF_FIELD_PLANS plans are compiled, other field
+    sets, such as rare combinations of a fields query parameter, are compiled per instance without being kept.
+    """
     ALL_FIELDS = '__all__'
+    __field_plans = {}
+
     def __init__(self, *args, **kwargs):
         if 'allow_fields' in kwargs and 'exclude_fields' in kwargs:
             raise APIException('allow and exclude are incompatible.')
@@ -86,44 +107,110 @@ class SerializerMixin:
         exclude_fields = kwargs.pop('exclude_fields', None)
 
         super().__init__(*args, **kwargs)
-        self.drop_fields(allow_fields, exclude_fields)
-
-    def drop_fields(self, allow_fields=None, exclude_fields=None):
-        if allow_fields is not None:
-            self.remain_allow_fields(allow_fields)
-        elif exclude_fields is not None:
-            self.drop_exclude_fields(exclude_fields)
-            
+        self.__field_plan = self.__get_field_plan(allow_fields, exclude_fields)
 
-    def remain_allow_fields(self, allow_fields):
+    def __get_field_plan(self, allow_fields, exclude_fields):
         if allow_fields == self.ALL_FIELDS:
-            return
-        elif not (isinstance(allow_fields, tuple) or isinstance(allow_fields, list)):
+            allow_fields = None
+        elif allow_fields is not None and not isinstance(allow_fields, (tuple, list)):
             raise APIException('allow_fields must be tuple or list instance.')
+        elif exclude_fields is not None and not isinstance(exclude_fields, (tuple, list)):
+            raise APIException('exclude_fields must be tuple or list instance.')
 
-        allow_fields = set(allow_fields)
-        existing_fields = set(self.fields)
-
+        key = (
+            self.__class__,
+            frozenset(allow_fields) if allow_fields is not None else None,
+            frozenset(exclude_fields) if exclude_fields is not None else None,
+        )
+        fields = self.__field_plans.get(key)
+        if fields is None:
+            fields = super().get_fields()
+            if allow_fields is not None:
+                fields = self.remain_allow_fields(fields, allow_fields)
+            elif exclude_fields is not None:
+                fields = self.drop_exclude_fields(fields, exclude_fields)
+
+            if len(self.__field_plans) < MAXIMUM_NUMBER_OF_FIELD_PLANS:
+                self.__field_plans[key] = fields
+
+        return fields
+
+    def remain_allow_fields(self, fields, allow_fields):
         for field in allow_fields:
-            if field not in existing_fields:
+            if field not in fields:
                 raise APIException('allow_fields <{0}> not in serializer.fields.'.format(field))
 
-        fields = set(self.fields) - set(allow_fields)
-        for field in fields:
-            self.fields.pop(field)
+        allow_fields = set(allow_fields)
 
-    def drop_exclude_fields(self, exclude_fields):
-        if not (isinstance(exclude_fields, tuple) or isinstance(exclude_fields, list)):
-            raise APIException('exclude_fields must be tuple or list instance.')
-        
-        exclude_fields = set(exclude_fields)
-        existing_fields = set(self.fields)
+        return OrderedDict((field_name, field) for field_name, field in fields.items() if field_name in allow_fields)
 
+    def drop_exclude_fields(self, fields, exclude_fields):
         for field in exclude_fields:
-            if field not in existing_fields:
+            if field not in fields:
                 raise APIException('exclude_fields <{0}> not in serializer.fields.'.format(field))
 
-            self.fields.pop(field)
+        exclude_fields = set(exclude_fields)
+
+        return OrderedDict((field_name, field) for field_name, field in fields.items() if field_name not in exclude_fields)
+
+    def get_fields(self):
+        return copy.deepcopy(self.__field_plan)
+
+    @cached_property
+    def __representation_plan(self):
+        plan = []
+        for field in self._readable_fields:
+            getter = None
+            if field.source_attrs and not isinstance(field, (RelatedField, ManyRelatedField)):
+                getter = attrgetter('.'.join(field.source_attrs))
+            plan.append((field.field_name, field, getter))
+
+        return plan
+
+    def __get_attribute(self, field, getter, instance):
+        if getter is None:
+            return field.get_attribute(instance)
+
+        try:
+            attribute = getter(instance)
+        except (AttributeError, ObjectDoesNotExist):
+            return field.get_attribute(instance)
+
+        if callable(attribute):
+            return field.get_attribute(instance)
+
+        return attribute
+
+    def to_representation(self, instance):
+        if isinstance(instance, Mapping):
+            return super().to_representation(instance)
+
+        result = {}
+        for field_name, field, getter in self.__representation_plan:
+            try:
+                attribute = self.__get_attribute(field, getter, instance)
+            except SkipField:
+                continue
+
+            check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+            result[field_name] = None if check_for_none is None else field.to_representation(attribute)
+
+        return result
+
+
+class PrefetchedPrimaryKeyRelatedField(PrimaryKeyRelatedField):
+    def __init__(self, *args, **kwargs):
+        self.prefetched_instances = {}
+        super().__init__(*args, **kwargs)
+
+    def prefetch(self, pks):
+        self.prefetched_instances = self.get_queryset().in_bulk(set(pk for pk in pks if isinstance(pk, int)))
+
+    def to_internal_value(self, data):
+        if isinstance(data, int) and data in self.prefetched_instances:
+            return self.prefetched_instances[data]
+
+        return super().to_internal_value(data)
 
 
 class DynamicFieldsSerializer(SerializerMixin, Serializer):
@@ -138,6 +225,16 @@ class ImageSerializer(Serializer):
     image = ImageField(max_length=200, validators=[validate_file_size])
 
 
+class PresignedPostSerializer(Serializer):
+    names = ListField(
+        child=CharField(max_length=100, validators=[validate_image_file_name]), allow_empty=False, max_length=MAXIMUM_NUMBER_OF_ITEMS
+    )
+
+
+class PresignedUploadCompletionSerializer(Serializer):
+    image_url = ListField(child=CharField(max_length=200), allow_empty=False, max_length=MAXIMUM_NUMBER_OF_ITEMS)
+
+
 class SettingItemSerializer(ModelSerializer):
     class Meta:
         model = SettingItem
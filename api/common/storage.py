@@ -1,12 +1,33 @@
 import os
+import hashlib
+import logging
+import mimetypes
+from itertools import chain
+from collections import Counter
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
 
+from django.conf import settings
+from django.core.exceptions import SuspiciousOperation
+from django.db import transaction
 from django.utils import timezone
 from rest_framework.exceptions import APIException, ValidationError
 
 from storages.backends.s3boto3 import S3Boto3Storage
 
 from .utils import IMAGE_DATETIME_FORMAT
-from .models import TemporaryImage
+from .models import TemporaryImage, ImageHash, PresignedUpload
+from .exceptions import ImageUploadError
+from .validators import MAXIMUM_FILE_SIZE, get_maximum_file_size_message
+from .images import IMAGE_VARIANT_WIDTHS, get_image_variant_path, defer_image_variants
+
+
+PRESIGNED_POST_EXPIRES_IN = 600
+PRESIGNED_UPLOAD_EXPIRES_IN = 3600
+IMAGE_VARIANT_TYPES = ['product', 'review']
+S3_DELETE_OBJECTS_LIMIT = 1000
+
+logger = logging.getLogger(__name__)
 
 
 class CustomS3Boto3Storage(S3Boto3Storage):
@@ -19,6 +40,10 @@ class StaticStorage(CustomS3Boto3Storage):
 
 class MediaStorage(CustomS3Boto3Storage):
     location = 'media'
+
+
+class MediaVariantStorage(MediaStorage):
+    file_overwrite = True
     
 
 class ClientSVGStorage(CustomS3Boto3Storage):
@@ -38,19 +63,239 @@ def get_upload_path_prefix(type, *args):
     return '{}{}/{}_'.format(type, middle_path, type)
 
 
-def upload_images(type, images, *args):
-    result = []
-    temporary_images = []
+def get_upload_paths(upload_path_prefix, names):
+    now = timezone.now()
+
+    return [
+        upload_path_prefix + (now + timedelta(microseconds=index)).strftime(IMAGE_DATETIME_FORMAT) + os.path.splitext(name)[1].lower()
+        for index, name in enumerate(names)
+    ]
+
+
+def save_images(storage, upload_paths, images, max_workers):
+    results = [None] * len(images)
+    errors = []
+
+    def save(index):
+        try:
+            results[index] = storage.save(upload_paths[index], images[index])
+        except Exception as e:
+            errors.append({'index': index, 'name': images[index].name, 'message': str(e)})
+
+    if max_workers > 1 and len(images) > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(images))) as executor:
+            list(executor.map(save, range(len(images))))
+    else:
+        for index in range(len(images)):
+            save(index)
+
+    return results, sorted(errors, key=lambda error: error['index'])
+
+
+def get_content_hash(file):
+    hasher = hashlib.sha256()
+    for chunk in file.chunks():
+        hasher.update(chunk)
+    file.seek(0)
+
+    return hasher.hexdigest()
 
+
+def get_duplicate_image_urls(upload_path_prefix, content_hashes):
+    return dict(
+        ImageHash.objects.filter(upload_path_prefix=upload_path_prefix, content_hash__in=set(content_hashes))
+        .values_list('content_hash', 'image_url')
+    )
+
+
+def _register_temporary_images(upload_path_prefix, images, image_urls, uploaded_image_urls, duplicate_image_urls):
+    reference_counts = Counter(image_urls)
+    with transaction.atomic():
+        ImageHash.objects.bulk_create([
+            ImageHash(upload_path_prefix=upload_path_prefix, content_hash=content_hash, image_url=upload_path)
+            for content_hash, upload_path in uploaded_image_urls.items()
+        ], ignore_conflicts=True)
+        image_hashes = ImageHash.objects.select_for_update().in_bulk(list(duplicate_image_urls), field_name='image_url')
+        deleted_image_urls = set(duplicate_image_urls) - set(image_hashes)
+        if deleted_image_urls:
+            raise ImageUploadError([
+                {'index': index, 'name': image.name, 'message': 'The stored image was deleted during the upload.'}
+                for index, (image, image_url) in enumerate(zip(images, image_urls)) if image_url in deleted_image_urls
+            ])
+
+        temporary_images = TemporaryImage.objects.select_for_update().in_bulk(list(reference_counts))
+        for temporary_image in temporary_images.values():
+            temporary_image.reference_count += reference_counts[temporary_image.image_url]
+            temporary_image.created_at = timezone.now()
+        TemporaryImage.objects.bulk_update(temporary_images.values(), ['reference_count', 'created_at'])
+        TemporaryImage.objects.bulk_create([
+            TemporaryImage(
+                image_url=image_url, reference_count=reference_count,
+                has_variants=image_url in image_hashes and image_hashes[image_url].has_variants,
+            )
+            for image_url, reference_count in reference_counts.items() if image_url not in temporary_images
+        ])
+
+
+def upload_images(type, images, *args, content_hashes=None, storage=None, variant_storage=None, max_workers=None):
+    """
+    Save each distinct content once and register every returned URL as a temporary image reference, so that every
+    returned URL is claimed once. Content already stored under the same prefix is not uploaded again: its stored URL is
+    returned, and ImageHash counts the claimed references so that delete_orphaned_images keeps the object while it is in
+    use. When an image fails, the saved ones are deleted and nothing is registered.
+    """
     upload_path_prefix = get_upload_path_prefix(type, *args)
-    if upload_path_prefix:
-        storage = MediaStorage()
-        for image in images:
-            upload_path = upload_path_prefix + timezone.now().strftime(IMAGE_DATETIME_FORMAT) + os.path.splitext(image.name)[1].lower()
-            storage.save(upload_path, image)
-            temporary_images.append(TemporaryImage(image_url=upload_path))
-            result.append(storage.url(upload_path))
+    if not upload_path_prefix:
+        return []
+
+    storage = storage or MediaStorage()
+    max_workers = max_workers or settings.IMAGE_UPLOAD_MAX_WORKERS
+    content_hashes = content_hashes or [get_content_hash(image) for image in images]
+    duplicate_image_urls = get_duplicate_image_urls(upload_path_prefix, content_hashes)
+
+    uploading_indexes = {}
+    for index, content_hash in enumerate(content_hashes):
+        if content_hash not in duplicate_image_urls:
+            uploading_indexes.setdefault(content_hash, index)
+    uploading_images = [images[index] for index in uploading_indexes.values()]
+
+    upload_paths, errors = save_images(
+        storage, get_upload_paths(upload_path_prefix, [image.name for image in uploading_images]), uploading_images, max_workers
+    )
+    if errors:
+        delete_files(storage, [upload_path for upload_path in upload_paths if upload_path is not None], max_workers=max_workers)
+        failed_messages = {list(uploading_indexes)[error['index']]: error['message'] for error in errors}
+        raise ImageUploadError([
+            {'index': index, 'name': images[index].name, 'message': failed_messages[content_hash]}
+            for index, content_hash in enumerate(content_hashes) if content_hash in failed_messages
+        ])
+
+    uploaded_image_urls = dict(zip(uploading_indexes, upload_paths))
+    image_urls = [uploaded_image_urls.get(content_hash) or duplicate_image_urls[content_hash] for content_hash in content_hashes]
+    try:
+        _register_temporary_images(upload_path_prefix, images, image_urls, uploaded_image_urls, set(duplicate_image_urls.values()))
+    except ImageUploadError:
+        delete_files(storage, upload_paths, max_workers=max_workers)
+        raise
+
+    if type in IMAGE_VARIANT_TYPES:
+        defer_image_variants(storage, variant_storage or MediaVariantStorage(), upload_paths)
+
+    return [storage.url(image_url) for image_url in image_urls]
+
+
+def get_presigned_posts(type, names, *args, storage=None):
+    upload_path_prefix = get_upload_path_prefix(type, *args)
+    if not upload_path_prefix:
+        return []
+
+    storage = storage or MediaStorage()
+    client = storage.connection.meta.client
+    upload_paths = get_upload_paths(upload_path_prefix, names)
+    presigned_posts = []
+    for name, upload_path in zip(names, upload_paths):
+        content_type = mimetypes.guess_type(name)[0]
+        presigned_post = client.generate_presigned_post(
+            storage.bucket_name, storage._normalize_name(upload_path),
+            Fields={'Content-Type': content_type},
+            Conditions=[{'Content-Type': content_type}, ['content-length-range', 1, MAXIMUM_FILE_SIZE]],
+            ExpiresIn=PRESIGNED_POST_EXPIRES_IN,
+        )
+        presigned_post['image_url'] = upload_path
+        presigned_posts.append(presigned_post)
+
+    expires_at = timezone.now() + timedelta(seconds=PRESIGNED_UPLOAD_EXPIRES_IN)
+    PresignedUpload.objects.bulk_create([PresignedUpload(image_url=upload_path, expires_at=expires_at) for upload_path in upload_paths])
+
+    return presigned_posts
+
+
+def _get_presigned_uploads(upload_paths):
+    return PresignedUpload.objects.filter(image_url__in=upload_paths, expires_at__gte=timezone.now())
+
+
+def _validate_presigned_upload(storage, upload_path):
+    try:
+        if not storage.exists(upload_path):
+            raise ValidationError('{} is not uploaded.'.format(upload_path))
+        elif storage.size(upload_path) > MAXIMUM_FILE_SIZE:
+            raise ValidationError(get_maximum_file_size_message())
+    except SuspiciousOperation:
+        raise ValidationError('{} is not issued.'.format(upload_path))
+
+
+def complete_presigned_uploads(type, upload_paths, *args, storage=None, variant_storage=None):
+    upload_path_prefix = get_upload_path_prefix(type, *args)
+    if not upload_path_prefix:
+        return []
+
+    if len(upload_paths) != len(set(upload_paths)):
+        raise ValidationError('image_url is duplicated.')
+
+    issued_upload_paths = set(_get_presigned_uploads(upload_paths).values_list('image_url', flat=True))
+    unissued_upload_paths = [
+        upload_path for upload_path in upload_paths
+        if not upload_path.startswith(upload_path_prefix) or upload_path not in issued_upload_paths
+    ]
+    if unissued_upload_paths:
+        raise ValidationError(['{} is not issued.'.format(upload_path) for upload_path in unissued_upload_paths])
+
+    storage = storage or MediaStorage()
+    for upload_path in upload_paths:
+        _validate_presigned_upload(storage, upload_path)
+
+    with transaction.atomic():
+        if _get_presigned_uploads(upload_paths).delete()[0] != len(upload_paths):
+            raise ValidationError('Some image_url are already completed.')
+        TemporaryImage.objects.bulk_create([TemporaryImage(image_url=upload_path) for upload_path in upload_paths])
+    if type in IMAGE_VARIANT_TYPES:
+        defer_image_variants(storage, variant_storage or MediaVariantStorage(), upload_paths)
+
+    return [storage.url(upload_path) for upload_path in upload_paths]
+
+
+def get_stored_image_paths(image_url):
+    if image_url.split('/')[0] not in IMAGE_VARIANT_TYPES:
+        return [image_url]
+
+    return [image_url] + [get_image_variant_path(image_url, width) for width in IMAGE_VARIANT_WIDTHS]
+
+
+def _delete_s3_objects(storage, names):
+    response = storage.bucket.delete_objects(
+        Delete={'Objects': [{'Key': storage._normalize_name(name)} for name in names], 'Quiet': True}
+    )
+    failed_keys = set(error['Key'] for error in response.get('Errors', []))
+
+    return [name for name in names if storage._normalize_name(name) not in failed_keys]
+
+
+def _delete_storage_files(storage, names):
+    deleted_names = []
+    for name in names:
+        try:
+            storage.delete(name)
+            deleted_names.append(name)
+        except Exception:
+            logger.warning('Failed to delete %s.', name, exc_info=True)
+
+    return deleted_names
+
+
+def delete_files(storage, names, batch_size=S3_DELETE_OBJECTS_LIMIT, max_workers=None):
+    delete = _delete_s3_objects if isinstance(storage, S3Boto3Storage) else _delete_storage_files
+    batches = [names[i:i + batch_size] for i in range(0, len(names), batch_size)]
+
+    def delete_batch(batch):
+        try:
+            return delete(storage, batch)
+        except Exception:
+            logger.warning('Failed to delete a batch of %s files.', len(batch), exc_info=True)
+            return []
 
-    TemporaryImage.objects.bulk_create(temporary_images)
+    max_workers = min(max_workers or settings.IMAGE_UPLOAD_MAX_WORKERS, len(batches))
+    if max_workers > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(chain.from_iterable(executor.map(delete_batch, batches)))
 
-    return result
+    return list(chain.from_iterable(map(delete_batch, batches)))
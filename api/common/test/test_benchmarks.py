@@ -0,0 +1,50 @@
+from rest_framework.test import APITestCase, APISimpleTestCase
+
+from ..benchmarks import seed_benchmark_data, get_benchmark_endpoints, run_endpoint_benchmark, compare_with_baseline, get_percentile
+
+
+class GetPercentileTestCase(APISimpleTestCase):
+    def test_nearest_rank(self):
+        values = list(range(20, 0, -1))
+
+        self.assertEqual(get_percentile(values, 50), 10)
+        self.assertEqual(get_percentile(values, 95), 19)
+        self.assertEqual(get_percentile([3], 95), 3)
+
+
+class CompareWithBaselineTestCase(APISimpleTestCase):
+    __baseline = {'products-list': {'p50_ms': 10, 'p95_ms': 20, 'query_count': 5}}
+
+    def test_no_regression(self):
+        results = {'products-list': {'p50_ms': 15, 'p95_ms': 29, 'query_count': 5}, 'new-endpoint': {'p50_ms': 1, 'p95_ms': 1, 'query_count': 100}}
+
+        self.assertListEqual(compare_with_baseline(results, self.__baseline, 0.5), [])
+
+    def test_query_count_regression(self):
+        regressions = compare_with_baseline({'products-list': {'p50_ms': 10, 'p95_ms': 20, 'query_count': 6}}, self.__baseline, 0.5)
+
+        self.assertListEqual(regressions, ['products-list: query count 6 exceeds the baseline 5.'])
+
+    def test_ignore_latency_without_tolerance(self):
+        self.assertListEqual(compare_with_baseline({'products-list': {'p50_ms': 100, 'p95_ms': 200, 'query_count': 5}}, self.__baseline), [])
+
+    def test_latency_regression(self):
+        regressions = compare_with_baseline({'products-list': {'p50_ms': 10, 'p95_ms': 31, 'query_count': 5}}, self.__baseline, 0.5)
+
+        self.assertListEqual(regressions, ['products-list: p95 latency 31.00ms exceeds the baseline 20.00ms by more than 50%.'])
+
+
+class RunEndpointBenchmarkTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.__endpoints = {endpoint.name: endpoint for endpoint in get_benchmark_endpoints(seed_benchmark_data())}
+
+    def test_all_endpoints_succeed(self):
+        for name, endpoint in self.__endpoints.items():
+            result = run_endpoint_benchmark(endpoint, 2)
+
+            self.assertGreater(result['query_count'], 0, name)
+            self.assertLessEqual(result['p50_ms'], result['p95_ms'], name)
+
+    def test_constant_cart_query_count(self):
+        self.assertEqual(run_endpoint_benchmark(self.__endpoints['carts-list'], 3)['query_count'], 2)
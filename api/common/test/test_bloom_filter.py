@@ -0,0 +1,29 @@
+from rest_framework.test import APISimpleTestCase
+
+from ..bloom_filter import BloomFilter
+
+
+class BloomFilterTestCase(APISimpleTestCase):
+    def setUp(self):
+        self.__bloom_filter = BloomFilter(1000, 0.01)
+        self.__values = ['value{}'.format(i) for i in range(1000)]
+        for value in self.__values:
+            self.__bloom_filter.add(value)
+
+    def test_raise_value_error_on_invalid_capacity(self):
+        self.assertRaisesRegex(ValueError, r'^capacity must be greater than 0.$', BloomFilter, 0)
+
+    def test_raise_value_error_on_invalid_false_positive_rate(self):
+        self.assertRaisesRegex(ValueError, r'^false_positive_rate must be between 0 and 1.$', BloomFilter, 10, 1)
+
+    def test_no_false_negative(self):
+        self.assertTrue(all(value in self.__bloom_filter for value in self.__values))
+
+    def test_false_positive_rate(self):
+        false_positive_count = sum('absent{}'.format(i) in self.__bloom_filter for i in range(10000))
+
+        self.assertLess(false_positive_count / 10000, 0.02)
+        self.assertAlmostEqual(self.__bloom_filter.get_estimated_false_positive_rate(), 0.01, delta=0.002)
+
+    def test_count(self):
+        self.assertEqual(self.__bloom_filter.count, len(self.__values))
@@ -207,7 +207,7 @@ class ViewTestCase(APITestCase):
     def _delete(self, data={}, status_code=200, *args, **kwargs):
         self.__set_response(self.client.delete(self._url, self.__get_request_data(data), *args, **kwargs), status_code)
 
-    @patch('common.storage.MediaStorage.save')
+    @patch('common.storage.MediaStorage.save', side_effect=lambda name, content: name)
     def _test_image_upload(self, mock, size=1, middle_path=''):
         self.__create_images(size)
         self._post({'image': self.__images})
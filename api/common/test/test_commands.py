@@ -0,0 +1,324 @@
+import os
+import json
+import shutil
+import tempfile
+from io import StringIO
+from collections import Counter
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connections
+from django.utils import timezone
+
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from .factories import TemporaryImageFactory
+from ..models import TemporaryImage, ImageHash, PresignedUpload
+from ..storage import get_stored_image_paths
+from ..profiling import write_collapsed_stacks, read_collapsed_stacks
+from user.models import Shopper
+from order.models import Order
+
+
+class DeleteOrphanedImagesCommandTestCase(APITestCase):
+    def setUp(self):
+        self.__location = tempfile.mkdtemp()
+        self.__storage = FileSystemStorage(location=self.__location)
+        self.__orphaned_image_urls = ['product/wholesaler1/product_2022010{}_000000000000.png'.format(i) for i in range(3)]
+        self.__orphaned_image_urls.append('business_registration/business_registration_20220101_000000000000.png')
+        self.__recent_image_url = 'product/wholesaler1/product_20220201_000000000000.png'
+
+        for image_url in self.__orphaned_image_urls + [self.__recent_image_url]:
+            TemporaryImageFactory(image_url=image_url)
+            for path in get_stored_image_paths(image_url):
+                self.__storage.save(path, ContentFile(b'content'))
+        TemporaryImage.objects.filter(image_url__in=self.__orphaned_image_urls).update(created_at=timezone.now() - timedelta(days=2))
+
+        patcher = patch('common.management.commands.delete_orphaned_images.MediaStorage', return_value=self.__storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.__location)
+
+    def __call_command(self, *args):
+        stdout = StringIO()
+        call_command('delete_orphaned_images', *args, stdout=stdout)
+
+        return stdout.getvalue()
+
+    def test_delete_orphaned_images(self):
+        output = self.__call_command('--chunk-size', '3', '--batch-size', '2')
+
+        self.assertListEqual(list(TemporaryImage.objects.values_list('image_url', flat=True)), [self.__recent_image_url])
+        for image_url in self.__orphaned_image_urls:
+            self.assertFalse(any(self.__storage.exists(path) for path in get_stored_image_paths(image_url)))
+        self.assertTrue(all(self.__storage.exists(path) for path in get_stored_image_paths(self.__recent_image_url)))
+        self.assertIn('Deleted 3 temporary images and 7 files', output)
+        self.assertIn('Deleted 1 temporary images and 3 files', output)
+        self.assertIn('Deleted 4 orphaned temporary images and 10 files', output)
+
+    def test_delete_content_hashes(self):
+        ImageHash.objects.create(upload_path_prefix='product/wholesaler1/product_', content_hash='hash', image_url=self.__orphaned_image_urls[0])
+        self.__call_command()
+
+        self.assertFalse(ImageHash.objects.exists())
+        self.assertFalse(self.__storage.exists(self.__orphaned_image_urls[0]))
+
+    def test_keep_claimed_shared_images(self):
+        ImageHash.objects.create(
+            upload_path_prefix='product/wholesaler1/product_', content_hash='hash', image_url=self.__orphaned_image_urls[0], reference_count=1
+        )
+        output = self.__call_command()
+
+        self.assertListEqual(list(TemporaryImage.objects.values_list('image_url', flat=True)), [self.__recent_image_url])
+        self.assertTrue(all(self.__storage.exists(path) for path in get_stored_image_paths(self.__orphaned_image_urls[0])))
+        self.assertTrue(ImageHash.objects.exists())
+        self.assertIn('Deleted 4 orphaned temporary images and 7 files', output)
+
+    def test_delete_expired_presigned_uploads(self):
+        expired_image_url = self.__storage.save('product/wholesaler1/product_expired.png', ContentFile(b'content'))
+        PresignedUpload.objects.create(image_url=expired_image_url, expires_at=timezone.now() - timedelta(seconds=1))
+        PresignedUpload.objects.create(image_url='product/wholesaler1/product_issued.png', expires_at=timezone.now() + timedelta(hours=1))
+        output = self.__call_command()
+
+        self.assertListEqual(list(PresignedUpload.objects.values_list('image_url', flat=True)), ['product/wholesaler1/product_issued.png'])
+        self.assertFalse(self.__storage.exists(expired_image_url))
+        self.assertIn('Deleted 1 expired presigned uploads.', output)
+
+    def test_keep_images_with_failed_deletion(self):
+        with patch.object(self.__storage, 'delete', side_effect=OSError('storage is unavailable.')):
+            output = self.__call_command()
+
+        self.assertEqual(TemporaryImage.objects.count(), len(self.__orphaned_image_urls) + 1)
+        self.assertIn('Deleted 0 orphaned temporary images and 0 files', output)
+        self.assertIn('4 failed', output)
+
+    def test_dry_run(self):
+        output = self.__call_command('--dry-run')
+
+        self.assertEqual(TemporaryImage.objects.count(), len(self.__orphaned_image_urls) + 1)
+        self.assertTrue(all(self.__storage.exists(image_url) for image_url in self.__orphaned_image_urls))
+        self.assertIn('Found 4 orphaned temporary images with up to 10 files', output)
+
+    def test_hours(self):
+        self.__call_command('--hours', '0')
+
+        self.assertFalse(TemporaryImage.objects.exists())
+
+    def test_invalid_hours(self):
+        self.assertRaisesRegex(CommandError, r'^hours must not be negative.$', self.__call_command, '--hours', '-1')
+
+    def test_invalid_chunk_size(self):
+        self.assertRaisesRegex(CommandError, r'^chunk-size must be greater than 0.$', self.__call_command, '--chunk-size', '0')
+
+    def test_invalid_batch_size(self):
+        self.assertRaisesRegex(CommandError, r'^batch-size must be between 1 and 1000.$', self.__call_command, '--batch-size', '1001')
+
+    def test_invalid_workers(self):
+        self.assertRaisesRegex(CommandError, r'^workers must be greater than 0.$', self.__call_command, '--workers', '0')
+
+
+@patch('common.management.commands.benchmark_endpoints.teardown_test_environment')
+@patch('common.management.commands.benchmark_endpoints.teardown_databases')
+@patch('common.management.commands.benchmark_endpoints.setup_databases', return_value=[])
+@patch('common.management.commands.benchmark_endpoints.setup_test_environment')
+class BenchmarkEndpointsCommandTestCase(APITestCase):
+    def setUp(self):
+        self.__location = tempfile.mkdtemp()
+        self.__baseline_path = os.path.join(self.__location, 'baseline.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.__location)
+
+    def __call_command(self, *args, endpoint='carts-list'):
+        stdout = StringIO()
+        call_command('benchmark_endpoints', endpoint, '--repeat', '2', '--baseline', self.__baseline_path, *args, stdout=stdout)
+
+        return stdout.getvalue()
+
+    def __write_baseline(self, query_count, p95_ms=1000):
+        with open(self.__baseline_path, 'w') as file:
+            json.dump({'carts-list': {'p50_ms': p95_ms, 'p95_ms': p95_ms, 'query_count': query_count}}, file)
+
+    def test_update_baseline(self, *mocks):
+        output = self.__call_command('--update-baseline')
+
+        with open(self.__baseline_path) as file:
+            self.assertEqual(json.load(file)['carts-list']['query_count'], 2)
+        self.assertIn('Updated the baseline of 1 endpoints.', output)
+
+    def test_no_regressions(self, *mocks):
+        self.__write_baseline(2)
+
+        self.assertIn('No regressions in 1 endpoints.', self.__call_command())
+
+    def test_fail_on_regression(self, *mocks):
+        self.__write_baseline(1)
+
+        self.assertRaisesRegex(CommandError, r'carts-list: query count 2 exceeds the baseline 1.', self.__call_command)
+
+    def test_ignore_latency_by_default(self, *mocks):
+        self.__write_baseline(2, p95_ms=0.001)
+
+        self.assertIn('No regressions in 1 endpoints.', self.__call_command())
+
+    def test_fail_on_latency_regression_with_tolerance(self, *mocks):
+        self.__write_baseline(2, p95_ms=0.001)
+
+        self.assertRaisesRegex(CommandError, r'carts-list: p95 latency', self.__call_command, '--latency-tolerance', '0.5')
+
+    def test_invalid_latency_tolerance(self, *mocks):
+        self.assertRaisesRegex(
+            CommandError, r'^latency-tolerance must not be negative.$', self.__call_command, '--latency-tolerance', '-1'
+        )
+
+    def test_invalid_endpoint(self, *mocks):
+        self.assertRaisesRegex(CommandError, r'^Invalid endpoint names: invalid.$', self.__call_command, endpoint='invalid')
+
+    def test_invalid_repeat(self, *mocks):
+        self.assertRaisesRegex(CommandError, r'^repeat must be greater than 0.$', self.__call_command, '--repeat', '0')
+
+
+class BenchmarkConnectionsCommandTestCase(APITransactionTestCase):
+    def __call_command(self, *args):
+        stdout = StringIO()
+        call_command('benchmark_connections', '--repeat', '2', *args, stdout=stdout)
+
+        return stdout.getvalue()
+
+    def test_benchmark_connections(self):
+        output = self.__call_command()
+
+        self.assertRegex(output, r'per-request  p50 +\d+\.\d{2}ms  p95 +\d+\.\d{2}ms +\d+ connections')
+        self.assertRegex(output, r'persistent   p50 +\d+\.\d{2}ms  p95 +\d+\.\d{2}ms +\d+ connections')
+        self.assertRegex(output, r'Persistent connections saved -?\d+\.\d{2}ms of p50 latency.')
+
+    def test_restore_connection_settings(self):
+        settings_dict = connections['default'].settings_dict
+        original_settings = settings_dict['CONN_MAX_AGE'], settings_dict['CONN_HEALTH_CHECKS']
+        self.__call_command()
+
+        self.assertTupleEqual((settings_dict['CONN_MAX_AGE'], settings_dict['CONN_HEALTH_CHECKS']), original_settings)
+
+    def test_error_response(self):
+        self.assertRaisesRegex(CommandError, r'^/products/0 responded with 404.$', self.__call_command, '--path', '/products/0')
+
+    def test_invalid_repeat(self):
+        self.assertRaisesRegex(CommandError, r'^repeat must be greater than 0.$', self.__call_command, '--repeat', '0')
+
+    def test_invalid_database(self):
+        self.assertRaisesRegex(CommandError, r'^invalid is not a configured database.$', self.__call_command, '--database', 'invalid')
+
+
+class BenchmarkConcurrencyCommandTestCase(APITransactionTestCase):
+    def __call_command(self, *args):
+        stdout = StringIO()
+        call_command('benchmark_concurrency', '--requests', '2', '--concurrency', '1', '--threads', '2', '--latency', '0', *args, stdout=stdout)
+
+        return stdout.getvalue()
+
+    def test_benchmark_concurrency(self):
+        output = self.__call_command()
+
+        self.assertRegex(output, r'sync +1 threads +\d+\.\d{2} req/s  p50 +\d+\.\d{2}ms')
+        self.assertRegex(output, r'gthread +2 threads +\d+\.\d{2} req/s  p50 +\d+\.\d{2}ms')
+        self.assertRegex(output, r'gthread served \d+\.\d{2}x the requests per second of sync workers.')
+
+    def test_delete_uploaded_images(self):
+        self.__call_command()
+
+        self.assertFalse(TemporaryImage.objects.exists())
+        self.assertFalse(ImageHash.objects.exists())
+
+    def test_invalid_threads(self):
+        self.assertRaisesRegex(CommandError, r'^threads must be greater than 0.$', self.__call_command, '--threads', '0')
+
+    def test_invalid_latency(self):
+        self.assertRaisesRegex(CommandError, r'^latency must not be negative.$', self.__call_command, '--latency', '-1')
+
+
+class GenerateDatasetCommandTestCase(APITestCase):
+    def __call_command(self, *args):
+        stdout = StringIO()
+        call_command('generate_dataset', '--scale', '0.005', *args, stdout=stdout)
+
+        return stdout.getvalue()
+
+    def test_generate_dataset(self):
+        output = self.__call_command('--factor', 'orders=2', '--seed', '1')
+
+        self.assertEqual(Order.objects.count(), 50)
+        self.assertEqual(Shopper.objects.count(), 10)
+        self.assertIn('Order                        50 rows', output)
+        self.assertIn('Generated ', output)
+
+    def test_invalid_scale(self):
+        self.assertRaisesRegex(CommandError, r'^scale must be greater than 0.$', self.__call_command, '--scale', '0')
+
+    def test_invalid_chunk_size(self):
+        self.assertRaisesRegex(CommandError, r'^chunk-size must be greater than 0.$', self.__call_command, '--chunk-size', '0')
+
+    def test_invalid_factor_name(self):
+        self.assertRaisesRegex(CommandError, r'^Invalid factor name: users.$', self.__call_command, '--factor', 'users=2')
+
+    def test_invalid_factor(self):
+        self.assertRaisesRegex(CommandError, r'^factor orders must be greater than 0.$', self.__call_command, '--factor', 'orders=0')
+
+    def test_load_data_without_mysql(self):
+        self.assertRaisesRegex(CommandError, r'^load-data is only supported on MySQL.$', self.__call_command, '--load-data')
+
+
+class RenderProfilesCommandTestCase(APITestCase):
+    def setUp(self):
+        self.__directory = tempfile.mkdtemp()
+        write_collapsed_stacks(self.__directory, 'product.views.ProductViewSet.list', Counter({
+            'list;ProductReadSerializer.to_representation;DynamicFieldsSerializer.to_representation': 3, 'list;query': 1,
+        }))
+        write_collapsed_stacks(self.__directory, 'order.views.OrderViewSet.list', Counter({'list;query': 4}))
+
+    def tearDown(self):
+        shutil.rmtree(self.__directory)
+
+    def __call_command(self, *args):
+        stdout = StringIO()
+        call_command('render_profiles', *args, '--directory', self.__directory, stdout=stdout)
+
+        return stdout.getvalue()
+
+    def test_render_profiles(self):
+        output = self.__call_command('--depth', '1')
+
+        self.assertIn('product.views.ProductViewSet.list (4 samples)', output)
+        self.assertIn('order.views.OrderViewSet.list (4 samples)', output)
+        self.assertIn(' 75.0%  DynamicFieldsSerializer.to_representation', output)
+        self.assertIn(' 75.0%  ProductReadSerializer.to_representation', output)
+
+    def test_render_selected_views(self):
+        output = self.__call_command('order.views.OrderViewSet.list')
+
+        self.assertNotIn('product.views.ProductViewSet.list', output)
+
+    def test_write_merged_stacks(self):
+        path = os.path.join(self.__directory, 'merged.txt')
+        self.__call_command('--output', path)
+
+        self.assertDictEqual(read_collapsed_stacks(path), {
+            'list;ProductReadSerializer.to_representation;DynamicFieldsSerializer.to_representation': 3, 'list;query': 5,
+        })
+
+    def test_invalid_view(self):
+        self.assertRaisesRegex(CommandError, r'^No profiles of views: invalid.$', self.__call_command, 'invalid')
+
+    def test_missing_directory(self):
+        shutil.rmtree(self.__directory)
+
+        self.assertRaisesRegex(CommandError, r'does not exist.$', self.__call_command)
+        os.makedirs(self.__directory)
+
+    def test_invalid_focus(self):
+        self.assertRaisesRegex(CommandError, r'^focus must be a valid regular expression.$', self.__call_command, '--focus', '(')
@@ -0,0 +1,93 @@
+from django.db.models import Count
+
+from rest_framework.test import APITestCase, APISimpleTestCase
+
+from ..datasets import DEFAULT_DATASET_SIZES, DATASET_PASSWORD, DATASET_END_DATETIME, get_dataset_sizes, DatasetGenerator
+from product.models import Product, Option, ProductImage
+from user.models import User, Shopper, Wholesaler, ProductLike, Cart
+from order.models import NORMAL_STATUS, Order, OrderItem, StatusHistory
+
+
+class GetDatasetSizesTestCase(APISimpleTestCase):
+    def test_scale(self):
+        sizes = get_dataset_sizes(0.5)
+
+        self.assertDictEqual(sizes, {key: size // 2 for key, size in DEFAULT_DATASET_SIZES.items()})
+
+    def test_factors(self):
+        sizes = get_dataset_sizes(0.5, {'orders': 4})
+
+        self.assertEqual(sizes['orders'], DEFAULT_DATASET_SIZES['orders'] * 2)
+        self.assertEqual(sizes['products'], DEFAULT_DATASET_SIZES['products'] // 2)
+
+    def test_minimum_size(self):
+        self.assertTrue(all(size == 1 for size in get_dataset_sizes(0.00001).values()))
+
+
+class DatasetGeneratorTestCase(APITestCase):
+    __sizes = {'wholesalers': 2, 'products': 10, 'shoppers': 8, 'orders': 15, 'product_likes': 30, 'carts': 20}
+
+    def __generate(self, seed=0):
+        return DatasetGenerator(self.__sizes, seed, chunk_size=4).generate()
+
+    def test_row_counts(self):
+        row_counts = self.__generate()
+
+        self.assertEqual(Wholesaler.objects.count(), self.__sizes['wholesalers'])
+        self.assertEqual(Shopper.objects.count(), self.__sizes['shoppers'])
+        self.assertEqual(User.objects.count(), self.__sizes['wholesalers'] + self.__sizes['shoppers'])
+        self.assertEqual(Product.objects.count(), self.__sizes['products'])
+        self.assertEqual(Order.objects.count(), self.__sizes['orders'])
+        for model, count in row_counts.items():
+            self.assertEqual(model.objects.count(), count)
+
+    def test_deterministic(self):
+        self.__generate(seed=1)
+        self.__generate(seed=1)
+        prices = list(Product.objects.order_by('id').values_list('price', flat=True))
+
+        self.assertListEqual(prices[:self.__sizes['products']], prices[self.__sizes['products']:])
+
+    def test_consistent_order_items(self):
+        self.__generate()
+
+        for order_item in OrderItem.objects.select_related('order__shopper__membership', 'option__product_color__product'):
+            base_discounted_price = order_item.option.product_color.product.base_discounted_price
+            membership_discount_price = base_discounted_price * order_item.order.shopper.membership.discount_rate // 100 * order_item.count
+
+            self.assertEqual(order_item.sale_price, base_discounted_price * order_item.count)
+            self.assertEqual(order_item.membership_discount_price, membership_discount_price)
+            self.assertEqual(order_item.payment_price, order_item.sale_price - membership_discount_price)
+            self.assertIn(order_item.status_id, NORMAL_STATUS)
+            self.assertEqual(order_item.status_history.count(), NORMAL_STATUS.index(order_item.status_id) + 1)
+        self.assertEqual(StatusHistory.objects.count(), sum(NORMAL_STATUS.index(status_id) + 1 for status_id in OrderItem.objects.values_list('status_id', flat=True)))
+
+    def test_unique_shopper_relations(self):
+        self.__generate()
+
+        self.assertFalse(ProductLike.objects.values('shopper', 'product').annotate(count=Count('id')).filter(count__gt=1).exists())
+        self.assertFalse(Cart.objects.values('shopper', 'option').annotate(count=Count('id')).filter(count__gt=1).exists())
+        self.assertTrue(Option.objects.filter(carts__isnull=False).exists())
+
+    def test_generate_repeatedly(self):
+        self.__generate()
+        self.__generate()
+
+        self.assertEqual(Shopper.objects.count(), self.__sizes['shoppers'] * 2)
+        self.assertEqual(Order.objects.values('number').distinct().count(), self.__sizes['orders'] * 2)
+
+    def test_keep_generated_datetimes(self):
+        self.__generate()
+
+        self.assertFalse(Product.objects.filter(created_at__gt=DATASET_END_DATETIME).exists())
+        self.assertFalse(Cart.objects.filter(created_at__gt=DATASET_END_DATETIME).exists())
+
+    def test_default_values_of_omitted_fields(self):
+        self.__generate()
+
+        self.assertFalse(ProductImage.objects.filter(has_variants=True).exists())
+
+    def test_shopper_password(self):
+        self.__generate()
+
+        self.assertTrue(Shopper.objects.first().check_password(DATASET_PASSWORD))
@@ -0,0 +1,152 @@
+import io
+import shutil
+import tempfile
+from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+
+from rest_framework.test import APISimpleTestCase, APITestCase
+
+from PIL import Image, features
+
+from ..utils import BASE_IMAGE_URL
+from ..models import TemporaryImage
+from ..images import (
+    get_image_variant_path, get_image_variant_urls, create_image_variants, save_image_variants, create_stored_image_variants,
+    defer_image_variants,
+)
+from ..storage import upload_images
+
+
+IMAGE_VARIANT_FORMAT = 'webp' if features.check('webp') else 'png'
+
+
+def get_image_content(width, height, image_format='PNG'):
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), (255, 0, 0)).save(buffer, image_format)
+
+    return buffer.getvalue()
+
+
+@override_settings(IMAGE_VARIANT_FORMAT='webp')
+class ImageVariantPathTestCase(APISimpleTestCase):
+    def test_get_image_variant_path(self):
+        self.assertEqual(get_image_variant_path('product/wholesaler1/product_1.JPG', 360), 'product/wholesaler1/product_1_w360.webp')
+
+    def test_get_image_variant_urls(self):
+        self.assertDictEqual(get_image_variant_urls(TemporaryImage(image_url='product_1.png', has_variants=True)), {
+            'w360': BASE_IMAGE_URL + 'product_1_w360.webp',
+            'w720': BASE_IMAGE_URL + 'product_1_w720.webp',
+        })
+
+    def test_get_image_variant_urls_without_variants(self):
+        self.assertIsNone(get_image_variant_urls(TemporaryImage(image_url='product_1.png')))
+
+
+class CreateImageVariantsTestCase(APISimpleTestCase):
+    def __open_variant(self, content):
+        return Image.open(io.BytesIO(content))
+
+    def test_resize(self):
+        variants = create_image_variants(get_image_content(1000, 500), IMAGE_VARIANT_FORMAT)
+
+        self.assertEqual(self.__open_variant(variants[360]).size, (360, 180))
+        self.assertEqual(self.__open_variant(variants[720]).size, (720, 360))
+        self.assertEqual(self.__open_variant(variants[720]).format, IMAGE_VARIANT_FORMAT.upper())
+
+    def test_not_upscale(self):
+        variants = create_image_variants(get_image_content(500, 500), IMAGE_VARIANT_FORMAT)
+
+        self.assertEqual(self.__open_variant(variants[720]).size, (500, 500))
+
+    def test_convert_palette_image(self):
+        buffer = io.BytesIO()
+        Image.new('P', (800, 400)).save(buffer, 'GIF')
+
+        self.assertEqual(self.__open_variant(create_image_variants(buffer.getvalue(), IMAGE_VARIANT_FORMAT)[360]).size, (360, 180))
+
+
+@override_settings(IMAGE_VARIANT_FORMAT=IMAGE_VARIANT_FORMAT)
+class SaveImageVariantsTestCase(APITestCase):
+    def setUp(self):
+        self.__location = tempfile.mkdtemp()
+        self.__storage = FileSystemStorage(location=self.__location)
+
+    def tearDown(self):
+        shutil.rmtree(self.__location)
+
+    def __assert_variants_exist(self, image_url):
+        for width in (360, 720):
+            self.assertTrue(self.__storage.exists(get_image_variant_path(image_url, width)))
+
+    def test_save_in_process_pool(self):
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            processed_image_urls = save_image_variants(
+                self.__storage, {'product_1.png': get_image_content(1000, 1000), 'product_2.png': get_image_content(400, 800)}, executor
+            )
+
+        self.assertListEqual(processed_image_urls, ['product_1.png', 'product_2.png'])
+        self.__assert_variants_exist('product_1.png')
+        self.__assert_variants_exist('product_2.png')
+
+    def test_skip_invalid_image(self):
+        with ThreadPoolExecutor(max_workers=1) as executor, self.assertLogs('common.images', 'WARNING'):
+            processed_image_urls = save_image_variants(
+                self.__storage, {'invalid.png': b'invalid', 'product_1.png': get_image_content(100, 100)}, executor
+            )
+
+        self.assertListEqual(processed_image_urls, ['product_1.png'])
+        self.assertFalse(self.__storage.exists(get_image_variant_path('invalid.png', 360)))
+
+    def test_skip_failed_variant_save(self):
+        save = self.__storage.save
+
+        def save_or_fail(name, content):
+            if name.startswith('product_1'):
+                raise OSError('storage is unavailable.')
+            return save(name, content)
+
+        with ThreadPoolExecutor(max_workers=1) as executor, self.assertLogs('common.images', 'WARNING'), \
+            patch.object(self.__storage, 'save', side_effect=save_or_fail):
+            processed_image_urls = save_image_variants(
+                self.__storage, {'product_1.png': get_image_content(100, 100), 'product_2.png': get_image_content(100, 100)}, executor
+            )
+
+        self.assertListEqual(processed_image_urls, ['product_2.png'])
+        self.__assert_variants_exist('product_2.png')
+
+    def test_defer_stored_image_variants(self):
+        image_url = self.__storage.save('product_1.png', SimpleUploadedFile('image.png', get_image_content(1000, 1000)))
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            futures = defer_image_variants(self.__storage, self.__storage, [image_url, 'missing.png'], executor)
+            with self.assertLogs('common.images', 'WARNING'):
+                self.assertListEqual([future.result() for future in futures], [True, False])
+
+        self.__assert_variants_exist(image_url)
+
+    def test_mark_rendered_images(self):
+        image_url = self.__storage.save('product_1.png', SimpleUploadedFile('image.png', get_image_content(1000, 1000)))
+        TemporaryImage.objects.create(image_url=image_url)
+
+        self.assertTrue(create_stored_image_variants(self.__storage, self.__storage, image_url))
+        self.assertTrue(TemporaryImage.objects.get(image_url=image_url).has_variants)
+
+    def test_upload_product_images_with_variants(self):
+        images = [SimpleUploadedFile('image.png', get_image_content(1000, 1000))]
+        with ThreadPoolExecutor(max_workers=1) as executor, patch('common.images.get_image_variant_pool', return_value=executor):
+            image_urls = upload_images('product', images, 1, storage=self.__storage, variant_storage=self.__storage)
+
+        self.__assert_variants_exist(image_urls[0].split(self.__storage.base_url)[-1])
+
+    def test_not_render_duplicate_images_again(self):
+        images = [SimpleUploadedFile('image.png', get_image_content(100, 100))]
+        with patch('common.storage.defer_image_variants') as mock:
+            upload_images('product', images, 1, storage=self.__storage, variant_storage=self.__storage, max_workers=1)
+            upload_images('product', images, 1, storage=self.__storage, variant_storage=self.__storage, max_workers=1)
+
+        self.assertEqual(len(mock.call_args_list[0].args[2]), 1)
+        self.assertListEqual(mock.call_args_list[1].args[2], [])
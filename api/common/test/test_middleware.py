@@ -0,0 +1,146 @@
+import json
+import time
+import shutil
+import tempfile
+
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from rest_framework.test import APITestCase, APISimpleTestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from ..models import TemporaryImage
+from ..middleware import QueryBudgetMiddleware, ProfilingMiddleware, get_query_shape
+from ..profiling import read_collapsed_stacks, get_collapsed_stacks_path
+from user.test.factories import UserFactory
+
+
+class GetQueryShapeTestCase(APISimpleTestCase):
+    def test_collapse_placeholder_list(self):
+        self.assertEqual(
+            get_query_shape('SELECT * FROM "cart" WHERE "cart"."id" IN (%s, %s, %s) LIMIT 21'),
+            'SELECT * FROM "cart" WHERE "cart"."id" IN (%s) LIMIT %s',
+        )
+
+    def test_replace_literals(self):
+        self.assertEqual(
+            get_query_shape("SELECT * FROM \"user\" WHERE \"username\" = 'it''s' AND \"id\" = 10"),
+            'SELECT * FROM "user" WHERE "username" = %s AND "id" = %s',
+        )
+
+
+@override_settings(QUERY_BUDGET_SAMPLE_RATE=1, QUERY_BUDGET_MAX_QUERIES=10, QUERY_BUDGET_REPEATED_QUERY_THRESHOLD=3)
+class QueryBudgetMiddlewareTestCase(APITestCase):
+    def __get_response(self, query_count):
+        def get_response(request):
+            for i in range(query_count):
+                TemporaryImage.objects.filter(image_url=str(i)).exists()
+            return HttpResponse()
+
+        return QueryBudgetMiddleware(get_response)(RequestFactory().get('/dummy'))
+
+    def __get_record(self, logs):
+        return json.loads(logs.records[0].getMessage())
+
+    def test_server_timing(self):
+        with self.assertLogs('common.middleware', 'INFO'):
+            response = self.__get_response(2)
+
+        self.assertRegex(response['Server-Timing'], r'^db;dur=\d+\.\d{2};desc="2 queries", app;dur=\d+\.\d{2}$')
+
+    def test_log_within_budget(self):
+        with self.assertLogs('common.middleware', 'INFO') as logs:
+            self.__get_response(3)
+        record = self.__get_record(logs)
+
+        self.assertEqual(logs.records[0].levelname, 'INFO')
+        self.assertEqual(record['query_count'], 3)
+        self.assertEqual(record['path'], '/dummy')
+        self.assertFalse(record['over_budget'])
+        self.assertListEqual(record['repeated_queries'], [])
+
+    def test_flag_repeated_queries(self):
+        with self.assertLogs('common.middleware', 'WARNING') as logs:
+            self.__get_response(4)
+        record = self.__get_record(logs)
+
+        self.assertEqual(len(record['repeated_queries']), 1)
+        self.assertEqual(record['repeated_queries'][0]['count'], 4)
+        self.assertIn('FROM "temporary_image"', record['repeated_queries'][0]['sql'])
+
+    @override_settings(QUERY_BUDGET_REPEATED_QUERY_THRESHOLD=100)
+    def test_flag_over_budget(self):
+        with self.assertLogs('common.middleware', 'WARNING') as logs:
+            self.__get_response(11)
+
+        self.assertTrue(self.__get_record(logs)['over_budget'])
+
+    @override_settings(QUERY_BUDGET_SAMPLE_RATE=0)
+    def test_skip_unsampled_request(self):
+        with self.assertNoLogs('common.middleware'):
+            response = self.__get_response(2)
+
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    def test_view_name(self):
+        with self.assertLogs('common.middleware', 'INFO') as logs:
+            response = self.client.get('/users/wholesalers/buildings')
+
+        self.assertTrue(response.has_header('Server-Timing'))
+        self.assertEqual(self.__get_record(logs)['view'], 'user.views.get_buildings')
+
+
+@override_settings(PROFILING_SAMPLE_RATE=0, PROFILING_INTERVAL=0.001)
+class ProfilingMiddlewareTestCase(APITestCase):
+    def setUp(self):
+        self.__directory = tempfile.mkdtemp()
+        patcher = override_settings(PROFILING_DIRECTORY=self.__directory)
+        patcher.enable()
+        self.addCleanup(patcher.disable)
+
+    def tearDown(self):
+        shutil.rmtree(self.__directory)
+
+    def __get_response(self, user=None):
+        def get_response(request):
+            time.sleep(0.05)
+            return HttpResponse()
+
+        headers = {}
+        if user is not None:
+            headers = {'HTTP_X_PROFILE': '1', 'HTTP_AUTHORIZATION': 'Bearer {}'.format(RefreshToken.for_user(user).access_token)}
+
+        return ProfilingMiddleware(get_response)(RequestFactory().get('/dummy', **headers))
+
+    def __read_stacks(self):
+        return read_collapsed_stacks(get_collapsed_stacks_path(self.__directory, 'unresolved'))
+
+    def test_profile_admin_request(self):
+        response = self.__get_response(UserFactory(is_admin=True))
+        stacks = self.__read_stacks()
+
+        self.assertGreater(int(response['X-Profile-Samples']), 0)
+        self.assertEqual(sum(stacks.values()), int(response['X-Profile-Samples']))
+        self.assertTrue(all(stack.startswith('common.test.test_middleware:') for stack in stacks))
+        self.assertTrue(any('get_response' in stack for stack in stacks))
+
+    def test_merge_samples(self):
+        user = UserFactory(is_admin=True)
+        sample_count = int(self.__get_response(user)['X-Profile-Samples']) + int(self.__get_response(user)['X-Profile-Samples'])
+
+        self.assertEqual(sum(self.__read_stacks().values()), sample_count)
+
+    def test_skip_non_admin_request(self):
+        response = self.__get_response(UserFactory())
+
+        self.assertFalse(response.has_header('X-Profile-Samples'))
+
+    def test_skip_unsampled_request(self):
+        self.assertFalse(self.__get_response().has_header('X-Profile-Samples'))
+
+    @override_settings(PROFILING_SAMPLE_RATE=1)
+    def test_profile_sampled_request(self):
+        response = self.__get_response()
+
+        self.assertGreater(int(response['X-Profile-Samples']), 0)
+
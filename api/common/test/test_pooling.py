@@ -0,0 +1,219 @@
+import time
+import threading
+from contextvars import ContextVar
+from unittest.mock import patch
+
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.test import APITestCase, APISimpleTestCase, APITransactionTestCase
+
+from ..pooling import (
+    DEFAULT_THREADS_PER_WORKER, get_worker_policy, get_pool_configuration, check_pool_configuration, close_unusable_connections,
+    submit_query, _close_unusable_pool_connections, _run_query,
+)
+from ..profiling import StackSampler
+from product.models import Product
+from product.test.factories import ProductFactory
+
+request_id = ContextVar('request_id', default=None)
+
+
+def sleep():
+    time.sleep(0.05)
+
+
+def get_query_context():
+    return threading.current_thread().name, request_id.get(), Product.objects.count()
+
+
+class GetWorkerPolicyTestCase(APISimpleTestCase):
+    def test_derive_from_cpu_count(self):
+        self.assertTupleEqual(get_worker_policy(4, 1, 100), (9, DEFAULT_THREADS_PER_WORKER))
+
+    def test_cap_by_connection_budget(self):
+        self.assertTupleEqual(get_worker_policy(8, 2, 20, threads=4), (2, 4))
+
+    def test_minimum_workers(self):
+        self.assertTupleEqual(get_worker_policy(8, 2, 1), (1, DEFAULT_THREADS_PER_WORKER))
+
+    def test_cap_with_query_threads(self):
+        self.assertTupleEqual(get_worker_policy(8, 1, 20, threads=2, query_threads=2), (5, 2))
+
+    def test_explicit_workers(self):
+        self.assertTupleEqual(get_worker_policy(8, 2, 1, workers=3, threads=1), (3, 1))
+
+
+class PoolConfigurationTestCase(APISimpleTestCase):
+    __databases = {
+        'default': {'CONN_MAX_AGE': 60, 'CONN_HEALTH_CHECKS': True},
+        'replica1': {'CONN_MAX_AGE': 60, 'CONN_HEALTH_CHECKS': True},
+    }
+
+    @override_settings(DB_MAX_CONNECTIONS=100, DB_QUERY_MAX_WORKERS=1)
+    def test_get_pool_configuration(self):
+        with patch('common.pooling.settings.DATABASES', self.__databases):
+            configuration = get_pool_configuration(5, 2)
+
+        self.assertEqual(configuration['query_threads'], 1)
+        self.assertEqual(configuration['connections_per_worker'], 6)
+        self.assertEqual(configuration['max_connections'], 30)
+        self.assertEqual(configuration['connection_budget'], 100)
+        self.assertDictEqual(configuration['aliases']['replica1'], {'conn_max_age': 60, 'health_checks': True})
+
+    @override_settings(DB_MAX_CONNECTIONS=10, DB_QUERY_MAX_WORKERS=0)
+    def test_check_over_budget(self):
+        with patch('common.pooling.settings.DATABASES', self.__databases):
+            warnings = check_pool_configuration(get_pool_configuration(5, 2))
+
+        self.assertListEqual(warnings, ['5 workers with 4 connections each exceed the budget of 10 connections.'])
+
+    @override_settings(DB_MAX_CONNECTIONS=100)
+    def test_check_connection_settings(self):
+        databases = {'default': {'CONN_MAX_AGE': 0}, 'replica1': {'CONN_MAX_AGE': 60}}
+        with patch('common.pooling.settings.DATABASES', databases):
+            warnings = check_pool_configuration(get_pool_configuration(1, 1))
+
+        self.assertListEqual(warnings, [
+            'Connections to default are opened and closed on every request.',
+            'Persistent connections to replica1 are reused without health checks.',
+        ])
+
+
+class CloseUnusableConnectionsTestCase(APITestCase):
+    def setUp(self):
+        self.__connection = connections['default']
+        self.__health_checks = self.__connection.settings_dict['CONN_HEALTH_CHECKS']
+        self.__connection.settings_dict['CONN_HEALTH_CHECKS'] = True
+        self.__connection.ensure_connection()
+
+    def tearDown(self):
+        self.__connection.settings_dict['CONN_HEALTH_CHECKS'] = self.__health_checks
+
+    def __close_unusable_connections(self, usable, in_atomic_block=False):
+        with patch.object(self.__connection, 'is_usable', return_value=usable), \
+            patch.object(self.__connection, 'in_atomic_block', in_atomic_block), \
+            patch.object(self.__connection, 'close') as close_mock:
+            close_unusable_connections()
+
+        return close_mock
+
+    def test_close_unusable_connection(self):
+        self.__close_unusable_connections(usable=False).assert_called_once()
+
+    def test_keep_usable_connection(self):
+        self.__close_unusable_connections(usable=True).assert_not_called()
+
+    def test_keep_connection_in_atomic_block(self):
+        self.__close_unusable_connections(usable=False, in_atomic_block=True).assert_not_called()
+
+    def test_skip_without_health_checks(self):
+        self.__connection.settings_dict['CONN_HEALTH_CHECKS'] = False
+
+        self.__close_unusable_connections(usable=False).assert_not_called()
+
+
+class SubmitQueryTestCase(APITestCase):
+    def test_run_inline_in_atomic_block(self):
+        ProductFactory()
+        future = submit_query(get_query_context)
+
+        self.assertTrue(future.done())
+        self.assertTupleEqual(future.result(), (threading.current_thread().name, None, 1))
+
+    def test_raise_inline_exception(self):
+        future = submit_query(Product.objects.get, id=0)
+
+        self.assertRaises(Product.DoesNotExist, future.result)
+
+
+@override_settings(DB_QUERY_MAX_WORKERS=2)
+class SubmitQueryPoolTestCase(APITransactionTestCase):
+    def test_run_in_pool(self):
+        ProductFactory()
+        token = request_id.set('request')
+        try:
+            thread_name, context_request_id, product_count = submit_query(get_query_context).result()
+        finally:
+            request_id.reset(token)
+
+        self.assertTrue(thread_name.startswith('query'))
+        self.assertEqual(context_request_id, 'request')
+        self.assertEqual(product_count, 1)
+
+    def test_raise_pool_exception(self):
+        future = submit_query(Product.objects.get, id=0)
+
+        self.assertRaises(Product.DoesNotExist, future.result)
+
+    @override_settings(DB_QUERY_MAX_WORKERS=0)
+    def test_run_inline_without_pool(self):
+        self.assertEqual(submit_query(get_query_context).result()[0], threading.current_thread().name)
+
+    def test_record_pool_queries(self):
+        executed_sql = []
+
+        def record(execute, sql, params, many, context):
+            executed_sql.append(sql)
+            return execute(sql, params, many, context)
+
+        with CaptureQueriesContext(connection) as context, connection.execute_wrapper(record):
+            thread_name = submit_query(get_query_context).result()[0]
+
+        self.assertTrue(thread_name.startswith('query'))
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertEqual(len(executed_sql), 1)
+
+    def test_sample_pool_thread(self):
+        with StackSampler(0.001) as sampler:
+            submit_query(sleep).result()
+
+        self.assertIn('common.test.test_pooling:sleep', sampler.stacks)
+
+
+@override_settings(DB_QUERY_MAX_WORKERS=2)
+class RunQueryTestCase(APITransactionTestCase):
+    def __run_queries_in_thread(self, count):
+        created_connections = []
+
+        def run():
+            try:
+                for _ in range(count):
+                    _run_query({}, Product.objects.count)
+            finally:
+                connections.close_all()
+
+        def count_connection(sender, connection, **kwargs):
+            created_connections.append(connection.alias)
+
+        connection_created.connect(count_connection)
+        try:
+            thread = threading.Thread(target=run)
+            thread.start()
+            thread.join()
+        finally:
+            connection_created.disconnect(count_connection)
+
+        return created_connections
+
+    def test_keep_connection_without_conn_max_age(self):
+        self.assertEqual(connections['default'].settings_dict['CONN_MAX_AGE'], 0)
+        self.assertListEqual(self.__run_queries_in_thread(3), ['default'])
+
+    def test_close_unusable_connection_without_conn_max_age(self):
+        connection.ensure_connection()
+        with patch.object(connections['default'], 'is_usable', return_value=False), patch.object(connections['default'], 'close') as mock:
+            _close_unusable_pool_connections()
+
+        mock.assert_called_once_with()
+
+    def test_reuse_usable_connection_without_conn_max_age(self):
+        connection.ensure_connection()
+        connection.errors_occurred = True
+        with patch.object(connections['default'], 'close') as mock:
+            _close_unusable_pool_connections()
+
+        mock.assert_not_called()
+        self.assertFalse(connection.errors_occurred)
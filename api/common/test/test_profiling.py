@@ -0,0 +1,80 @@
+import sys
+import time
+import shutil
+import tempfile
+from collections import Counter
+
+from rest_framework.test import APISimpleTestCase
+
+from ..profiling import (
+    get_frame_label, StackSampler, get_collapsed_stacks_path, write_collapsed_stacks, read_collapsed_stacks, get_frame_samples, get_hot_paths,
+)
+
+
+def get_current_frame_label():
+    return get_frame_label(sys._getframe())
+
+
+class GetFrameLabelTestCase(APISimpleTestCase):
+    @classmethod
+    def __get_class_frame_label(cls):
+        return get_frame_label(sys._getframe())
+
+    def test_function(self):
+        self.assertEqual(get_current_frame_label(), 'common.test.test_profiling:get_current_frame_label')
+
+    def test_method(self):
+        self.assertEqual(get_frame_label(sys._getframe()), 'common.test.test_profiling:GetFrameLabelTestCase.test_method')
+
+    def test_class_method(self):
+        self.assertEqual(self.__get_class_frame_label(), 'common.test.test_profiling:GetFrameLabelTestCase.__get_class_frame_label')
+
+
+class StackSamplerTestCase(APISimpleTestCase):
+    def __sleep(self):
+        time.sleep(0.05)
+
+    def test_sample_frames_below_context(self):
+        with StackSampler(0.001) as sampler:
+            self.__sleep()
+
+        self.assertGreater(sum(sampler.stacks.values()), 0)
+        self.assertIn('common.test.test_profiling:StackSamplerTestCase.__sleep', sampler.stacks)
+
+
+class CollapsedStacksTestCase(APISimpleTestCase):
+    def setUp(self):
+        self.__directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.__directory)
+
+    def test_file_name(self):
+        self.assertTrue(get_collapsed_stacks_path(self.__directory, 'a/b c.view').endswith('/a_b_c.view.folded'))
+
+    def test_merge_written_stacks(self):
+        write_collapsed_stacks(self.__directory, 'view', Counter({'a;b': 2, 'a;c': 1}))
+        write_collapsed_stacks(self.__directory, 'view', Counter({'a;b': 3}))
+
+        self.assertDictEqual(read_collapsed_stacks(get_collapsed_stacks_path(self.__directory, 'view')), {'a;b': 5, 'a;c': 1})
+
+
+class StackAggregationTestCase(APISimpleTestCase):
+    __stacks = Counter({
+        'view;ProductReadSerializer.to_representation;DynamicFieldsSerializer.to_representation': 3,
+        'view;ProductReadSerializer.to_representation;render': 2,
+        'view;query': 5,
+    })
+
+    def test_frame_samples(self):
+        samples = get_frame_samples(self.__stacks, 'Serializer')
+
+        self.assertDictEqual(samples, {'ProductReadSerializer.to_representation': 5, 'DynamicFieldsSerializer.to_representation': 3})
+
+    def test_count_recursive_frame_once(self):
+        self.assertDictEqual(get_frame_samples(Counter({'a;b;a': 2})), {'a': 2, 'b': 2})
+
+    def test_hot_paths(self):
+        paths = get_hot_paths(self.__stacks, 1)
+
+        self.assertDictEqual(paths, {'DynamicFieldsSerializer.to_representation': 3, 'render': 2, 'query': 5})
@@ -0,0 +1,60 @@
+import json
+from decimal import Decimal
+from datetime import datetime, date, time, timezone
+
+from django.utils.translation import gettext_lazy
+
+from rest_framework.test import APISimpleTestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.exceptions import ErrorDetail
+
+from ..renderers import EnvelopeJSONRenderer
+from ..utils import get_response_body
+
+
+class EnvelopeJSONRendererTestCase(APISimpleTestCase):
+    def setUp(self):
+        self.__renderer = EnvelopeJSONRenderer()
+
+    def __assert_same_as_json_renderer(self, data):
+        self.assertEqual(self.__renderer.render(data), JSONRenderer().render(data))
+
+    def test_success_envelope(self):
+        data = {'id': 1, 'name': '상품', 'created_at': datetime(2022, 3, 1, 12, 30), 'images': [{'url': 'a.png'}]}
+
+        self.__assert_same_as_json_renderer(get_response_body(200, data=data))
+        self.__assert_same_as_json_renderer(get_response_body(201, data={'id': 1}))
+
+    def test_failure_envelope(self):
+        self.__assert_same_as_json_renderer(get_response_body(400, message=[ErrorDetail('invalid', code='invalid')]))
+
+    def test_types_unsupported_by_orjson(self):
+        data = {'price': Decimal('1.5'), 'ids': {3}, 'message': gettext_lazy('success'), 1: 'non string key'}
+
+        self.assertDictEqual(
+            json.loads(self.__renderer.render(data)), {'price': 1.5, 'ids': [3], 'message': 'success', '1': 'non string key'}
+        )
+
+    def test_datetimes(self):
+        self.__assert_same_as_json_renderer({
+            'utc': datetime(2022, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc), 'date': date(2022, 3, 1),
+            'time': time(12, 30, 15, 123456),
+        })
+
+    def test_non_finite_float(self):
+        for value in (float('nan'), float('inf'), float('-inf')):
+            self.assertRaises(ValueError, self.__renderer.render, get_response_body(200, data={'values': [None, value]}))
+
+    def test_big_integer(self):
+        self.__assert_same_as_json_renderer(get_response_body(200, data={'id': 2 ** 64, 'ids': [-2 ** 70]}))
+
+    def test_escape_line_separators(self):
+        self.__assert_same_as_json_renderer({'text': 'a\u2028b\u2029c'})
+
+    def test_indent(self):
+        rendered = self.__renderer.render(get_response_body(200, data={'id': 1}), 'application/json; indent=2')
+
+        self.assertEqual(rendered, b'{\n  "code": 200,\n  "message": "success",\n  "data": {\n    "id": 1\n  }\n}')
+
+    def test_empty_data(self):
+        self.assertEqual(self.__renderer.render(None), b'')
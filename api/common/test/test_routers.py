@@ -0,0 +1,161 @@
+import time
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.decorators import api_view
+from rest_framework.viewsets import GenericViewSet
+from rest_framework.test import APITestCase, APISimpleTestCase, APITransactionTestCase
+
+from ..routers import REPLICA_PIN_COOKIE_NAME, ReplicaRouter, ReplicaRoutingMiddleware, read_replica
+from product.models import Product
+from product.test.factories import ProductFactory
+
+
+class DummyViewSet(GenericViewSet):
+    read_replica_actions = ('list',)
+
+    def list(self, request):
+        return HttpResponse()
+
+    def retrieve(self, request):
+        return HttpResponse()
+
+    def create(self, request):
+        return HttpResponse()
+
+
+@read_replica
+@api_view(['GET'])
+def get_dummy(request):
+    return HttpResponse()
+
+
+@api_view(['GET'])
+def get_primary_dummy(request):
+    return HttpResponse()
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'], REPLICA_PIN_SECONDS=5)
+class ReplicaRoutingMiddlewareTestCase(APISimpleTestCase):
+    __router = ReplicaRouter()
+
+    def __write(self):
+        request = RequestFactory().post('/dummy')
+        response = ReplicaRoutingMiddleware(lambda request: HttpResponse())(request)
+
+        return {name: morsel.value for name, morsel in response.cookies.items()}
+
+    def __get_read_alias(self, method, view_func, cookies=None):
+        read_aliases = []
+        request = getattr(RequestFactory(), method)('/dummy')
+        request.COOKIES.update(cookies or {})
+
+        def get_response(request):
+            middleware.process_view(request, view_func, (), {})
+            read_aliases.append(self.__router.db_for_read(Product))
+            return HttpResponse()
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        middleware(request)
+
+        return read_aliases[0]
+
+    def test_replica_action(self):
+        self.assertEqual(self.__get_read_alias('get', DummyViewSet.as_view({'get': 'list'})), 'replica1')
+
+    def test_primary_action(self):
+        self.assertEqual(self.__get_read_alias('get', DummyViewSet.as_view({'get': 'retrieve'})), DEFAULT_DB_ALIAS)
+
+    def test_replica_function_view(self):
+        self.assertEqual(self.__get_read_alias('get', get_dummy), 'replica1')
+        self.assertEqual(self.__get_read_alias('get', get_primary_dummy), DEFAULT_DB_ALIAS)
+
+    def test_unsafe_method(self):
+        self.assertEqual(self.__get_read_alias('post', DummyViewSet.as_view({'post': 'list'})), DEFAULT_DB_ALIAS)
+
+    def test_reset_after_response(self):
+        self.__get_read_alias('get', get_dummy)
+
+        self.assertEqual(self.__router.db_for_read(Product), DEFAULT_DB_ALIAS)
+
+    def test_pin_after_write(self):
+        cookies = self.__write()
+
+        self.assertEqual(self.__get_read_alias('get', get_dummy, cookies), DEFAULT_DB_ALIAS)
+        self.assertEqual(self.__get_read_alias('get', get_dummy), 'replica1')
+
+    def test_ignore_unsigned_pin(self):
+        self.assertEqual(self.__get_read_alias('get', get_dummy, {REPLICA_PIN_COOKIE_NAME: '1'}), 'replica1')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_not_pin_without_replicas(self):
+        self.assertDictEqual(self.__write(), {})
+
+    def test_pin_expiration(self):
+        cookies = self.__write()
+
+        with patch('django.core.signing.time.time', return_value=time.time() + 6):
+            self.assertEqual(self.__get_read_alias('get', get_dummy, cookies), 'replica1')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas(self):
+        self.assertEqual(self.__get_read_alias('get', get_dummy), DEFAULT_DB_ALIAS)
+
+
+class ReplicaRouterTestCase(APITestCase):
+    __router = ReplicaRouter()
+
+    def test_write_to_primary(self):
+        self.assertEqual(self.__router.db_for_write(Product), DEFAULT_DB_ALIAS)
+
+    @override_settings(DATABASE_REPLICAS=['replica1'])
+    def test_read_in_atomic_block(self):
+        def get_response(request):
+            middleware.process_view(request, get_dummy, (), {})
+            with transaction.atomic():
+                read_aliases.append(self.__router.db_for_read(Product))
+            return HttpResponse()
+
+        read_aliases = []
+        middleware = ReplicaRoutingMiddleware(get_response)
+        middleware(RequestFactory().get('/dummy'))
+
+        self.assertListEqual(read_aliases, [DEFAULT_DB_ALIAS])
+
+    @override_settings(DATABASE_REPLICAS=['replica1'])
+    def test_allow_migrate(self):
+        self.assertTrue(self.__router.allow_migrate(DEFAULT_DB_ALIAS, 'product'))
+        self.assertFalse(self.__router.allow_migrate('replica1', 'product'))
+
+
+@skipUnless(settings.DATABASE_REPLICAS, 'DB_REPLICA_HOSTS is not set.')
+class ReplicaRoutingTestCase(APITransactionTestCase):
+    databases = '__all__'
+
+    def setUp(self):
+        ProductFactory()
+
+    def __capture_queries(self, alias):
+        return CaptureQueriesContext(connections[alias])
+
+    def test_read_from_replica(self):
+        with self.__capture_queries(settings.DATABASE_REPLICAS[0]) as replica_queries:
+            with override_settings(DATABASE_REPLICAS=settings.DATABASE_REPLICAS[:1]):
+                response = self.client.get('/products')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(replica_queries.captured_queries)
+
+    def test_read_own_writes_from_primary(self):
+        self.client.post('/products', {})
+        with self.__capture_queries(DEFAULT_DB_ALIAS) as primary_queries:
+            response = self.client.get('/products')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(primary_queries.captured_queries)
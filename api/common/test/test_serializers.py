@@ -1,4 +1,6 @@
 from copy import deepcopy
+from types import SimpleNamespace
+from unittest.mock import patch
 
 from rest_framework.test import APISimpleTestCase
 from rest_framework.serializers import Serializer, CharField, IntegerField
@@ -255,6 +257,55 @@ class SerializerMixinTestCase(APISimpleTestCase):
             exclude_fields=self.__exclude_fields
         )
 
+    def test_compile_field_plan_once(self):
+        with patch.object(Serializer, 'get_fields', autospec=True, side_effect=Serializer.get_fields) as mock:
+            self.__test_serializer_class(allow_fields=['mobile_number']).fields
+            self.__test_serializer_class(allow_fields=['mobile_number']).fields
+
+        self.assertEqual(mock.call_count, 1)
+
+    def test_share_field_plan_regardless_of_order(self):
+        with patch.object(SerializerMixin, '_SerializerMixin__field_plans', {}), \
+            patch.object(Serializer, 'get_fields', autospec=True, side_effect=Serializer.get_fields) as mock:
+            self.__test_serializer_class(allow_fields=['name', 'age']).fields
+            self.__test_serializer_class(allow_fields=['age', 'name']).fields
+
+        self.assertEqual(mock.call_count, 1)
+
+    @patch('common.serializers.MAXIMUM_NUMBER_OF_FIELD_PLANS', 1)
+    def test_bound_field_plans(self):
+        with patch.object(SerializerMixin, '_SerializerMixin__field_plans', {}) as field_plans:
+            self.__test_serializer_class(allow_fields=['name']).fields
+            serializer = self.__test_serializer_class(allow_fields=['age'])
+
+            self.assertEqual(len(field_plans), 1)
+            self.assertListEqual(list(serializer.fields), ['age'])
+
+    def test_copy_fields_from_plan(self):
+        serializer = self.__test_serializer_class(allow_fields=self.__allow_fields)
+        serializer.fields.pop('name')
+
+        self.assertSetEqual(set(self.__test_serializer_class(allow_fields=self.__allow_fields).fields), set(self.__allow_fields))
+
+    def test_representation(self):
+        instance = SimpleNamespace(name='name', age=None, mobile_number='01012345678', address='address')
+        serializer = self.__test_serializer_class(instance, exclude_fields=['address'])
+
+        self.assertDictEqual(serializer.data, {'name': 'name', 'age': None, 'mobile_number': '01012345678'})
+
+    def test_representation_of_mapping(self):
+        instance = {'name': 'name', 'age': 20, 'mobile_number': '01012345678', 'address': 'address'}
+
+        self.assertDictEqual(self.__test_serializer_class(instance).data, instance)
+
+    def test_representation_of_callable_source(self):
+        class DummyCallableSourceSerializer(SerializerMixin, Serializer):
+            name = CharField(source='get_name')
+
+        instance = SimpleNamespace(get_name=lambda: 'name')
+
+        self.assertDictEqual(DummyCallableSourceSerializer(instance).data, {'name': 'name'})
+
 
 class SettingItemSerializerTestCase(SerializerTestCase):
     _serializer_class = SettingItemSerializer
@@ -0,0 +1,330 @@
+import json
+import hashlib
+import time
+import base64
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest.mock import patch, PropertyMock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+
+from rest_framework.test import APITestCase
+from rest_framework.exceptions import ValidationError
+
+from ..models import TemporaryImage, ImageHash, PresignedUpload
+from ..exceptions import ImageUploadError
+from ..validators import MAXIMUM_FILE_SIZE, claim_image_urls
+from ..images import get_image_variant_path
+from ..storage import (
+    MediaStorage, upload_images, get_presigned_posts, complete_presigned_uploads, get_stored_image_paths, delete_files,
+)
+
+
+class LatencyFileSystemStorage(FileSystemStorage):
+    def __init__(self, latency, failing_names=(), *args, **kwargs):
+        self.latency = latency
+        self.failing_names = failing_names
+        super().__init__(*args, **kwargs)
+
+    def _save(self, name, content):
+        time.sleep(self.latency)
+        if content.name in self.failing_names:
+            raise OSError('storage is unavailable.')
+
+        return super()._save(name, content)
+
+
+class UploadImagesTestCase(APITestCase):
+    __latency = 0.2
+
+    def setUp(self):
+        self.__location = tempfile.mkdtemp()
+        self.__images = [SimpleUploadedFile('image{}.png'.format(i), 'content{}'.format(i).encode()) for i in range(5)]
+
+    def tearDown(self):
+        shutil.rmtree(self.__location)
+
+    def __get_storage(self, failing_names=()):
+        return LatencyFileSystemStorage(self.__latency, failing_names, location=self.__location, base_url='/media/')
+
+    def __upload_images(self, storage, max_workers):
+        start_time = time.perf_counter()
+        result = upload_images('business_registration', self.__images, storage=storage, max_workers=max_workers)
+
+        return result, time.perf_counter() - start_time
+
+    def test_upload_in_parallel(self):
+        storage = self.__get_storage()
+        result, elapsed_time = self.__upload_images(storage, 5)
+
+        self.assertLess(elapsed_time, self.__latency * len(self.__images) / 2)
+        self.assertEqual(len(result), len(self.__images))
+        self.assertEqual(TemporaryImage.objects.count(), len(self.__images))
+
+    def test_preserve_order(self):
+        storage = self.__get_storage()
+        result, _ = self.__upload_images(storage, 5)
+        names = [url[len('/media/'):] for url in result]
+
+        self.assertListEqual(names, sorted(names))
+        for index, name in enumerate(names):
+            with storage.open(name) as file:
+                self.assertEqual(file.read(), 'content{}'.format(index).encode())
+
+    def test_upload_serially(self):
+        result, elapsed_time = self.__upload_images(self.__get_storage(), 1)
+
+        self.assertGreaterEqual(elapsed_time, self.__latency * len(self.__images))
+        self.assertEqual(len(result), len(self.__images))
+
+    def test_collect_errors(self):
+        storage = self.__get_storage(['image1.png', 'image3.png'])
+
+        with self.assertRaises(ImageUploadError) as context:
+            self.__upload_images(storage, 5)
+
+        self.assertEqual(context.exception.status_code, 503)
+        self.assertEqual(context.exception.detail['message'], ImageUploadError.default_detail)
+        self.assertListEqual(
+            [(error['index'], error['name']) for error in context.exception.detail['errors']],
+            [('1', 'image1.png'), ('3', 'image3.png')]
+        )
+        self.assertFalse(TemporaryImage.objects.exists())
+        self.assertFalse(ImageHash.objects.exists())
+        self.assertListEqual(storage.listdir('business_registration')[1], [])
+
+    def test_use_saved_name(self):
+        storage = self.__get_storage()
+        upload_path = 'business_registration/business_registration_image.png'
+        storage.save(upload_path, ContentFile(b'stored'))
+
+        with patch('common.storage.get_upload_paths', return_value=[upload_path]):
+            result = upload_images('business_registration', self.__images[:1], storage=storage, max_workers=1)
+        name = result[0][len('/media/'):]
+
+        self.assertNotEqual(name, upload_path)
+        self.assertTrue(TemporaryImage.objects.filter(image_url=name).exists())
+        with storage.open(name) as file:
+            self.assertEqual(file.read(), b'content0')
+
+    def test_invalid_type(self):
+        self.assertListEqual(upload_images('invalid', self.__images, storage=self.__get_storage()), [])
+
+
+class DeduplicateUploadedImagesTestCase(APITestCase):
+    def setUp(self):
+        self.__location = tempfile.mkdtemp()
+        self.__storage = FileSystemStorage(location=self.__location, base_url='/media/')
+
+    def tearDown(self):
+        shutil.rmtree(self.__location)
+
+    def __upload_images(self, *contents, **kwargs):
+        images = [SimpleUploadedFile('image{}.png'.format(i), content) for i, content in enumerate(contents)]
+
+        return [url[len('/media/'):] for url in upload_images('business_registration', images, storage=self.__storage, **kwargs)]
+
+    def __read(self, image_url):
+        with self.__storage.open(image_url) as file:
+            return file.read()
+
+    def test_reference_stored_content(self):
+        image_url = self.__upload_images(b'content')[0]
+
+        with patch.object(self.__storage, 'save', wraps=self.__storage.save) as mock:
+            duplicate_image_url = self.__upload_images(b'content')[0]
+
+        mock.assert_not_called()
+        self.assertEqual(duplicate_image_url, image_url)
+        self.assertListEqual(list(TemporaryImage.objects.values_list('image_url', 'reference_count')), [(image_url, 2)])
+        self.assertListEqual(claim_image_urls([image_url]), [image_url])
+        self.assertListEqual(claim_image_urls([image_url]), [image_url])
+        self.assertEqual(ImageHash.objects.get().reference_count, 2)
+
+    def test_reference_claimed_content(self):
+        image_url = self.__upload_images(b'content')[0]
+        claim_image_urls([image_url])
+        ImageHash.objects.update(has_variants=True)
+
+        self.assertEqual(self.__upload_images(b'content')[0], image_url)
+        self.assertListEqual(list(TemporaryImage.objects.values_list('image_url', 'reference_count', 'has_variants')), [(image_url, 1, True)])
+
+    def test_save_duplicates_in_one_upload_once(self):
+        image_urls = self.__upload_images(b'content', b'other content', b'content')
+
+        self.assertEqual(image_urls[2], image_urls[0])
+        self.assertEqual(len(self.__storage.listdir('business_registration')[1]), 2)
+        self.assertEqual(ImageHash.objects.count(), 2)
+        self.assertEqual(TemporaryImage.objects.get(image_url=image_urls[0]).reference_count, 2)
+
+    def test_raise_upload_error_on_deleted_stored_image(self):
+        image_url = self.__upload_images(b'content')[0]
+        get_duplicate_image_urls = lambda *args: {hashlib.sha256(b'content').hexdigest(): image_url}
+        ImageHash.objects.all().delete()
+
+        with patch('common.storage.get_duplicate_image_urls', get_duplicate_image_urls), self.assertRaises(ImageUploadError) as context:
+            self.__upload_images(b'content', b'other content')
+
+        self.assertListEqual([error['index'] for error in context.exception.detail['errors']], ['0'])
+        self.assertEqual(TemporaryImage.objects.get().reference_count, 1)
+        self.assertFalse(ImageHash.objects.exists())
+        self.assertEqual(len(self.__storage.listdir('business_registration')[1]), 1)
+
+    def test_use_streamed_content_hashes(self):
+        image_url = self.__upload_images(b'content', content_hashes=['hash'])[0]
+
+        self.assertEqual(ImageHash.objects.get(image_url=image_url).content_hash, 'hash')
+
+    def test_report_errors_of_duplicates(self):
+        with patch.object(self.__storage, 'save', side_effect=OSError('storage is unavailable.')):
+            with self.assertRaises(ImageUploadError) as context:
+                self.__upload_images(b'content', b'content')
+
+        self.assertListEqual([error['index'] for error in context.exception.detail['errors']], ['0', '1'])
+        self.assertFalse(ImageHash.objects.exists())
+
+
+class GetPresignedPostsTestCase(APITestCase):
+    def setUp(self):
+        self.__storage = MediaStorage(access_key='access_key', secret_key='secret_key', region_name='ap-northeast-2', bucket_name='deepy')
+
+    def test_presigned_posts(self):
+        presigned_posts = get_presigned_posts('product', ['image.PNG', 'image.jpg'], 1, storage=self.__storage)
+        policy = json.loads(base64.b64decode(presigned_posts[0]['fields']['policy']))
+
+        self.assertEqual(len(presigned_posts), 2)
+        self.assertTrue(presigned_posts[0]['image_url'].startswith('product/wholesaler1/product_'))
+        self.assertTrue(presigned_posts[0]['image_url'].endswith('.png'))
+        self.assertEqual(presigned_posts[0]['fields']['key'], 'media/' + presigned_posts[0]['image_url'])
+        self.assertEqual(presigned_posts[0]['fields']['Content-Type'], 'image/png')
+        self.assertEqual(presigned_posts[1]['fields']['Content-Type'], 'image/jpeg')
+        self.assertIn(['content-length-range', 1, MAXIMUM_FILE_SIZE], policy['conditions'])
+        self.assertIn({'Content-Type': 'image/png'}, policy['conditions'])
+        self.assertNotEqual(presigned_posts[0]['image_url'], presigned_posts[1]['image_url'])
+        self.assertSetEqual(
+            set(PresignedUpload.objects.values_list('image_url', flat=True)),
+            set(presigned_post['image_url'] for presigned_post in presigned_posts)
+        )
+
+    def test_invalid_type(self):
+        self.assertListEqual(get_presigned_posts('invalid', ['image.png'], storage=self.__storage), [])
+
+
+class CompletePresignedUploadsTestCase(APITestCase):
+    def setUp(self):
+        self.__location = tempfile.mkdtemp()
+        self.__storage = FileSystemStorage(location=self.__location, base_url='/media/')
+        self.__upload_path = self.__storage.save('product/wholesaler1/product_20220101_000000000000.png', SimpleUploadedFile('image.png', b'content'))
+        PresignedUpload.objects.create(image_url=self.__upload_path, expires_at=timezone.now() + timedelta(hours=1))
+
+    def tearDown(self):
+        shutil.rmtree(self.__location)
+
+    def test_complete(self):
+        result = complete_presigned_uploads('product', [self.__upload_path], 1, storage=self.__storage)
+
+        self.assertListEqual(result, ['/media/' + self.__upload_path])
+        self.assertTrue(TemporaryImage.objects.filter(image_url=self.__upload_path).exists())
+        self.assertFalse(PresignedUpload.objects.exists())
+
+    def test_raise_validation_error_on_replay(self):
+        complete_presigned_uploads('product', [self.__upload_path], 1, storage=self.__storage)
+        claim_image_urls([self.__upload_path])
+
+        self.assertRaisesRegex(
+            ValidationError, r'is not issued.', complete_presigned_uploads, 'product', [self.__upload_path], 1, storage=self.__storage
+        )
+        self.assertFalse(TemporaryImage.objects.exists())
+
+    def test_raise_validation_error_on_unissued_key(self):
+        upload_path = self.__storage.save('product/wholesaler1/product_unissued.png', SimpleUploadedFile('image.png', b'content'))
+
+        self.assertRaisesRegex(
+            ValidationError, r'is not issued.', complete_presigned_uploads, 'product', [upload_path], 1, storage=self.__storage
+        )
+
+    def test_raise_validation_error_on_expired_key(self):
+        PresignedUpload.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        self.assertRaisesRegex(
+            ValidationError, r'is not issued.', complete_presigned_uploads, 'product', [self.__upload_path], 1, storage=self.__storage
+        )
+
+    def test_raise_validation_error_on_other_prefix(self):
+        self.assertRaisesRegex(
+            ValidationError, r'is not issued.', complete_presigned_uploads, 'product', [self.__upload_path], 2, storage=self.__storage
+        )
+
+    def test_raise_validation_error_on_suspicious_key(self):
+        upload_path = 'product/wholesaler1/../../../product_20220101_000000000000.png'
+        PresignedUpload.objects.create(image_url=upload_path, expires_at=timezone.now() + timedelta(hours=1))
+
+        self.assertRaisesRegex(
+            ValidationError, r'is not issued.', complete_presigned_uploads, 'product', [upload_path], 1, storage=self.__storage
+        )
+
+    def test_raise_validation_error_on_missing_object(self):
+        upload_path = 'product/wholesaler1/product_missing.png'
+        PresignedUpload.objects.create(image_url=upload_path, expires_at=timezone.now() + timedelta(hours=1))
+
+        self.assertRaisesRegex(
+            ValidationError, r'is not uploaded.', complete_presigned_uploads, 'product', [upload_path], 1, storage=self.__storage
+        )
+        self.assertTrue(PresignedUpload.objects.filter(image_url=upload_path).exists())
+
+    def test_raise_validation_error_on_large_object(self):
+        with patch.object(self.__storage, 'size', return_value=MAXIMUM_FILE_SIZE + 1):
+            self.assertRaisesRegex(
+                ValidationError, r'10MB', complete_presigned_uploads, 'product', [self.__upload_path], 1, storage=self.__storage
+            )
+
+
+class GetStoredImagePathsTestCase(APITestCase):
+    def test_image_with_variants(self):
+        image_url = 'product/wholesaler1/product_20220101_000000000000.png'
+
+        self.assertListEqual(
+            get_stored_image_paths(image_url),
+            [image_url, get_image_variant_path(image_url, 360), get_image_variant_path(image_url, 720)],
+        )
+
+    def test_image_without_variants(self):
+        image_url = 'business_registration/business_registration_20220101_000000000000.png'
+
+        self.assertListEqual(get_stored_image_paths(image_url), [image_url])
+
+
+class DeleteFilesTestCase(APITestCase):
+    def setUp(self):
+        self.__location = tempfile.mkdtemp()
+        self.__storage = FileSystemStorage(location=self.__location)
+        self.__names = [self.__storage.save('image{}.png'.format(i), ContentFile(b'content')) for i in range(5)]
+
+    def tearDown(self):
+        shutil.rmtree(self.__location)
+
+    def test_delete_in_batches(self):
+        deleted_names = delete_files(self.__storage, self.__names + ['missing.png'], batch_size=2, max_workers=3)
+
+        self.assertListEqual(sorted(deleted_names), sorted(self.__names + ['missing.png']))
+        self.assertFalse(any(self.__storage.exists(name) for name in self.__names))
+
+    def test_exclude_failed_names(self):
+        with patch.object(self.__storage, 'delete', side_effect=OSError('storage is unavailable.')):
+            self.assertListEqual(delete_files(self.__storage, self.__names, batch_size=2), [])
+
+    @patch.object(MediaStorage, 'bucket', new_callable=PropertyMock)
+    def test_delete_s3_objects(self, mock):
+        mock.return_value.delete_objects.return_value = {'Errors': [{'Key': 'media/image1.png', 'Code': 'InternalError'}]}
+        storage = MediaStorage(access_key='access_key', secret_key='secret_key', region_name='ap-northeast-2', bucket_name='deepy')
+        deleted_names = delete_files(storage, self.__names, batch_size=3, max_workers=1)
+
+        self.assertListEqual(deleted_names, [name for name in self.__names if name != 'image1.png'])
+        self.assertEqual(mock.return_value.delete_objects.call_count, 2)
+        mock.return_value.delete_objects.assert_any_call(
+            Delete={'Objects': [{'Key': 'media/image3.png'}, {'Key': 'media/image4.png'}], 'Quiet': True}
+        )
@@ -0,0 +1,81 @@
+import hashlib
+import mimetypes
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadhandler import MemoryFileUploadHandler
+from django.http.multipartparser import MultiPartParser
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+
+from rest_framework.test import APISimpleTestCase
+
+from ..upload_handlers import ImageUploadHandler
+
+
+class ReceivedSizeUploadHandler(MemoryFileUploadHandler):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.received_size = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received_size += len(raw_data)
+
+        return super().receive_data_chunk(raw_data, start)
+
+
+class ImageUploadHandlerTestCase(APISimpleTestCase):
+    class LimitedImageUploadHandler(ImageUploadHandler):
+        chunk_size = 1024
+        maximum_file_size = 4096
+        maximum_number_of_files = 3
+        maximum_request_body_size = 1048576
+
+    def __parse(self, files, content_length=None):
+        body = encode_multipart(BOUNDARY, {'image': files})
+        meta = {'CONTENT_TYPE': MULTIPART_CONTENT, 'CONTENT_LENGTH': content_length or len(body)}
+        self.__upload_handler = self.LimitedImageUploadHandler()
+        self.__received_size_upload_handler = ReceivedSizeUploadHandler()
+
+        return MultiPartParser(meta, BytesIO(body), [self.__upload_handler, self.__received_size_upload_handler]).parse()[1]
+
+    def __get_image(self, size, name='image.png'):
+        return SimpleUploadedFile(name, b'0' * size, content_type=mimetypes.guess_type(name)[0])
+
+    def test_accept_images(self):
+        files = self.__parse([self.__get_image(4096), self.__get_image(10, 'image.jpg')])
+
+        self.assertIsNone(self.__upload_handler.error)
+        self.assertEqual([file.size for file in files.getlist('image')], [4096, 10])
+
+    def test_hash_while_streaming(self):
+        files = self.__parse([self.__get_image(4096), self.__get_image(10, 'image.jpg')])
+
+        self.assertListEqual(
+            self.__upload_handler.content_hashes['image'],
+            [hashlib.sha256(file.read()).hexdigest() for file in files.getlist('image')],
+        )
+
+    def test_stop_at_oversized_file(self):
+        files = self.__parse([self.__get_image(100), self.__get_image(1024 * 100)])
+
+        self.assertEqual(self.__upload_handler.error, 'The maximum file size that can be uploaded is 4KB')
+        self.assertLessEqual(self.__received_size_upload_handler.received_size, 100 + 4096)
+        self.assertEqual(len(files.getlist('image')), 1)
+
+    def test_stop_at_too_many_files(self):
+        self.__parse([self.__get_image(10) for _ in range(4)])
+
+        self.assertEqual(self.__upload_handler.error, 'The maximum number of files that can be uploaded is 3.')
+        self.assertEqual(self.__received_size_upload_handler.received_size, 30)
+
+    def test_stop_at_non_image_file(self):
+        self.__parse([self.__get_image(10, 'document.pdf')])
+
+        self.assertEqual(self.__upload_handler.error, 'document.pdf is not an image file.')
+        self.assertEqual(self.__received_size_upload_handler.received_size, 0)
+
+    def test_reject_large_body_without_reading(self):
+        files = self.__parse([self.__get_image(10)], content_length=1048577)
+
+        self.assertEqual(self.__upload_handler.error, 'The request body is too large.')
+        self.assertEqual(len(files), 0)
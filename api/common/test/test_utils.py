@@ -4,14 +4,17 @@ from datetime import date, datetime, timedelta
 from django.http import QueryDict
 from django.http import JsonResponse
 
+from rest_framework.test import APITestCase
 from rest_framework.response import Response
 from rest_framework.exceptions import APIException
 
 from .test_cases import FunctionTestCase
 from ..utils import (
     BASE_IMAGE_URL, get_response_body, get_response, querydict_to_dict, gmt_to_kst, datetime_to_iso, levenshtein,
-    check_integer_format, get_full_image_url,
+    check_integer_format, get_full_image_url, get_first_unused_value,
 )
+from user.models import Membership
+from user.test.factories import MembershipFactory
 
 
 class GetResponseBodyTestCase(FunctionTestCase):
@@ -173,4 +176,16 @@ class GetFullImageUrlTestCase(FunctionTestCase):
     def test(self):
         test_data = 'test.png'
 
-        self.assertTrue(self._call_function(test_data), BASE_IMAGE_URL+test_data)
\ No newline at end of file
+        self.assertTrue(self._call_function(test_data), BASE_IMAGE_URL+test_data)
+
+class GetFirstUnusedValueTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        MembershipFactory(name='used')
+
+    def test_first_unused_value(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(get_first_unused_value(Membership.objects.all(), 'name', ['used', 'unused1', 'unused2']), 'unused1')
+
+    def test_all_values_used(self):
+        self.assertIsNone(get_first_unused_value(Membership.objects.all(), 'name', ['used']))
@@ -1,12 +1,16 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from rest_framework.exceptions import ValidationError
 from rest_framework.serializers import Serializer, CharField, IntegerField
 from rest_framework.test import APITestCase
 
 from .test_cases import FunctionTestCase
 from .factories import TemporaryImageFactory
-from ..models import TemporaryImage
-from ..validators import validate_all_required_fields_included, validate_image_url
-from ..utils import BASE_IMAGE_URL
+from ..models import TemporaryImage, ImageHash
+from ..validators import (
+    validate_all_required_fields_included, validate_image_file_name, get_maximum_file_size_message, claim_image_urls,
+)
 
 
 class ValidateRequireDataInPartialUpdateTestCase(FunctionTestCase):
@@ -28,21 +32,66 @@ class ValidateRequireDataInPartialUpdateTestCase(FunctionTestCase):
         )
 
 
-class ValidateURLTestCase(APITestCase):
+class ValidateImageFileNameTestCase(FunctionTestCase):
+    _function = validate_image_file_name
+
+    def test_success(self):
+        self.assertIsNone(self._call_function('image.JPG'))
+
+    def test_raise_validation_error(self):
+        self.assertRaisesRegex(ValidationError, r'document.pdf is not an image file name.', self._call_function, 'document.pdf')
+
+
+class GetMaximumFileSizeMessageTestCase(FunctionTestCase):
+    _function = get_maximum_file_size_message
+
+    def test_default_size(self):
+        self.assertEqual(self._call_function(), 'The maximum file size that can be uploaded is 10MB')
+
+    def test_size_in_largest_whole_unit(self):
+        self.assertEqual(self._call_function(4096), 'The maximum file size that can be uploaded is 4KB')
+        self.assertEqual(self._call_function(1500), 'The maximum file size that can be uploaded is 1500B')
+
+
+class ClaimImageUrlsTestCase(APITestCase):
     def setUp(self):
-        self.__temporary_image = TemporaryImageFactory()
+        self.__image_urls = [temporary_image.image_url for temporary_image in TemporaryImageFactory.create_batch(3)]
 
-    def test_raise_not_found(self):
-        self.assertRaisesMessage(
-            ValidationError,
-            'Not found.',
-            validate_image_url,
-            image_url=BASE_IMAGE_URL
-        )
+    def test_claim_in_two_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            self.assertListEqual(claim_image_urls(self.__image_urls), self.__image_urls)
+
+        self.assertEqual(len([query for query in context.captured_queries if 'SAVEPOINT' not in query['sql']]), 2)
+        self.assertFalse(TemporaryImage.objects.exists())
+
+    def test_claim_shared_image_url(self):
+        TemporaryImage.objects.filter(image_url=self.__image_urls[0]).update(reference_count=2)
+        ImageHash.objects.create(upload_path_prefix='product/', content_hash='hash', image_url=self.__image_urls[0])
+        claim_image_urls(self.__image_urls)
+
+        self.assertListEqual(list(TemporaryImage.objects.values_list('image_url', 'reference_count')), [(self.__image_urls[0], 1)])
+        self.assertEqual(ImageHash.objects.get().reference_count, 1)
+
+        claim_image_urls(self.__image_urls[:1])
+
+        self.assertFalse(TemporaryImage.objects.exists())
+        self.assertEqual(ImageHash.objects.get().reference_count, 2)
 
-    def test_validation_success(self):
-        self.assertEqual(
-            validate_image_url(self.__temporary_image.image_url),
-            self.__temporary_image.image_url
+    def test_claim_nothing(self):
+        with self.assertNumQueries(0):
+            self.assertListEqual(claim_image_urls([]), [])
+
+    def test_raise_validation_error_with_missing_image_urls(self):
+        image_urls = self.__image_urls + ['product/missing.jpg']
+
+        with self.assertRaises(ValidationError) as context:
+            claim_image_urls(image_urls)
+
+        self.assertListEqual([str(detail) for detail in context.exception.detail], ['product/missing.jpg is not found.'])
+        self.assertEqual(TemporaryImage.objects.count(), len(self.__image_urls))
+
+    def test_raise_validation_error_duplicated_image_urls(self):
+        self.assertRaisesMessage(
+            ValidationError, 'image_url is duplicated.', claim_image_urls, self.__image_urls + self.__image_urls[:1]
         )
-        self.assertTrue(not TemporaryImage.objects.filter(image_url=self.__temporary_image.image_url).exists())
+        self.assertEqual(TemporaryImage.objects.count(), len(self.__image_urls))
@@ -0,0 +1,65 @@
+import hashlib
+
+from django.http import QueryDict
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+from django.utils.datastructures import MultiValueDict
+
+from .validators import MAXIMUM_FILE_SIZE, get_maximum_file_size_message
+
+
+MAXIMUM_NUMBER_OF_FILES = 20
+# Matches client_max_body_size in nginx/nginx.conf, so a body is rejected by the same limit behind or without nginx.
+MAXIMUM_REQUEST_BODY_SIZE = 167772160
+
+
+class ImageUploadHandler(FileUploadHandler):
+    """
+    Enforce image upload limits while the multipart body is streamed, before the following handlers buffer or spool
+    the files. Parsing stops at the first violation, which is kept in error for the view to raise.
+
+    The SHA-256 of each file is computed from the same chunks and kept in content_hashes by field name, in the order
+    of the parsed files, so that uploads are deduplicated without reading the files again.
+    """
+    maximum_file_size = MAXIMUM_FILE_SIZE
+    maximum_number_of_files = MAXIMUM_NUMBER_OF_FILES
+    maximum_request_body_size = MAXIMUM_REQUEST_BODY_SIZE
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.error = None
+        self.file_count = 0
+        self.content_hashes = {}
+        self.__hasher = None
+
+    def __stop(self, error):
+        self.error = error
+        raise StopUpload(connection_reset=True)
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        if content_length > self.maximum_request_body_size:
+            self.error = 'The request body is too large.'
+            return QueryDict(encoding=encoding), MultiValueDict()
+
+    def new_file(self, field_name, file_name, content_type, content_length=None, charset=None, content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        self.file_count += 1
+
+        if self.file_count > self.maximum_number_of_files:
+            self.__stop('The maximum number of files that can be uploaded is {}.'.format(self.maximum_number_of_files))
+        elif not content_type or not content_type.startswith('image/'):
+            self.__stop('{} is not an image file.'.format(file_name))
+
+        self.__hasher = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > self.maximum_file_size:
+            self.__stop(get_maximum_file_size_message(self.maximum_file_size))
+
+        self.__hasher.update(raw_data)
+
+        return raw_data
+
+    def file_complete(self, file_size):
+        self.content_hashes.setdefault(self.field_name, []).append(self.__hasher.hexdigest())
+
+        return None
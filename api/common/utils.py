@@ -6,6 +6,8 @@ from django.http import JsonResponse
 from rest_framework.response import Response
 from rest_framework.exceptions import APIException
 
+from .exceptions import InvalidQueryParameterError
+
 
 DEFAULT_IMAGE_URL = 'https://deepy.s3.ap-northeast-2.amazonaws.com/media/product/default.png'
 BASE_IMAGE_URL= 'https://deepy.s3.ap-northeast-2.amazonaws.com/media/'
@@ -48,6 +50,15 @@ def get_response(type='drf', status=200, **kwargs):
     return response_class(get_response_body(code=status, **kwargs), status=status)
 
 
+def get_paginated_data(paginator, data):
+    return {
+        'count': paginator.page.paginator.count,
+        'next': paginator.get_next_link(),
+        'previous': paginator.get_previous_link(),
+        'results': data,
+    }
+
+
 def querydict_to_dict(querydict):
     data = {}
     for key in querydict.keys():
@@ -112,4 +123,37 @@ def check_integer_format(value):
 
 
 def get_full_image_url(image_url):
-    return BASE_IMAGE_URL + image_url
\ No newline at end of file
+    return BASE_IMAGE_URL + image_url
+
+
+def get_first_unused_value(queryset, field, candidates):
+    used_values = set(value.casefold() for value in queryset.filter(**{field + '__in': candidates}).values_list(field, flat=True))
+
+    return next((candidate for candidate in candidates if candidate.casefold() not in used_values), None)
+
+
+def get_sparse_fields(query_params, available_fields):
+    if 'fields' not in query_params:
+        return None
+
+    fields = []
+    for value in query_params.getlist('fields'):
+        for field in value.split(','):
+            field = field.strip()
+            if field and field not in fields:
+                fields.append(field)
+
+    if not fields:
+        raise InvalidQueryParameterError('Query parameter fields must not be empty.')
+
+    invalid_fields = [field for field in fields if field not in available_fields]
+    if invalid_fields:
+        raise InvalidQueryParameterError('Query parameter fields contains unavailable fields: {}.'.format(', '.join(invalid_fields)))
+
+    return fields
+
+
+def get_concrete_field_names(model, fields):
+    concrete_field_names = set(field.name for field in model._meta.concrete_fields)
+
+    return [field for field in fields if field in concrete_field_names]
@@ -1,12 +1,39 @@
+import os
+import mimetypes
+
+from django.core.validators import get_available_image_extensions
+
+from django.db import transaction
+from django.db.models import F
+
 from rest_framework.validators import ValidationError
 
-from common.models import TemporaryImage
-from common.utils import BASE_IMAGE_URL
+from common.models import TemporaryImage, ImageHash
+
+
+MAXIMUM_FILE_SIZE = 10485760
+FILE_SIZE_UNITS = ('B', 'KB', 'MB')
+
+
+def get_maximum_file_size_message(maximum_file_size=MAXIMUM_FILE_SIZE):
+    unit_index = 0
+    while maximum_file_size and maximum_file_size % 1024 == 0 and unit_index < len(FILE_SIZE_UNITS) - 1:
+        maximum_file_size //= 1024
+        unit_index += 1
+
+    return 'The maximum file size that can be uploaded is {}{}'.format(maximum_file_size, FILE_SIZE_UNITS[unit_index])
 
 
 def validate_file_size(value):
-    if value.size > 10485760:
-        raise ValidationError("The maximum file size that can be uploaded is 10MB")
+    if value.size > MAXIMUM_FILE_SIZE:
+        raise ValidationError(get_maximum_file_size_message())
+
+
+def validate_image_file_name(value):
+    content_type = mimetypes.guess_type(value)[0]
+    if content_type is None or not content_type.startswith('image/') \
+        or os.path.splitext(value)[1][1:].lower() not in get_available_image_extensions():
+        raise ValidationError('{} is not an image file name.'.format(value))
 
 
 def validate_all_required_fields_included(attrs, fields):
@@ -15,11 +42,23 @@ def validate_all_required_fields_included(attrs, fields):
             raise ValidationError('{0} field is required.'.format(key))
 
 
-def validate_image_url(image_url):
-    queryset = TemporaryImage.objects.filter(image_url=image_url)
-    if not queryset.exists():
-        raise ValidationError(detail='Not found.')
-    else:
-        queryset.delete()
+def claim_image_urls(image_urls):
+    if len(image_urls) != len(set(image_urls)):
+        raise ValidationError('image_url is duplicated.')
+    elif not image_urls:
+        return image_urls
+
+    try:
+        with transaction.atomic():
+            claimed_count = TemporaryImage.objects.filter(image_url__in=image_urls, reference_count=1).delete()[0]
+            if claimed_count != len(image_urls):
+                claimed_count += TemporaryImage.objects.filter(image_url__in=image_urls).update(reference_count=F('reference_count') - 1)
+                if claimed_count != len(image_urls):
+                    raise TemporaryImage.DoesNotExist()
+
+            ImageHash.objects.filter(image_url__in=image_urls).update(reference_count=F('reference_count') + 1)
+    except TemporaryImage.DoesNotExist:
+        existing_image_urls = set(TemporaryImage.objects.filter(image_url__in=image_urls).values_list('image_url', flat=True))
+        raise ValidationError(['{} is not found.'.format(image_url) for image_url in image_urls if image_url not in existing_image_urls])
 
-    return image_url
+    return image_urls
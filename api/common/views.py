@@ -1,9 +1,11 @@
 from rest_framework.views import exception_handler
+from rest_framework.exceptions import ValidationError
 from rest_framework.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND, HTTP_500_INTERNAL_SERVER_ERROR
 
 from .utils import get_response, get_response_body
-from .serializers import ImageSerializer
-from .storage import upload_images
+from .serializers import ImageSerializer, PresignedPostSerializer, PresignedUploadCompletionSerializer
+from .storage import upload_images, get_presigned_posts, complete_presigned_uploads
+from .upload_handlers import ImageUploadHandler
 
 
 def custom_exception_handler(exc, context):
@@ -32,9 +34,29 @@ def custom_500_view(request):
 
 
 def upload_image_view(request, type, *args):
+    upload_handler = ImageUploadHandler(request)
+    request.upload_handlers.insert(0, upload_handler)
     images = request.FILES.getlist('image')
+    if upload_handler.error is not None:
+        raise ValidationError(upload_handler.error)
 
     serializer = ImageSerializer(data=[{'image': image} for image in images], many=True)
     serializer.is_valid(raise_exception=True)
 
-    return get_response(status=HTTP_201_CREATED, data={'image': upload_images(type, images, *args)})
+    image_urls = upload_images(type, images, *args, content_hashes=upload_handler.content_hashes.get('image'))
+
+    return get_response(status=HTTP_201_CREATED, data={'image': image_urls})
+
+
+def presigned_post_view(request, type, *args):
+    serializer = PresignedPostSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+
+    return get_response(status=HTTP_201_CREATED, data=get_presigned_posts(type, serializer.validated_data['names'], *args))
+
+
+def presigned_upload_completion_view(request, type, *args):
+    serializer = PresignedUploadCompletionSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+
+    return get_response(status=HTTP_201_CREATED, data={'image': complete_presigned_uploads(type, serializer.validated_data['image_url'], *args)})
@@ -0,0 +1,13 @@
+"""
+Production settings: persistent, health-checked database connections on top of the base settings.
+"""
+
+import os
+
+from .settings import *  # noqa: F401, F403
+from .settings import DATABASES
+
+
+for database in DATABASES.values():
+    database['CONN_MAX_AGE'] = int(os.environ.get('DB_CONN_MAX_AGE', 60))
+    database['CONN_HEALTH_CHECKS'] = True
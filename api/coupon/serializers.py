@@ -5,11 +5,13 @@ from rest_framework.serializers import (
 )
 from rest_framework.exceptions import ValidationError
 
+from common.serializers import DynamicFieldsModelSerializer
 from product.models import Product, SubCategory
 from .models import CouponClassification, Coupon
 
 COUPON_PRODUCT_MAX_LENGTH = 1000
 COUPON_SUBCATEGORY_MAX_LENGTH = 20
+COUPON_EXTRA_FIELDS = ('coupon_owned',)
 
 
 class CouponClassificationSerializer(ModelSerializer):
@@ -18,7 +20,7 @@ class CouponClassificationSerializer(ModelSerializer):
         fields = '__all__'
 
 
-class CouponSerializer(ModelSerializer):
+class CouponSerializer(DynamicFieldsModelSerializer):
     products = PrimaryKeyRelatedField(write_only=True, queryset=Product.objects.filter(on_sale=True), many=True, required=False)
     sub_categories = PrimaryKeyRelatedField(write_only=True, queryset=SubCategory.objects.all(), many=True, required=False)
     class Meta:
@@ -35,10 +37,8 @@ class CouponSerializer(ModelSerializer):
     def to_representation(self, instance):
         result = super().to_representation(instance)
 
-        if result['id'] in self.context.get('owned_coupon_id_list', []):
-            result['coupon_owned'] = True
-        else:
-            result['coupon_owned'] = False
+        if 'coupon_owned' in self.context.get('extra_fields', COUPON_EXTRA_FIELDS):
+            result['coupon_owned'] = instance.id in self.context.get('owned_coupon_id_list', [])
 
         return result
 
@@ -73,6 +73,23 @@ class CouponViewSetTestCase(ViewTestCase):
         self._assert_success()
         self.assertListEqual(self._response_data['results'], serializer.data)
 
+    def test_list_sparse_fields(self):
+        self._set_shopper()
+        self._set_authentication()
+        coupon = Coupon.objects.filter(is_auto_issue=False, end_date__isnull=True).first()
+        ShopperCouponFactory(shopper=self._user, coupon=coupon)
+
+        self._get({'fields': 'name,coupon_owned'})
+
+        self._assert_success()
+        self.assertIn({'name': coupon.name, 'coupon_owned': True}, self._response_data['results'])
+        self.assertTrue(all(list(result.keys()) == ['name', 'coupon_owned'] for result in self._response_data['results']))
+
+    def test_failure_unavailable_sparse_fields(self):
+        self._get({'fields': 'products'})
+
+        self._assert_failure(400, 'Query parameter fields contains unavailable fields: products.')
+
     def test_list_anonymous_user(self):
         queryset = Coupon.objects.filter(Q(end_date__gte=date.today()) | Q(end_date__isnull=True), is_auto_issue=False)
         serializer = CouponSerializer(queryset, many=True, context={})
@@ -9,11 +9,11 @@ from rest_framework.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST
 from rest_framework.decorators import api_view, permission_classes
 
 from common.permissions import IsAdminUser
-from common.utils import get_response, check_integer_format
+from common.utils import get_response, get_paginated_data, check_integer_format, get_sparse_fields, get_concrete_field_names
 from user.models import is_shopper
 from product.models import Product
 from .models import CouponClassification, Coupon
-from .serializers import CouponClassificationSerializer, CouponSerializer
+from .serializers import COUPON_EXTRA_FIELDS, CouponClassificationSerializer, CouponSerializer
 from .permissions import CouponPermission
 
 
@@ -29,6 +29,7 @@ def get_coupon_classifications(request):
 class CouponViewSet(GenericViewSet):
     permission_classes = [CouponPermission | IsAdminUser]
     serializer_class = CouponSerializer
+    read_replica_actions = ('list',)
     lookup_field = 'id'
     lookup_url_kwarg = 'coupon_id'
     lookup_value_regex = r'[0-9]+'
@@ -54,19 +55,25 @@ class CouponViewSet(GenericViewSet):
         if product_id is not None and not check_integer_format(product_id):
             return get_response(status=HTTP_400_BAD_REQUEST, message='Query parameter product must be id format.')
 
+        readable_fields = [field_name for field_name, field in CouponSerializer().fields.items() if not field.write_only]
+        fields = get_sparse_fields(request.query_params, readable_fields + list(COUPON_EXTRA_FIELDS))
         queryset = self.get_queryset()
-
+        allow_fields = '__all__'
         context = {}
-        if is_shopper(request.user):
+
+        if fields is not None:
+            allow_fields = [field for field in fields if field in readable_fields]
+            context['extra_fields'] = [field for field in fields if field in COUPON_EXTRA_FIELDS]
+            queryset = queryset.only('id', *get_concrete_field_names(Coupon, allow_fields))
+
+        if is_shopper(request.user) and 'coupon_owned' in context.get('extra_fields', COUPON_EXTRA_FIELDS):
             owned_coupon_id_list = list(request.user.shopper.coupons.all().values_list('id', flat=True))
             context['owned_coupon_id_list']= owned_coupon_id_list
 
         page = self.paginate_queryset(queryset)
-        serializer = self.get_serializer(page, many=True, context=context)
-
-        paginated_response = self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(page, many=True, context=context, allow_fields=allow_fields)
 
-        return get_response(data=paginated_response.data)
+        return get_response(data=get_paginated_data(self.paginator, serializer.data))
 
     def create(self, requset):
         serializer = self.get_serializer(data=requset.data)
@@ -1,6 +1,45 @@
+import os
+import sys
 import multiprocessing
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+from django.conf import settings
+
+from common.pooling import get_worker_policy, get_pool_configuration, check_pool_configuration
+
+
 wsgi_app = 'config.wsgi:application'
 
 bind = '0.0.0.0:8000'
-# workers = multiprocessing.cpu_count() * 2 + 1
\ No newline at end of file
+workers, threads = get_worker_policy(
+    multiprocessing.cpu_count(), len(settings.DATABASES), settings.DB_MAX_CONNECTIONS,
+    workers=int(os.environ['GUNICORN_WORKERS']) if 'GUNICORN_WORKERS' in os.environ else None,
+    threads=int(os.environ['GUNICORN_THREADS']) if 'GUNICORN_THREADS' in os.environ else None,
+    query_threads=settings.DB_QUERY_MAX_WORKERS,
+)
+# DRF views are synchronous and ASGI would run them on a single thread per worker, so requests waiting on storage or
+# the database overlap on gthread threads instead.
+worker_class = 'gthread' if threads > 1 else 'sync'
+
+
+def when_ready(server):
+    configuration = get_pool_configuration(workers, threads)
+    server.log.info('Serving with {} {} workers and {} threads each, and {} query pool threads.'.format(
+        workers, worker_class, threads, configuration['query_threads']
+    ))
+    for alias, pool in configuration['aliases'].items():
+        server.log.info('Database {}: CONN_MAX_AGE={}, CONN_HEALTH_CHECKS={}.'.format(alias, pool['conn_max_age'], pool['health_checks']))
+    server.log.info('Up to {} database connections within the budget of {}.'.format(
+        configuration['max_connections'], configuration['connection_budget']
+    ))
+
+    for warning in check_pool_configuration(configuration):
+        server.log.warning(warning)
+
+
+def post_worker_init(worker):
+    from user.uniqueness import start_unique_value_filters
+
+    start_unique_value_filters()
@@ -3,7 +3,7 @@ from rest_framework.serializers import Serializer, IntegerField, ListField, Imag
 from rest_framework.decorators import action
 
 from common.permissions import IsEasyAdminUser
-from common.documentations import get_response, get_ids_response, get_paginated_response
+from common.documentations import ImageVariants, get_response, get_ids_response, get_paginated_response
 from product.serializers import OptionInOrderItemSerializer
 from .serializers import (
     OrderSerializer, OrderWriteSerializer, OrderItemSerializer, OrderItemStatisticsSerializer,
@@ -20,6 +20,7 @@ class OrderQuerySerializer(Serializer):
 
 class OptionInOrderItemResponse(OptionInOrderItemSerializer):
     product_image_url = ImageField()
+    product_image_variants = ImageVariants(allow_null=True)
 
     class Meta:
         ref_name = 'OptionInOrderItem'
@@ -6,9 +6,10 @@ from django.db.models import (
     IntegerField, BigIntegerField, CharField, BooleanField, DateTimeField,
     DO_NOTHING
 )
+from django.db import transaction, IntegrityError
 from django.utils import timezone
 
-from common.utils import DEFAULT_DATETIME_FORMAT
+from common.utils import DEFAULT_DATETIME_FORMAT, get_first_unused_value
 
 
 DEPOSIT_WAITING_STATUS = 100
@@ -22,6 +23,8 @@ NORMAL_STATUS = [
     DEPOSIT_WAITING_STATUS, PAYMENT_COMPLETION_STATUS, DELIVERY_PREPARING_STATUS, 
     DELIVERY_PROGRESSING_STATUS, DELIVERY_COMPLETION_STATUS, PURCHASE_CONFIRMATION_STATUS
 ]
+DEFAULT_NUMBER_CANDIDATE_SIZE = 10
+DEFAULT_NUMBER_SAVE_ATTEMPTS = 3
 
 class Order(Model):
     id = BigAutoField(primary_key=True)
@@ -34,19 +37,28 @@ class Order(Model):
         db_table = 'order'
         ordering = ['-id']
 
-    def __set_default_number(self):
+    def __get_default_number_candidates(self):
         prefix = self.created_at.strftime(DEFAULT_DATETIME_FORMAT)
-        while True:
-            postfix = ''.join(random.choices(string.digits, k=5))
-            if not self.__class__.objects.filter(number=prefix+postfix).exists():
-                self.number = prefix + postfix
-                break
+
+        return [prefix + ''.join(random.choices(string.digits, k=5)) for _ in range(DEFAULT_NUMBER_CANDIDATE_SIZE)]
+
+    def __set_default_number(self):
+        self.number = None
+        while self.number is None:
+            self.number = get_first_unused_value(self.__class__.objects.all(), 'number', self.__get_default_number_candidates())
 
     def save(self, *args, **kwargs):
-        if kwargs.get('force_insert', False):
-            self.__set_default_number()
+        if not kwargs.get('force_insert', False):
+            return super().save(*args, **kwargs)
 
-        return super().save(*args, **kwargs)
+        for attempt in range(DEFAULT_NUMBER_SAVE_ATTEMPTS):
+            self.__set_default_number()
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                if attempt == DEFAULT_NUMBER_SAVE_ATTEMPTS - 1 or not self.__class__.objects.filter(number=self.number).exists():
+                    raise
 
 
 class OrderItem(Model):
@@ -0,0 +1,53 @@
+from random import randint
+
+from .serializers import OrderItemWriteSerializer
+
+
+def get_shipping_address_payload(shipping_address):
+    return {
+        'receiver_name': shipping_address.receiver_name,
+        'mobile_number': shipping_address.mobile_number,
+        'phone_number': shipping_address.phone_number,
+        'zip_code': shipping_address.zip_code,
+        'base_address': shipping_address.base_address,
+        'detail_address': shipping_address.detail_address,
+        'shipping_message': shipping_address.shipping_message,
+    }
+
+
+def get_order_item_payload(option, shopper, shopper_coupon=None):
+    product = option.product_color.product
+    count = randint(1, 5)
+
+    payload = {
+        'count': count,
+        'sale_price': product.sale_price * count,
+        'base_discounted_price': product.base_discounted_price * count,
+        'membership_discount_price': product.base_discounted_price * shopper.membership.discount_rate // 100 * count,
+        'option': option.id,
+    }
+    payload['payment_price'] = payload['base_discounted_price'] - payload['membership_discount_price']
+
+    if shopper_coupon is not None:
+        payload['shopper_coupon'] = shopper_coupon.id
+        payload['coupon_discount_price'] = OrderItemWriteSerializer()._OrderItemWriteSerializer__get_actual_coupon_discount_price(
+            shopper_coupon.coupon, product, payload['payment_price'] // count
+        )
+        payload['payment_price'] -= payload['coupon_discount_price']
+
+    return payload
+
+
+def get_order_payload(shipping_address, options, shopper, shopper_coupons=None):
+    if shopper_coupons is None:
+        shopper_coupons = [None] * len(options)
+
+    payload = {
+        'shipping_address': get_shipping_address_payload(shipping_address),
+        'items': [get_order_item_payload(option, shopper, shopper_coupon) for option, shopper_coupon in zip(options, shopper_coupons)],
+        'used_point': shopper.point // 2,
+    }
+    payload['actual_payment_price'] = sum([item['payment_price'] for item in payload['items']]) - payload['used_point']
+    payload['earned_point'] = payload['actual_payment_price'] // 100
+
+    return payload
@@ -12,7 +12,7 @@ from rest_framework.serializers import (
 from rest_framework.exceptions import ValidationError
 
 from common.serializers import (
-    has_duplicate_element, get_list_of_single_value, get_sum_of_single_value, add_data_in_each_element,
+    DynamicFieldsModelSerializer, has_duplicate_element, get_list_of_single_value, get_sum_of_single_value, add_data_in_each_element,
     get_list_of_multi_values,
 )
 from common.exceptions import NotExcutableValidationError
@@ -214,7 +214,7 @@ class OrderItemWriteSerializer(OrderItemSerializer):
         return instance
 
 
-class OrderSerializer(ModelSerializer):
+class OrderSerializer(DynamicFieldsModelSerializer):
     shipping_address = ShippingAddressSerializer()
     items = OrderItemSerializer(many=True)
 
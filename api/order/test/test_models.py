@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from django.forms import model_to_dict
 from django.utils import timezone
 
@@ -44,6 +46,15 @@ class OrderTestCase(ModelTestCase):
         self.assertTrue(self._order.number != new_order.number)
         self.assertTrue(new_order.number.startswith(new_order.created_at.strftime(DEFAULT_DATETIME_FORMAT)))
 
+    def test_retry_default_number_on_conflict(self):
+        retried_number = self._order.created_at.strftime(DEFAULT_DATETIME_FORMAT) + '00000'
+
+        with patch('order.models.get_first_unused_value', side_effect=[self._order.number, retried_number]) as mock:
+            order = self._get_model_after_creation()
+
+        self.assertEqual(mock.call_count, 2)
+        self.assertEqual(order.number, retried_number)
+
 
 class OrderItemTestCase(ModelTestCase):
     _model_class = OrderItem
@@ -1,5 +1,4 @@
 from unittest.mock import patch
-from random import randint
 from copy import deepcopy
 from dateutil.relativedelta import relativedelta
 
@@ -25,6 +24,7 @@ from .factories import (
     create_orders_with_items, ShippingAddressFactory, OrderFactory, OrderItemFactory, 
     StatusFactory, StatusHistoryFactory, DeliveryFactory,
 )
+from ..payloads import get_shipping_address_payload, get_order_item_payload, get_order_payload
 from ..models import (
     PAYMENT_COMPLETION_STATUS, DELIVERY_PREPARING_STATUS, DELIVERY_PROGRESSING_STATUS, NORMAL_STATUS,
     Order, OrderItem, ShippingAddress, StatusHistory, Delivery
@@ -47,56 +47,6 @@ def get_order_queryset(queryset=Order.objects, item_queryset=get_order_item_quer
         prefetch_related(Prefetch('items', item_queryset))
 
 
-def get_shipping_address_test_data(shipping_address):
-    return {
-        'receiver_name': shipping_address.receiver_name,
-        'mobile_number': shipping_address.mobile_number,
-        'phone_number': shipping_address.phone_number,
-        'zip_code': shipping_address.zip_code,
-        'base_address': shipping_address.base_address,
-        'detail_address': shipping_address.detail_address,
-        'shipping_message': shipping_address.shipping_message,
-    }
-
-
-def get_order_item_test_data(option, shopper, shopper_coupon=None):
-    product = option.product_color.product
-    count = randint(1, 5)
-
-    test_data = {
-        'count': count,
-        'sale_price': product.sale_price * count,
-        'base_discounted_price': product.base_discounted_price * count,
-        'membership_discount_price': product.base_discounted_price * shopper.membership.discount_rate // 100 * count,
-        'option': option.id,
-    }
-    test_data['payment_price'] = test_data['base_discounted_price'] - test_data['membership_discount_price']
-
-    if shopper_coupon is not None:
-        test_data['shopper_coupon'] = shopper_coupon.id
-        test_data['coupon_discount_price'] = OrderItemWriteSerializer()._OrderItemWriteSerializer__get_actual_coupon_discount_price(
-            shopper_coupon.coupon, product, test_data['payment_price'] // count
-        )
-        test_data['payment_price'] -= test_data['coupon_discount_price']
-
-    return test_data
-
-
-def get_order_test_data(shipping_address, options, shopper, shopper_coupons=None):
-    if shopper_coupons is None:
-        shopper_coupons = [None] * len(options)
-
-    test_data = {
-        'shipping_address': get_shipping_address_test_data(shipping_address),
-        'items': [get_order_item_test_data(option, shopper, shopper_coupon) for option, shopper_coupon in zip(options, shopper_coupons)],
-        'used_point': shopper.point // 2,
-    }
-    test_data['actual_payment_price'] = sum([item['payment_price'] for item in test_data['items']]) - test_data['used_point']
-    test_data['earned_point'] = test_data['actual_payment_price'] // 100
-
-    return test_data
-
-
 def get_delivery_test_data(order, delivery=None):
     if isinstance(order, int):
         order_id = order
@@ -162,7 +112,7 @@ class ShippingAddressSerializerTestCase(SerializerTestCase):
         )[0]
 
     def setUp(self):
-        self._test_data = get_shipping_address_test_data(self.__shipping_address)
+        self._test_data = get_shipping_address_payload(self.__shipping_address)
 
     def __get_context(self, order=True):
         if order:
@@ -241,7 +191,7 @@ class OrderItemListSerializerTestCase(ListSerializerTestCase):
             is_used=False, 
             coupon__classification__id=ALL_PRODUCT_COUPON_CLASSIFICATIONS[0],
         )
-        cls._test_data = [get_order_item_test_data(option, cls.__shopper, coupon) \
+        cls._test_data = [get_order_item_payload(option, cls.__shopper, coupon) \
             for option, coupon in zip(cls.__options, [cls.__coupon] + [None] * (len(cls.__options) - 1))]
 
     def _get_serializer(self, *args, **kwargs):
@@ -258,12 +208,12 @@ class OrderItemListSerializerTestCase(ListSerializerTestCase):
         self.assertEqual(StatusHistory.objects.filter(conditions).count(), len(order_items))
 
     def test_validate_options(self):
-        self._test_data.append(get_order_item_test_data(self.__options[0], self.__shopper))
+        self._test_data.append(get_order_item_payload(self.__options[0], self.__shopper))
 
         self._test_serializer_raise_validation_error('option is duplicated.')        
 
     def test_validate_shopper_coupons(self):
-        self._test_data = [get_order_item_test_data(option, self.__shopper, self.__coupon) for option in self.__options]
+        self._test_data = [get_order_item_payload(option, self.__shopper, self.__coupon) for option in self.__options]
 
         self._test_serializer_raise_validation_error('shopper_coupon is duplicated.')
 
@@ -330,7 +280,7 @@ class OrderItemWriteSerializerTestCase(SerializerTestCase):
             shopper_coupon = None,
         )
 
-        cls._test_data = get_order_item_test_data(cls.__option, cls.__shopper, cls.__coupon)
+        cls._test_data = get_order_item_payload(cls.__option, cls.__shopper, cls.__coupon)
 
     def _get_serializer(self, *args, **kwargs):
         return super()._get_serializer(context={'shopper': self.__shopper}, *args, **kwargs)
@@ -458,7 +408,7 @@ class OrderItemWriteSerializerTestCase(SerializerTestCase):
         self._test_validated_data(expected_data)
 
     def test_validation_success_with_no_coupon(self):
-        self._test_data = get_order_item_test_data(self.__option, self.__shopper)
+        self._test_data = get_order_item_payload(self.__option, self.__shopper)
 
         self.assertTrue(self._get_serializer_after_validation())
 
@@ -468,7 +418,7 @@ class OrderItemWriteSerializerTestCase(SerializerTestCase):
             is_used=False,
             coupon=CouponFactory(classification=self.__coupon.coupon.classification, discount_price=True)
         )
-        self._test_data = get_order_item_test_data(self.__option, self.__shopper, price_coupon)
+        self._test_data = get_order_item_payload(self.__option, self.__shopper, price_coupon)
 
         self.assertTrue(self._get_serializer_after_validation())
 
@@ -540,7 +490,7 @@ class OrderWriteSerializerTestCase(SerializerTestCase):
             coupon__classification__id=ALL_PRODUCT_COUPON_CLASSIFICATIONS[0],
         )
         cls.__status = StatusFactory()
-        cls._test_data = get_order_test_data(
+        cls._test_data = get_order_payload(
             cls.__shipping_address, 
             cls.__options, 
             cls.__shopper, 
@@ -12,10 +12,10 @@ from coupon.models import ALL_PRODUCT_COUPON_CLASSIFICATIONS
 from coupon.test.factories import CouponClassificationFactory
 from .factories import StatusHistoryFactory, create_orders_with_items, OrderItemFactory, ShippingAddressFactory, StatusFactory
 from .test_serializers import (
-    get_order_item_queryset, get_order_queryset, get_shipping_address_test_data, get_order_test_data, 
-    get_order_confirm_result, get_delivery_test_data, get_delivery_result,
+    get_order_item_queryset, get_order_queryset, get_order_confirm_result, get_delivery_test_data, get_delivery_result,
 )
 from ..paginations import OrderPagination
+from ..payloads import get_shipping_address_payload, get_order_payload
 from ..models import (
     PAYMENT_COMPLETION_STATUS, DELIVERY_PREPARING_STATUS, DELIVERY_PROGRESSING_STATUS, NORMAL_STATUS, 
     Order, OrderItem, Status,
@@ -82,6 +82,17 @@ class OrderViewSetTestCase(ViewTestCase):
     def test_list(self):
         self.__test_pagination_list()
 
+    def test_list_sparse_fields(self):
+        with self.assertNumQueries(3):
+            self._get({'fields': 'number,id'})
+
+        self._assert_pagination_success(list(self.__get_queryset().values('number', 'id')))
+
+    def test_failure_unavailable_sparse_fields(self):
+        self._get({'fields': 'number,payment_price'})
+
+        self._assert_failure(400, 'Query parameter fields contains unavailable fields: payment_price.')
+
     def test_status_filter_list(self):
         order_item = OrderItem.objects.filter(order__shopper_id=self._user.id).only('status').first()
         order_item.status_id = DELIVERY_PREPARING_STATUS
@@ -106,7 +117,7 @@ class OrderViewSetTestCase(ViewTestCase):
             coupon__classification = self.__all_product_coupon_classification,
             coupon__discount_price = discount_price,
         ) for discount_price in [None, True]] + [None] * (len(options) - 2)
-        self._test_data = get_order_test_data(self.__shipping_address, options, self._user, shopper_coupons)
+        self._test_data = get_order_payload(self.__shipping_address, options, self._user, shopper_coupons)
         self._post(format='json')
 
         self._assert_success_and_serializer_class(OrderWriteSerializer)
@@ -122,7 +133,7 @@ class OrderViewSetTestCase(ViewTestCase):
     def test_update_shipping_address(self):
         self.__set_detail_url()
         self._url += '/shipping-address'
-        self._test_data = get_shipping_address_test_data(ShippingAddressFactory.build())
+        self._test_data = get_shipping_address_payload(ShippingAddressFactory.build())
         self._put()
 
         self._assert_success_and_serializer_class(ShippingAddressSerializer)
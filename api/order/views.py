@@ -7,7 +7,7 @@ from rest_framework.viewsets import GenericViewSet
 from rest_framework.decorators import action
 from rest_framework.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST
 
-from common.utils import get_response
+from common.utils import get_response, get_paginated_data, get_sparse_fields, get_concrete_field_names
 from common.permissions import IsEasyAdminUser
 from user.models import Shopper
 from product.models import ProductImage
@@ -28,6 +28,7 @@ class OrderViewSet(GenericViewSet):
     permission_classes = [OrderPermission]
     lookup_field = 'id'
     lookup_url_kwarg = 'order_id'
+    read_replica_actions = ('list', 'retrieve')
 
     def get_serializer_class(self):
         if self.action in ['create']:
@@ -58,23 +59,36 @@ class OrderViewSet(GenericViewSet):
 
         return order_queryset.filter(shopper_id=self.request.user.id), item_queryset
 
+    def __get_sparse_fields(self):
+        if self.action != 'list':
+            return None
+
+        return get_sparse_fields(self.request.query_params, OrderSerializer().fields)
+
     def get_queryset(self):
         queryset = Order.objects
 
         if self.action in ['list', 'retrieve']:
+            fields = self.__get_sparse_fields()
             images = ProductImage.objects.filter(sequence=1)
             item_queryset = OrderItem.objects.select_related('option__product_color__product', 'status'). \
                 prefetch_related(Prefetch('option__product_color__product__images', images))
 
             queryset, item_queryset = self.__apply_filters(queryset, item_queryset)
-            queryset = queryset.select_related('shipping_address').prefetch_related(Prefetch('items', item_queryset))
+            if fields is None or 'shipping_address' in fields:
+                queryset = queryset.select_related('shipping_address')
+            if fields is None or 'items' in fields:
+                queryset = queryset.prefetch_related(Prefetch('items', item_queryset))
+            if fields is not None:
+                queryset = queryset.only('id', *get_concrete_field_names(Order, fields))
 
         return queryset
 
     def list(self, request):
-        serializer = self.get_serializer(self.paginate_queryset(self.get_queryset()), many=True)
+        fields = self.__get_sparse_fields()
+        serializer = self.get_serializer(self.paginate_queryset(self.get_queryset()), many=True, allow_fields=fields or '__all__')
 
-        return get_response(data=self.get_paginated_response(serializer.data).data)
+        return get_response(data=get_paginated_data(self.paginator, serializer.data))
 
     @atomic
     def create(self, request):
@@ -6,8 +6,8 @@ from rest_framework.serializers import (
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg.openapi import Parameter, IN_QUERY, TYPE_STRING
 
-from common.documentations import Image, get_response
-from common.serializers import SettingGroupSerializer
+from common.documentations import Image, ImageVariants, PresignedPost, get_response
+from common.serializers import SettingGroupSerializer, PresignedPostSerializer, PresignedUploadCompletionSerializer
 from .serializers import (
     SubCategorySerializer, MainCategorySerializer, ColorSerializer,ProductAdditionalInformationSerializer,
     TagSerializer, ProductImageSerializer, ProductMaterialSerializer, OptionWriteSerializer, 
@@ -18,6 +18,7 @@ from .views import (
     ProductViewSet, ProductQuestionAnswerViewSet,
     get_all_categories, get_main_categories, get_sub_categories_by_main_category, get_colors, get_tag_search_result, 
     upload_product_image, get_related_search_words, get_product_registration_data, get_product_question_answer_classification,
+    issue_product_image_presigned_posts, complete_product_image_upload,
 )
 
 
@@ -44,6 +45,7 @@ class ProductListQuerySerializer(Serializer):
         required=False,
         help_text='price_asc: 가격 오름차순\nprice_desc: 가격 내림차순'
     )
+    fields = CharField(required=False, help_text='응답 필드 선택 - 쉼표로 구분, 요청한 순서대로 정렬됨')
 
 
 class ProductCreateRequest(ProductWriteSerializer):
@@ -108,6 +110,7 @@ class ProductListResponse(Serializer):
         base_discount_rate = IntegerField()
         base_discounted_price = IntegerField()
         main_image = URLField()
+        main_image_variants = ImageVariants(allow_null=True)
         shopper_like = BooleanField()
 
     count = IntegerField()
@@ -241,6 +244,14 @@ decorated_upload_product_image_view = swagger_auto_schema(
     method='POST', request_body=Image, **get_response(Image(), 201), operation_description='상품 이미지 업로드\n요청 시에는 파일 전체를 보내야 함\n응답 시에는 저장된 url을 반환'
 )(upload_product_image)
 
+decorated_issue_product_image_presigned_posts_view = swagger_auto_schema(
+    method='POST', request_body=PresignedPostSerializer, **get_response(PresignedPost(many=True), 201), operation_description='상품 이미지 직접 업로드용 presigned POST 발급\n응답의 url로 fields와 파일을 multipart/form-data로 전송\n업로드 후 image_url을 완료 API로 등록해야 함\n최대 10MB, 10분 동안 유효'
+)(issue_product_image_presigned_posts)
+
+decorated_complete_product_image_upload_view = swagger_auto_schema(
+    method='POST', request_body=PresignedUploadCompletionSerializer, **get_response(Image(), 201), operation_description='presigned POST로 업로드한 상품 이미지 등록\n응답 시에는 저장된 url을 반환'
+)(complete_product_image_upload)
+
 decorated_get_related_search_words_view = swagger_auto_schema(
     method='GET', query_serializer=SearchQuerySerializer, **get_response(SearchBoxResponse()), security=[], operation_description='검색어(문자열)와 유사한 메인 카테고리, 서브 카테고리, 키워드 데이터 GET\nquery 필수, 빈 문자열 허용하지 않음.'
 )(get_related_search_words)
@@ -0,0 +1,81 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from common.storage import MediaStorage, MediaVariantStorage
+from common.images import IMAGE_VARIANT_WIDTHS, get_image_variant_path, save_image_variants, mark_image_variants
+from product.models import ProductImage
+
+
+class Command(BaseCommand):
+    help = (
+        'Create thumbnail variants of existing product images in id-ordered chunks processed by a process pool, '
+        'and mark the images whose variants exist so that serializers emit them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=100, help='number of product images read per chunk')
+        parser.add_argument('--workers', type=int, default=settings.IMAGE_PROCESS_MAX_WORKERS, help='number of image processes')
+        parser.add_argument('--overwrite', action='store_true', help='recreate variants that already exist')
+
+    def __iterate_chunks(self, chunk_size, overwrite):
+        queryset = ProductImage.objects.all() if overwrite else ProductImage.objects.filter(has_variants=False)
+        last_id = 0
+        while True:
+            chunk = list(
+                queryset.filter(id__gt=last_id).order_by('id').values_list('id', 'image_url')[:chunk_size]
+            )
+            if not chunk:
+                return
+
+            yield list(dict.fromkeys(image_url for _, image_url in chunk))
+            last_id = chunk[-1][0]
+
+    def __has_variants(self, image_url):
+        return self.__variant_storage.exists(get_image_variant_path(image_url, max(IMAGE_VARIANT_WIDTHS)))
+
+    def __read(self, image_url):
+        try:
+            with self.__storage.open(image_url) as file:
+                return file.read()
+        except Exception:
+            return None
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('chunk-size must be greater than 0.')
+        elif options['workers'] < 1:
+            raise CommandError('workers must be greater than 0.')
+
+        self.__storage = MediaStorage()
+        self.__variant_storage = MediaVariantStorage()
+        processed_count = skipped_count = failed_count = 0
+        start_time = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=settings.IMAGE_UPLOAD_MAX_WORKERS) as io_executor, \
+            ProcessPoolExecutor(max_workers=options['workers']) as process_executor:
+            for image_urls in self.__iterate_chunks(options['chunk_size'], options['overwrite']):
+                if not options['overwrite']:
+                    has_variants = list(io_executor.map(self.__has_variants, image_urls))
+                    skipped_image_urls = [image_url for image_url, exists in zip(image_urls, has_variants) if exists]
+                    mark_image_variants(skipped_image_urls)
+                    skipped_count += len(skipped_image_urls)
+                    image_urls = [image_url for image_url, exists in zip(image_urls, has_variants) if not exists]
+
+                image_contents = {
+                    image_url: content for image_url, content in zip(image_urls, io_executor.map(self.__read, image_urls)) if content is not None
+                }
+                processed_image_urls = save_image_variants(self.__variant_storage, image_contents, process_executor)
+                mark_image_variants(processed_image_urls)
+                processed_count += len(processed_image_urls)
+                failed_count += len(image_urls) - len(processed_image_urls)
+
+                self.stdout.write('Processed {} images ({} processed, {} skipped, {} failed so far).'.format(
+                    len(image_urls), processed_count, skipped_count, failed_count
+                ))
+
+        self.stdout.write(self.style.SUCCESS('Created variants of {} images in {:.2f}s ({} skipped, {} failed).'.format(
+            processed_count, time.perf_counter() - start_time, skipped_count, failed_count
+        )))
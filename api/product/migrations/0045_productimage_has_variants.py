@@ -0,0 +1,18 @@
+# Generated by Django 4.0.2 on 2026-10-19 10:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0044_delete_size_alter_option_size'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productimage',
+            name='has_variants',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -98,6 +98,7 @@ class ProductImage(Model):
     product = ForeignKey('Product', DO_NOTHING, related_name='images')
     image_url = CharField(max_length=200)
     sequence = IntegerField()
+    has_variants = BooleanField(default=False)
 
     class Meta:
         db_table = 'product_image'
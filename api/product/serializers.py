@@ -8,9 +8,10 @@ from rest_framework.serializers import (
 from rest_framework.exceptions import ValidationError, APIException
 
 from common.utils import DEFAULT_IMAGE_URL, BASE_IMAGE_URL
+from common.images import get_image_variant_urls
 from common.regular_expressions import BASIC_SPECIAL_CHARACTER_REGEX, ENG_OR_KOR_REGEX, IMAGE_URL_REGEX
-from common.validators import validate_all_required_fields_included, validate_image_url
-from common.models import SettingItem
+from common.validators import validate_all_required_fields_included, claim_image_urls
+from common.models import SettingItem, TemporaryImage
 from common.serializers import (
     has_duplicate_element ,is_create_data, is_update_data, get_create_attrs, get_update_attrs,
     get_delete_attrs, get_create_or_update_attrs, get_update_or_delete_attrs, get_list_of_single_value,
@@ -25,6 +26,7 @@ from .models import (
 
 PRODUCT_IMAGE_MAX_LENGTH = 10
 PRODUCT_COLOR_MAX_LENGTH = 10
+PRODUCT_LIST_EXTRA_FIELDS = ('main_image', 'main_image_variants', 'shopper_like')
 
 
 class SubCategorySerializer(ModelSerializer):
@@ -126,15 +128,25 @@ class ProductImageListSerializer(ListSerializer):
     def __validate_create(self, attrs):
         self.__validate_image_number_in_create(attrs)
         self.__validate_sequence_in_create(attrs)
+        self.__set_has_variants(attrs)
 
         return attrs
 
     def __validate_update(self, attrs):
         self.__validate_image_number_in_update(attrs)
         self.__validate_sequence_in_update(attrs)
+        self.__set_has_variants(get_create_attrs(attrs))
 
         return attrs
 
+    def __set_has_variants(self, create_attrs):
+        variant_image_urls = set(TemporaryImage.objects.filter(
+            image_url__in=get_list_of_single_value(create_attrs, 'image_url'), has_variants=True
+        ).values_list('image_url', flat=True))
+
+        for attr in create_attrs:
+            attr['has_variants'] = attr['image_url'] in variant_image_urls
+
     def __validate_image_number_in_create(self, attrs):
         if len(attrs) > PRODUCT_IMAGE_MAX_LENGTH:
             raise ValidationError(
@@ -191,27 +203,21 @@ class ProductImageSerializer(ModelSerializer):
 
     class Meta:
         model = ProductImage
-        exclude = ['product']
+        exclude = ['product', 'has_variants']
         list_serializer_class = ProductImageListSerializer
 
     def validate_image_url(self, value):
         return value.split(BASE_IMAGE_URL)[-1]
 
     def validate(self, attrs):
-        if self.root.instance is None:
-            return self.__validate_create(attrs)
-        else:
+        if self.root.instance is not None:
             return self.__validate_update(attrs)
 
-    def __validate_create(self, attrs):
-        validate_image_url(attrs['image_url'])
-
         return attrs
 
     def __validate_update(self, attrs):
         if is_create_data(attrs):
             validate_all_required_fields_included(attrs, self.fields)
-            validate_image_url(attrs['image_url'])
         elif is_update_data(attrs):
             if 'image_url' in attrs:
                 self.__validate_image_url_update(attrs)
@@ -406,10 +412,13 @@ class OptionInOrderItemSerializer(Serializer):
     def to_representation(self, instance):
         result = super().to_representation(instance)
 
-        if instance.product_color.product.images.all().exists():
-            result['product_image_url'] = BASE_IMAGE_URL + instance.product_color.product.images.all()[0].image_url
+        images = instance.product_color.product.images.all()
+        if images:
+            result['product_image_url'] = BASE_IMAGE_URL + images[0].image_url
+            result['product_image_variants'] = get_image_variant_urls(images[0])
         else:
             result['product_image_url'] = DEFAULT_IMAGE_URL
+            result['product_image_variants'] = None
 
         return result
 
@@ -539,8 +548,7 @@ class ProductColorWriteSerializer(ProductColorSerializer):
         return attrs
 
     def validate_image_url(self, value):
-        image_url = value.split(BASE_IMAGE_URL)[-1]
-        return validate_image_url(image_url)
+        return value.split(BASE_IMAGE_URL)[-1]
 
     def __validate_update(self, attrs):
         if is_create_data(attrs):
@@ -602,19 +610,13 @@ class ProductSerializer(DynamicFieldsSerializer):
     images = ProductImageSerializer(allow_empty=False, many=True, source='related_images')
     manufacturing_country = CharField(max_length=20)
     
-    def __sort_dictionary_by_field_name(self, ret_dict):
-        field_order = self.context.get('field_order', [])
-        for field in field_order:
-            if field in self.fields:
-                ret_dict.move_to_end(field, last=True)
-
-        return ret_dict
+    def get_fields(self):
+        fields = super().get_fields()
+        for field in self.context.get('field_order', []):
+            if field in fields:
+                fields.move_to_end(field, last=True)
 
-    def to_representation(self, instance):
-        result = super().to_representation(instance)
-        result = self.__sort_dictionary_by_field_name(result)
-
-        return result
+        return fields
 
 
 class ProductReadSerializer(ProductSerializer):
@@ -639,15 +641,23 @@ class ProductReadSerializer(ProductSerializer):
             return self.__to_representation_list(result, instance)
 
     def __to_representation_list(self, result, instance):
-        if instance.related_images:
-            result['main_image'] = BASE_IMAGE_URL + instance.related_images[0].image_url
-        else:
-            result['main_image'] = DEFAULT_IMAGE_URL
+        extra_fields = self.context.get('extra_fields', PRODUCT_LIST_EXTRA_FIELDS)
 
-        if result['id'] in self.context.get('shoppers_like_products_id_list', []):
-            result['shopper_like'] = True
-        else:
-            result['shopper_like'] = False
+        if 'main_image' in extra_fields or 'main_image_variants' in extra_fields:
+            if instance.related_images:
+                main_image = BASE_IMAGE_URL + instance.related_images[0].image_url
+                main_image_variants = get_image_variant_urls(instance.related_images[0])
+            else:
+                main_image = DEFAULT_IMAGE_URL
+                main_image_variants = None
+
+            if 'main_image' in extra_fields:
+                result['main_image'] = main_image
+            if 'main_image_variants' in extra_fields:
+                result['main_image_variants'] = main_image_variants
+
+        if 'shopper_like' in extra_fields:
+            result['shopper_like'] = instance.id in self.context.get('shoppers_like_products_id_list', [])
 
         return result
 
@@ -690,8 +700,18 @@ class ProductWriteSerializer(ProductSerializer):
         if self.__validation_fields_related_to_main_category & set(attrs.keys()):
             self.__validate_main_category(attrs)
 
+        claim_image_urls(self.__get_claiming_image_urls(attrs))
+
         return attrs
 
+    def __get_claiming_image_urls(self, attrs):
+        images = attrs.get('related_images', [])
+        if self.instance is not None:
+            images = get_create_attrs(images)
+
+        return get_list_of_single_value(images, 'image_url') \
+            + [color['image_url'] for color in attrs.get('colors', []) if 'image_url' in color]
+
     def __validate_main_category(self, attrs):
         requested_main_category = attrs.get('sub_category', self.instance.sub_category if self.instance else None).main_category
         original_main_category = self.instance.sub_category.main_category if self.instance else None
@@ -0,0 +1,90 @@
+import shutil
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import override_settings
+
+from rest_framework.test import APITestCase
+
+from common.images import get_image_variant_path
+from common.test.test_images import IMAGE_VARIANT_FORMAT, get_image_content
+from .factories import ProductImageFactory
+from ..models import ProductImage
+
+
+@override_settings(IMAGE_VARIANT_FORMAT=IMAGE_VARIANT_FORMAT)
+class CreateImageVariantsCommandTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.__product_images = [ProductImageFactory(image_url='product/product_{}.png'.format(i)) for i in range(3)]
+        cls.__missing_product_image = ProductImageFactory(image_url='product/missing.png')
+
+    def setUp(self):
+        self.__location = tempfile.mkdtemp()
+        self.__storage = FileSystemStorage(location=self.__location)
+        for product_image in self.__product_images:
+            self.__storage.save(product_image.image_url, ContentFile(get_image_content(800, 800)))
+
+        patchers = [
+            patch('product.management.commands.create_image_variants.MediaStorage', return_value=self.__storage),
+            patch('product.management.commands.create_image_variants.MediaVariantStorage', return_value=self.__storage),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.__location)
+
+    def __call_command(self, *args):
+        stdout = StringIO()
+        call_command('create_image_variants', *args, stdout=stdout)
+
+        return stdout.getvalue()
+
+    def test_create_image_variants(self):
+        output = self.__call_command('--chunk-size', '2', '--workers', '2')
+
+        for product_image in self.__product_images:
+            self.assertTrue(self.__storage.exists(get_image_variant_path(product_image.image_url, 360)))
+            self.assertTrue(self.__storage.exists(get_image_variant_path(product_image.image_url, 720)))
+        self.assertEqual(output.count('Processed 2 images'), 2)
+        self.assertIn('Created variants of 3 images', output)
+        self.assertIn('(0 skipped, 1 failed)', output)
+        self.assertListEqual(
+            list(ProductImage.objects.filter(has_variants=True).order_by('id').values_list('image_url', flat=True)),
+            [product_image.image_url for product_image in self.__product_images]
+        )
+
+    def test_skip_marked_images(self):
+        self.__call_command()
+        output = self.__call_command()
+
+        self.assertIn('Created variants of 0 images', output)
+        self.assertIn('(0 skipped, 1 failed)', output)
+
+    def test_mark_existing_variants(self):
+        self.__call_command()
+        ProductImage.objects.update(has_variants=False)
+        output = self.__call_command()
+
+        self.assertIn('Created variants of 0 images', output)
+        self.assertIn('(3 skipped, 1 failed)', output)
+        self.assertEqual(ProductImage.objects.filter(has_variants=True).count(), 3)
+
+    def test_overwrite(self):
+        self.__call_command()
+        output = self.__call_command('--overwrite')
+
+        self.assertIn('Created variants of 3 images', output)
+
+    def test_invalid_chunk_size(self):
+        self.assertRaisesRegex(CommandError, r'^chunk-size must be greater than 0.$', self.__call_command, '--chunk-size', '0')
+
+    def test_invalid_workers(self):
+        self.assertRaisesRegex(CommandError, r'^workers must be greater than 0.$', self.__call_command, '--workers', '0')
@@ -11,6 +11,7 @@ from factory import RelatedFactoryList
 from common.models import TemporaryImage, SettingGroup
 from common.serializers import SettingItemSerializer, SettingGroupSerializer
 from common.utils import DEFAULT_IMAGE_URL, BASE_IMAGE_URL, datetime_to_iso, get_full_image_url
+from common.images import get_image_variant_urls
 from common.test.test_cases import SerializerTestCase, ListSerializerTestCase
 from common.test.factories import SettingItemFactory, SettingGroupFactory
 from common.test.test_serializers import  get_setting_groups_test_data
@@ -660,11 +661,21 @@ class OptionInOrderItemSerializerTestCase(SerializerTestCase):
     def test_model_instance_serialization_with_image(self):
         img = ProductImageFactory(product=self.__option.product_color.product)
         self.__expected_data['product_image_url'] = get_full_image_url(img.image_url)
+        self.__expected_data['product_image_variants'] = None
 
         self._test_model_instance_serialization(self.__option, self.__expected_data)
 
+    def test_model_instance_serialization_with_image_variants(self):
+        img = ProductImageFactory(product=self.__option.product_color.product, has_variants=True)
+        self.__expected_data['product_image_url'] = get_full_image_url(img.image_url)
+        self.__expected_data['product_image_variants'] = get_image_variant_urls(img)
+
+        self.assertIsNotNone(self.__expected_data['product_image_variants'])
+        self._test_model_instance_serialization(self.__option, self.__expected_data)
+
     def test_model_instance_serialization_without_image(self):
         self.__expected_data['product_image_url'] = DEFAULT_IMAGE_URL
+        self.__expected_data['product_image_variants'] = None
 
         self._test_model_instance_serialization(self.__option, self.__expected_data)
 
@@ -1025,6 +1036,7 @@ class ProductReadSerializerTestCase(SerializerTestCase):
         ]
         for data in expected_data:
             data['main_image'] = data['images'][0]['image_url']
+            data['main_image_variants'] = get_image_variant_urls(self.__product.images.all()[0])
         prefetch_images = Prefetch('images', to_attr='related_images')
         product = Product.objects.prefetch_related(
                     prefetch_images
@@ -1231,6 +1243,13 @@ class ProductWriteSerializerTestCase(SerializerTestCase):
 
         self._test_serializer_raise_validation_error(expected_message)
 
+    def test_raise_validation_error_missing_image_url(self):
+        self._test_data['images'][0]['image_url'] = BASE_IMAGE_URL + 'product/missing.jpg'
+        expected_message = 'product/missing.jpg is not found.'
+
+        self._test_serializer_raise_validation_error(expected_message)
+        self.assertTrue(TemporaryImage.objects.filter(image_url=self._test_data['images'][1]['image_url'][len(BASE_IMAGE_URL):]).exists())
+
     def test_raise_validation_error_color_length_more_than_limit(self):
         product_colors = [
             ProductColorFactory(product=self.__product, image_url=self.__image_url_list.pop())
@@ -1372,6 +1391,19 @@ class ProductWriteSerializerTestCase(SerializerTestCase):
             sum([len(color_data['options']) for color_data in self._test_data['colors']]),
         )
 
+    def test_create_images_with_rendered_variants(self):
+        image_urls = [image['image_url'][len(BASE_IMAGE_URL):] for image in self._test_data['images']]
+        TemporaryImage.objects.filter(image_url=image_urls[0]).update(has_variants=True)
+        serializer = self._get_serializer_after_validation(
+            context={'wholesaler': WholesalerFactory()}
+        )
+        product = serializer.save()
+
+        self.assertDictEqual(
+            dict(product.images.values_list('image_url', 'has_variants')),
+            {image_url: index == 0 for index, image_url in enumerate(image_urls)}
+        )
+
     def test_update_product_attribute(self):
         update_data = {
             'name': self.__product.name + '_update',
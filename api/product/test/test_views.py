@@ -1,6 +1,12 @@
 import random
+from datetime import timedelta
+from unittest.mock import patch
 
+from django.db import connection
 from django.db.models.query import Prefetch
+from django.test import override_settings
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
 from django.db.models import Avg, Max, Min, Count, Q, Case, When
 
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -9,7 +15,7 @@ from faker import Faker
 from common.test.test_cases import ViewTestCase, FunctionTestCase
 from common.test.factories import FuzzyRandomLengthText, SettingItemFactory, SettingGroupFactory
 from common.utils import levenshtein, BASE_IMAGE_URL
-from common.models import TemporaryImage, SettingGroup
+from common.models import TemporaryImage, PresignedUpload, SettingGroup
 from coupon.models import Coupon
 from user.test.factories import WholesalerFactory
 from user.models import Wholesaler
@@ -201,6 +207,60 @@ class GetProductRegistrationTestCase(ViewTestCase):
         self.assertDictEqual(self._response_data, ProductRegistrationSerializer(instances).data)
 
 
+@override_settings(AWS_ACCESS_KEY_ID='access_key', AWS_SECRET_ACCESS_KEY='secret_key')
+class IssueProductImagePresignedPostsTestCase(ViewTestCase):
+    _url = '/products/images/presigned-posts'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls._set_wholesaler()
+
+    def setUp(self):
+        self._set_authentication()
+
+    def test_success(self):
+        self._post({'names': ['image.png']}, format='json')
+
+        self._assert_success()
+        self.assertEqual(len(self._response_data), 1)
+        self.assertTrue(self._response_data[0]['image_url'].startswith('product/wholesaler{}/product_'.format(self._user.id)))
+        self.assertIn('policy', self._response_data[0]['fields'])
+
+    def test_raise_validation_error_on_invalid_extension(self):
+        self._post({'names': ['document.pdf']}, format='json')
+
+        self.assertEqual(self._response.status_code, 400)
+
+
+class CompleteProductImageUploadTestCase(ViewTestCase):
+    _url = '/products/images/completions'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls._set_wholesaler()
+
+    def setUp(self):
+        self._set_authentication()
+
+    @patch('common.storage.defer_image_variants')
+    @patch('common.storage.MediaStorage.size', return_value=100)
+    @patch('common.storage.MediaStorage.exists', return_value=True)
+    def test_success(self, exists_mock, size_mock, defer_image_variants_mock):
+        image_url = 'product/wholesaler{}/product_20220101_000000000000.png'.format(self._user.id)
+        PresignedUpload.objects.create(image_url=image_url, expires_at=timezone.now() + timedelta(hours=1))
+        self._post({'image_url': [image_url]}, format='json')
+
+        self._assert_success()
+        self.assertListEqual(defer_image_variants_mock.call_args.args[2], [image_url])
+        self.assertListEqual(self._response_data['image'], [BASE_IMAGE_URL + image_url])
+        self.assertTrue(TemporaryImage.objects.filter(image_url=image_url).exists())
+
+    def test_reject_unissued_key(self):
+        self._post({'image_url': ['product/wholesaler{}/../product_20220101_000000000000.png'.format(self._user.id)]}, format='json')
+
+        self.assertEqual(self._response.status_code, 400)
+
+
 class GetProductQuestionAnswerClassificationTestCase(ViewTestCase):
     _url = '/products/question-answers/classifications'
 
@@ -327,6 +387,19 @@ class ProductViewSetForShopperTestCase(ProductViewSetTestCase):
         self.__test_list_response(self.__get_queryset())
         self.assertEqual(self._response_data['max_price'], max_price)
 
+    def test_list_sparse_fields(self):
+        with CaptureQueriesContext(connection) as context:
+            self._get({'fields': 'name,id,shopper_like'})
+
+        self._assert_success()
+        self.assertListEqual(list(self._response_data['results'][0].keys()), ['name', 'id', 'shopper_like'])
+        self.assertFalse(any('"product_image"' in query['sql'] for query in context.captured_queries))
+
+    def test_failure_unavailable_sparse_fields(self):
+        self._get({'fields': 'name,colors'})
+
+        self._assert_failure(400, 'Query parameter fields contains unavailable fields: colors.')
+
     def test_list_like_products(self):
         self._unset_authentication()
         refresh = RefreshToken.for_user(self._user)
@@ -7,7 +7,8 @@ from .documentations import (
     decorated_get_all_categories_view, decorated_get_main_categories_view, decorated_get_sub_categories_by_main_category_view,
     decorated_get_colors_view, decorated_get_tag_search_result_view, decorated_upload_product_image_view,
     decorated_get_related_search_words_view, decorated_get_product_question_answer_classification,
-    decorated_get_product_registration_data_view,
+    decorated_get_product_registration_data_view, decorated_issue_product_image_presigned_posts_view,
+    decorated_complete_product_image_upload_view,
 )
 
 
@@ -23,6 +24,8 @@ urlpatterns = [
     path('/colors', decorated_get_colors_view),
     path('/tags', decorated_get_tag_search_result_view),
     path('/images', decorated_upload_product_image_view),
+    path('/images/presigned-posts', decorated_issue_product_image_presigned_posts_view),
+    path('/images/completions', decorated_complete_product_image_upload_view),
     path('/related-search-words', decorated_get_related_search_words_view),
     path('/question-answers/classifications', decorated_get_product_question_answer_classification),
     path('/registration-datas', decorated_get_product_registration_data_view),
@@ -10,15 +10,19 @@ from rest_framework.viewsets import GenericViewSet
 from rest_framework.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST
 from rest_framework.mixins import ListModelMixin
 
-from common.utils import get_response, querydict_to_dict, levenshtein, check_integer_format
-from common.views import upload_image_view
+from common.utils import (
+    get_response, get_paginated_data, querydict_to_dict, levenshtein, check_integer_format, get_sparse_fields, get_concrete_field_names,
+)
+from common.routers import read_replica
+from common.views import upload_image_view, presigned_post_view, presigned_upload_completion_view
 from common.permissions import IsAuthenticatedWholesaler
+from common.pooling import submit_query
 from common.models import SettingGroup
 from coupon.models import Coupon
 from user.models import is_shopper, is_wholesaler, ProductLike
 from .models import MainCategory, SubCategory, Color, Keyword, Product, Tag, ProductQuestionAnswer, ProductQuestionAnswerClassification
 from .serializers import (
-    ProductReadSerializer, ProductRegistrationSerializer, ProductWriteSerializer, MainCategorySerializer, SubCategorySerializer, 
+    PRODUCT_LIST_EXTRA_FIELDS, ProductReadSerializer, ProductRegistrationSerializer, ProductWriteSerializer, MainCategorySerializer, SubCategorySerializer, 
     ColorSerializer, TagSerializer, ProductQuestionAnswerSerializer, ProductQuestionAnswerClassificationSerializer,
 )
 from .permissions import ProductPermission, ProductQuestionAnswerPermission
@@ -38,6 +42,7 @@ def sort_keywords_by_levenshtein_distance(keywords, search_word):
     return [keyword['name'] for keyword in sorted_keywords]
 
 
+@read_replica
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_all_categories(request):
@@ -47,6 +52,7 @@ def get_all_categories(request):
     return get_response(data=serializer.data)
 
 
+@read_replica
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_main_categories(request):
@@ -56,6 +62,7 @@ def get_main_categories(request):
     return get_response(data=serializer.data)
 
 
+@read_replica
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_sub_categories_by_main_category(request, id=None):
@@ -65,6 +72,7 @@ def get_sub_categories_by_main_category(request, id=None):
     return get_response(data=serializer.data)
 
 
+@read_replica
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_colors(request):
@@ -74,6 +82,7 @@ def get_colors(request):
     return get_response(data=serializer.data)
 
 
+@read_replica
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_tag_search_result(request):
@@ -95,6 +104,19 @@ def upload_product_image(request):
     return upload_image_view(request, 'product', request.user.id)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticatedWholesaler])
+def issue_product_image_presigned_posts(request):
+    return presigned_post_view(request, 'product', request.user.id)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticatedWholesaler])
+def complete_product_image_upload(request):
+    return presigned_upload_completion_view(request, 'product', request.user.id)
+
+
+@read_replica
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_related_search_words(request):
@@ -135,6 +157,7 @@ def get_product_registration_data(request):
     return get_response(data=ProductRegistrationSerializer(instances).data)
 
 
+@read_replica
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_product_question_answer_classification(request):
@@ -144,6 +167,7 @@ def get_product_question_answer_classification(request):
 
 class ProductViewSet(GenericViewSet):
     permission_classes = [ProductPermission]
+    read_replica_actions = ('list', 'retrieve')
     lookup_field = 'id'
     lookup_value_regex = r'[0-9]+'
     __integer_format_validation_keys = ['main_category', 'sub_category', 'color', 'id', 'min_price', 'max_price', 'coupon']
@@ -241,22 +265,35 @@ class ProductViewSet(GenericViewSet):
 
         return like_products_id_list
 
-    def __get_response_for_list(self, queryset, **extra_data):
-        allow_fields = self.__get_allow_fields()
+    def __get_list_fields(self):
+        available_fields = self.__default_fields + PRODUCT_LIST_EXTRA_FIELDS
+        fields = get_sparse_fields(self.request.query_params, available_fields) or available_fields
+
+        return [field for field in fields if field in self.__default_fields], [field for field in fields if field in PRODUCT_LIST_EXTRA_FIELDS]
+
+    def __get_response_for_list(self, queryset, **extra_futures):
+        allow_fields, extra_fields = self.__get_list_fields()
+
+        context = {'detail': self.detail, 'field_order': allow_fields, 'extra_fields': extra_fields}
+        like_products_id_list = None
+        if 'shopper_like' in extra_fields and is_shopper(self.request.user):
+            like_products_id_list = submit_query(self.__get_shoppers_like_products_id_list)
 
-        context = {'detail': self.detail, 'field_order': allow_fields}
-        if is_shopper(self.request.user):
-            context['shoppers_like_products_id_list'] = self.__get_shoppers_like_products_id_list()
+        queryset = queryset.only('id', *get_concrete_field_names(Product, allow_fields))
+        if 'main_image' not in extra_fields and 'main_image_variants' not in extra_fields:
+            queryset = queryset.prefetch_related(None)
 
         page = self.paginate_queryset(queryset)
+        if like_products_id_list is not None:
+            context['shoppers_like_products_id_list'] = like_products_id_list.result()
         serializer = self.get_serializer(
             page, allow_fields=allow_fields, many=True, context=context
         )
 
-        paginated_response = self.get_paginated_response(serializer.data)
-        paginated_response.data.update(extra_data)
+        paginated_data = get_paginated_data(self.paginator, serializer.data)
+        paginated_data.update({key: future.result() for key, future in extra_futures.items()})
 
-        return get_response(data=paginated_response.data)
+        return get_response(data=paginated_data)
 
     def __get_queryset_after_search(self, queryset, search_word):
         tag_id_list = list(Tag.objects.filter(name__contains=search_word).values_list('id', flat=True))
@@ -330,13 +367,14 @@ class ProductViewSet(GenericViewSet):
             queryset= self.get_queryset().filter(id__in=id_list).order_by(order_condition)
             return self.__get_response_for_list(queryset)
 
+        max_price = submit_query(self.__get_max_price)
         queryset = self.__sort_queryset(
             self.filter_queryset(
                 self.get_queryset()
             ).alias(Count('id'))
         )
 
-        return self.__get_response_for_list(queryset, max_price=self.__get_max_price())
+        return self.__get_response_for_list(queryset, max_price=max_price)
 
     @transaction.atomic
     def create(self, request):
@@ -380,6 +418,7 @@ class ProductViewSet(GenericViewSet):
 
 class ProductQuestionAnswerViewSet(ListModelMixin, GenericViewSet):
     permission_classes = [ProductQuestionAnswerPermission]
+    read_replica_actions = ('list',)
     lookup_field = 'id'
     lookup_url_kwarg = 'question_answer_id'
     lookup_value_regex = r'[0-9]+'
@@ -0,0 +1,57 @@
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from .caches import AUTHENTICATED_USER_FIELDS, get_cached_authenticated_user, set_cached_authenticated_user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    Cache only the fields authentication and permissions need. The other fields of a cached user are deferred and the
+    shopper and wholesaler rows are loaded on access, so views never read or write a stale profile.
+
+    The cache is local to each worker process, and a deactivated or deleted user is only invalidated in the process
+    that saved it. Other workers keep authenticating the user until their entry expires, for at most
+    AUTHENTICATED_USER_CACHE_TIMEOUT seconds.
+    """
+    def __get_user_from_cache(self, user_id):
+        cached_user = get_cached_authenticated_user(user_id)
+        if cached_user is None:
+            return None
+
+        field_names = [field.attname for field in self.user_model._meta.concrete_fields if field.attname in AUTHENTICATED_USER_FIELDS]
+        user = self.user_model.from_db(None, field_names, [cached_user[field_name] for field_name in field_names])
+        user.is_shopper = cached_user['is_shopper']
+        user.is_wholesaler = cached_user['is_wholesaler']
+
+        return user
+
+    def __get_user_from_database(self, user_id):
+        try:
+            user = self.user_model.objects.select_related('shopper', 'wholesaler').get(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+
+        user.is_shopper = hasattr(user, 'shopper')
+        user.is_wholesaler = hasattr(user, 'wholesaler')
+
+        return user
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        user = self.__get_user_from_cache(user_id)
+        if user is None:
+            user = self.__get_user_from_database(user_id)
+            if user.is_active:
+                set_cached_authenticated_user(user)
+
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        return user
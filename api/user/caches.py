@@ -0,0 +1,30 @@
+from django.core.cache import caches
+
+
+AUTHENTICATED_USER_CACHE_ALIAS = 'authenticated_user'
+AUTHENTICATED_USER_FIELDS = ('id', 'is_active', 'is_admin')
+
+
+def get_authenticated_user_cache():
+    return caches[AUTHENTICATED_USER_CACHE_ALIAS]
+
+
+def get_authenticated_user_cache_key(user_id):
+    return 'user:{}'.format(user_id)
+
+
+def get_cached_authenticated_user(user_id):
+    return get_authenticated_user_cache().get(get_authenticated_user_cache_key(user_id))
+
+
+def set_cached_authenticated_user(user):
+    cached_user = {field: getattr(user, field) for field in AUTHENTICATED_USER_FIELDS}
+    cached_user.update(is_shopper=user.is_shopper, is_wholesaler=user.is_wholesaler)
+    get_authenticated_user_cache().set(get_authenticated_user_cache_key(user.id), cached_user)
+
+
+def invalidate_authenticated_user(user_id):
+    """
+    Drop the cached user of this process only. Entries of other workers expire after AUTHENTICATED_USER_CACHE_TIMEOUT.
+    """
+    get_authenticated_user_cache().delete(get_authenticated_user_cache_key(user_id))
@@ -0,0 +1,79 @@
+from django.db import connection
+from django.db.models import Q, F, BooleanField, ExpressionWrapper
+from django.utils import timezone
+
+from .models import Cart
+
+
+UPSERTING_CONFLICT_CLAUSES = {
+    'mysql': (
+        'ON DUPLICATE KEY UPDATE {count} = {count} + VALUES({count}), '
+        'added_base_discounted_price = VALUES(added_base_discounted_price)'
+    ),
+    'postgresql': (
+        'ON CONFLICT (shopper_id, option_id) DO UPDATE SET {count} = {cart}.{count} + EXCLUDED.{count}, '
+        'added_base_discounted_price = EXCLUDED.added_base_discounted_price'
+    ),
+    'sqlite': (
+        'ON CONFLICT (shopper_id, option_id) DO UPDATE SET {count} = {cart}.{count} + excluded.{count}, '
+        'added_base_discounted_price = excluded.added_base_discounted_price'
+    ),
+}
+
+
+def _get_upserting_sql(number_of_rows):
+    quote_name = connection.ops.quote_name
+
+    return (
+        'INSERT INTO {cart} (shopper_id, option_id, {count}, added_base_discounted_price, created_at) VALUES {values} '
+        + UPSERTING_CONFLICT_CLAUSES[connection.vendor]
+    ).format(
+        cart=quote_name(Cart._meta.db_table),
+        count=quote_name('count'),
+        values=', '.join(['(%s, %s, %s, %s, %s)'] * number_of_rows),
+    )
+
+
+def _upsert_carts(shopper_id, counts, prices):
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    params = []
+    for option_id, count in counts.items():
+        params += [shopper_id, option_id, count, prices.get(option_id), now]
+
+    with connection.cursor() as cursor:
+        cursor.execute(_get_upserting_sql(len(counts)), params)
+
+
+def _update_and_create_carts(shopper_id, counts, prices):
+    carts = list(Cart.objects.select_for_update().filter(shopper_id=shopper_id, option_id__in=counts.keys()))
+    for cart in carts:
+        cart.count += counts[cart.option_id]
+        cart.added_base_discounted_price = prices.get(cart.option_id)
+    Cart.objects.bulk_update(carts, ['count', 'added_base_discounted_price'])
+
+    existing_option_id = set(cart.option_id for cart in carts)
+    Cart.objects.bulk_create([
+        Cart(shopper_id=shopper_id, option_id=option_id, count=count, added_base_discounted_price=prices.get(option_id))
+        for option_id, count in counts.items() if option_id not in existing_option_id
+    ])
+
+
+def add_carts(shopper_id, counts, prices=None):
+    if not counts:
+        return
+
+    if connection.vendor in UPSERTING_CONFLICT_CLAUSES:
+        _upsert_carts(shopper_id, counts, prices or {})
+    else:
+        _update_and_create_carts(shopper_id, counts, prices or {})
+
+
+def get_availability_condition():
+    return Q(option__on_sale=True, option__product_color__on_sale=True, option__product_color__product__on_sale=True)
+
+
+def annotate_cart_status(queryset):
+    return queryset.annotate(
+        is_available=ExpressionWrapper(get_availability_condition(), output_field=BooleanField()),
+        price_difference=F('option__product_color__product__base_discounted_price') - F('added_base_discounted_price'),
+    )
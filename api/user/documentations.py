@@ -1,10 +1,10 @@
 from django.db import transaction
 
-from drf_yasg.utils import swagger_auto_schema
-from rest_framework.serializers import Serializer, ModelSerializer, IntegerField, CharField, URLField, ListField
+from drf_yasg.utils import swagger_auto_schema, no_body
+from rest_framework.serializers import Serializer, ModelSerializer, IntegerField, CharField, URLField, ListField, BooleanField
 from rest_framework.decorators import action
 
-from common.documentations import UniqueResponse, Image, get_response, get_paginated_response
+from common.documentations import UniqueResponse, Image, ImageVariants, get_response, get_paginated_response
 from coupon.documentations import CouponResponse
 from .models import Shopper, Wholesaler
 from .serializers import (
@@ -114,10 +114,13 @@ class ProductCartResponse(Serializer):
             size = CharField()
             count = IntegerField()
             option = IntegerField()
+            is_available = BooleanField()
+            price_difference = IntegerField(help_text='장바구니에 담은 시점 대비 현재 할인가 차이(담은 시점 가격이 없으면 null)')
 
     product_id = IntegerField()
     product_name = CharField()
     image = URLField()
+    image_variants = ImageVariants(allow_null=True)
     carts  =CartResponse(many=True)
 
 
@@ -200,6 +203,12 @@ class DecoratedCartViewSet(CartViewSet):
     def remove(self, *args, **kwargs):
         return super().remove(*args, **kwargs)
 
+    @swagger_auto_schema(request_body=no_body, **get_response(CartDeleteRequest()), operation_description='판매 중지된 장바구니 항목 일괄 삭제\n옵션, 색상, 상품 중 하나라도 판매 중지된 항목을 삭제하고 삭제된 id 배열 반환')
+    @action(methods=['POST'], detail=False, url_path='remove-unavailable')
+    @transaction.atomic
+    def remove_unavailable(self, *args, **kwargs):
+        return super().remove_unavailable(*args, **kwargs)
+
 
 class DecoratedShopperShippingAddressViewSet(ShopperShippingAddressViewSet):
     @swagger_auto_schema(**get_response(ShopperShippingAddressSerializer(many=True)), operation_description='배송지 리스트 조회')
@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from user.models import OutstandingToken
+from user.tokens import EXPIRED_TOKEN_DELETION_BATCH_SIZE, get_expired_tokens, iterate_expired_token_deletion
+
+
+class Command(BaseCommand):
+    help = 'Delete expired outstanding tokens and their blacklisted tokens in id-ordered batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=EXPIRED_TOKEN_DELETION_BATCH_SIZE, help='number of outstanding tokens deleted per batch')
+        parser.add_argument('--interval', type=float, default=0, help='seconds to sleep between batches')
+
+    def __get_rate(self, count, elapsed_time):
+        return count / elapsed_time if elapsed_time else 0
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('batch-size must be greater than 0.')
+        elif options['interval'] < 0:
+            raise CommandError('interval must not be negative.')
+
+        backlog = get_expired_tokens().count()
+        self.stdout.write('{} expired outstanding tokens to delete.'.format(backlog))
+
+        total_outstanding_token_count = total_blacklisted_token_count = 0
+        working_time = 0
+        start_time = batch_start_time = time.perf_counter()
+
+        for outstanding_token_count, blacklisted_token_count in iterate_expired_token_deletion(options['batch_size']):
+            batch_time = time.perf_counter() - batch_start_time
+            working_time += batch_time
+            total_outstanding_token_count += outstanding_token_count
+            total_blacklisted_token_count += blacklisted_token_count
+
+            self.stdout.write(
+                'Deleted {} outstanding tokens and {} blacklisted tokens ({:.1f} rows/sec, {} remaining).'.format(
+                    outstanding_token_count, blacklisted_token_count,
+                    self.__get_rate(outstanding_token_count + blacklisted_token_count, batch_time),
+                    max(backlog - total_outstanding_token_count, 0),
+                )
+            )
+
+            if outstanding_token_count == options['batch_size'] and options['interval']:
+                time.sleep(options['interval'])
+            batch_start_time = time.perf_counter()
+
+        total_count = total_outstanding_token_count + total_blacklisted_token_count
+        self.stdout.write(self.style.SUCCESS(
+            'Deleted {} outstanding tokens and {} blacklisted tokens in {:.2f}s ({:.1f} rows/sec excluding intervals). '
+            '{} outstanding tokens remain.'.format(
+                total_outstanding_token_count, total_blacklisted_token_count, time.perf_counter() - start_time,
+                self.__get_rate(total_count, working_time), OutstandingToken.objects.count(),
+            )
+        ))
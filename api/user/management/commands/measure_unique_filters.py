@@ -0,0 +1,49 @@
+import time
+import random
+import string
+
+from django.core.management.base import BaseCommand, CommandError
+
+from user.uniqueness import UNIQUE_VALUE_FILTERS, UNIQUE_VALUE_FILTER_FALSE_POSITIVE_RATE, UniqueValueFilter
+
+
+class Command(BaseCommand):
+    help = (
+        'Build copies of the uniqueness pre-check bloom filters and report their size, build time and false positive rates. '
+        'Each worker builds and rebuilds its own filters in the background, so this command does not affect them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('fields', nargs='*', help='is_unique parameter names (default: all)')
+        parser.add_argument('--false-positive-rate', type=float, default=UNIQUE_VALUE_FILTER_FALSE_POSITIVE_RATE)
+        parser.add_argument('--sample-size', type=int, default=10000, help='number of random absent values used to measure the false positive rate')
+
+    def __get_random_value(self):
+        return 'unique_filter_sample_' + ''.join(random.choices(string.ascii_lowercase + string.digits, k=16))
+
+    def __get_measured_false_positive_rate(self, bloom_filter, sample_size):
+        if not sample_size:
+            return 0
+
+        return sum(self.__get_random_value() in bloom_filter for _ in range(sample_size)) / sample_size
+
+    def handle(self, *args, **options):
+        fields = options['fields'] or list(UNIQUE_VALUE_FILTERS.keys())
+        invalid_fields = set(fields) - set(UNIQUE_VALUE_FILTERS.keys())
+        if invalid_fields:
+            raise CommandError('Invalid field name: {}.'.format(', '.join(sorted(invalid_fields))))
+
+        for field in fields:
+            start_time = time.perf_counter()
+            unique_value_filter = UniqueValueFilter(UNIQUE_VALUE_FILTERS[field].model_label, UNIQUE_VALUE_FILTERS[field].column)
+            bloom_filter = unique_value_filter.build(options['false_positive_rate'])
+            build_time = time.perf_counter() - start_time
+
+            self.stdout.write(
+                '{}: {} values, {:.1f} KiB, {} hashes, built in {:.2f}s, '
+                'estimated false positive rate {:.4f}, measured false positive rate {:.4f}'.format(
+                    field, bloom_filter.count, bloom_filter.size / 8 / 1024, bloom_filter.number_of_hashes, build_time,
+                    bloom_filter.get_estimated_false_positive_rate(),
+                    self.__get_measured_false_positive_rate(bloom_filter, options['sample_size']),
+                )
+            )
@@ -0,0 +1,18 @@
+# Generated by Django 4.0.2 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0026_alter_membership_discount_rate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cart',
+            name='added_base_discounted_price',
+            field=models.IntegerField(null=True),
+        ),
+    ]
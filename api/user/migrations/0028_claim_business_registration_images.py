@@ -0,0 +1,32 @@
+# Generated by Django 4.0.2 on 2026-10-19 12:00
+
+from django.db import migrations
+
+from common.utils import BASE_IMAGE_URL
+
+
+CHUNK_SIZE = 1000
+
+
+def claim_business_registration_images(apps, schema_editor):
+    Wholesaler = apps.get_model('user', 'Wholesaler')
+    TemporaryImage = apps.get_model('common', 'TemporaryImage')
+
+    image_urls = [
+        image_url.split(BASE_IMAGE_URL)[-1]
+        for image_url in Wholesaler.objects.values_list('business_registration_image_url', flat=True).iterator()
+    ]
+    for index in range(0, len(image_urls), CHUNK_SIZE):
+        TemporaryImage.objects.filter(image_url__in=image_urls[index:index + CHUNK_SIZE]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0011_imagehash'),
+        ('user', '0027_cart_added_base_discounted_price'),
+    ]
+
+    operations = [
+        migrations.RunPython(claim_business_registration_images, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.0.2 on 2026-10-19 10:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0028_claim_business_registration_images'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UniqueValueChange',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('model_label', models.CharField(max_length=50)),
+                ('column', models.CharField(max_length=50)),
+                ('value', models.CharField(max_length=200)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'unique_value_change',
+            },
+        ),
+    ]
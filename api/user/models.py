@@ -5,6 +5,7 @@ from django.db.models import (
     ForeignKey, EmailField, DateField, IntegerField, ImageField, DO_NOTHING, ManyToManyField,
 )
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
+from django.db import transaction, IntegrityError
 from django.utils import timezone
 from django.utils.functional import cached_property
 
@@ -12,6 +13,13 @@ from rest_framework.exceptions import APIException
 from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
 
 from common.storage import MediaStorage
+from common.utils import get_first_unused_value
+from .caches import invalidate_authenticated_user
+from .uniqueness import add_unique_values
+
+
+DEFAULT_NICKNAME_CANDIDATE_SIZE = 10
+DEFAULT_NICKNAME_SAVE_ATTEMPTS = 3
 
 
 def is_shopper(user):
@@ -79,6 +87,8 @@ class User(AbstractBaseUser):
                 update_fields.append('deleted_at')
 
         super().save(force_insert=force_insert, update_fields=update_fields, *args, **kwargs)
+        invalidate_authenticated_user(self.id)
+        add_unique_values(self, update_fields)
 
     def delete(self):
         self.is_active = False
@@ -106,19 +116,40 @@ class Shopper(User):
     def __str__(self):
         return '{0} {1}'.format(self.username, self.name)
 
-    def __get_default_nickname(self):
-        self.nickname = self.username
-        while self.__class__.objects.filter(nickname=self.nickname).exists():
+    def __get_default_nickname_candidates(self, include_username):
+        candidates = [self.username] if include_username else []
+        while len(candidates) < DEFAULT_NICKNAME_CANDIDATE_SIZE:
             length = random.randint(5, 14)
-            self.nickname = 'omios_' + ''.join(random.choices(string.ascii_lowercase + string.digits, k=length))
+            candidates.append('omios_' + ''.join(random.choices(string.ascii_lowercase + string.digits, k=length)))
 
-        return self.nickname
+        return candidates
 
-    def save(self, *args, **kwargs):
-        if not self.nickname:
-            self.nickname = self.__get_default_nickname()
+    def __get_default_nickname(self, include_username=True):
+        nickname = None
+        while nickname is None:
+            nickname = get_first_unused_value(
+                self.__class__.objects.all(), 'nickname', self.__get_default_nickname_candidates(include_username)
+            )
+            include_username = False
 
-        super().save(*args, **kwargs)
+        return nickname
+
+    def save(self, *args, **kwargs):
+        if self.nickname:
+            return super().save(*args, **kwargs)
+
+        password = self.password
+        for attempt in range(DEFAULT_NICKNAME_SAVE_ATTEMPTS):
+            self.nickname = self.__get_default_nickname(include_username=attempt == 0)
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                if attempt == DEFAULT_NICKNAME_SAVE_ATTEMPTS - 1 or not self.__class__.objects.filter(nickname=self.nickname).exists():
+                    raise
+
+                self.id = self.user_id = None
+                self.password, self._password = password, None
 
     def delete(self):
         self.question_answers.all().delete()
@@ -160,6 +191,17 @@ class Wholesaler(User):
         return '{0} {1}'.format(self.username, self.name)
 
 
+class UniqueValueChange(Model):
+    id = BigAutoField(primary_key=True)
+    model_label = CharField(max_length=50)
+    column = CharField(max_length=50)
+    value = CharField(max_length=200)
+    created_at = DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'unique_value_change'
+
+
 class ProductLike(Model):
     id = BigAutoField(primary_key=True)
     shopper = ForeignKey('Shopper', DO_NOTHING)
@@ -177,6 +219,7 @@ class Cart(Model):
     shopper = ForeignKey('Shopper', DO_NOTHING, related_name='carts')
     created_at = DateTimeField(auto_now_add=True)
     count = IntegerField()
+    added_base_discounted_price = IntegerField(null=True)
 
     class Meta:
         db_table = 'cart'
@@ -1,29 +1,32 @@
 from datetime import date, timedelta
 
-from django.utils import timezone
-from django.db.models import Q
+from django.db.models import Q, Manager
 
 from rest_framework.serializers import (
     Serializer, ModelSerializer, ListSerializer, ValidationError, IntegerField, CharField, RegexField, DateTimeField,
-    StringRelatedField,
+    StringRelatedField, BooleanField,
 )
 from rest_framework.validators import UniqueValidator
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer, TokenBlacklistSerializer
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.utils import datetime_from_epoch
 
 from common.utils import gmt_to_kst, BASE_IMAGE_URL, DEFAULT_IMAGE_URL
+from common.images import get_image_variant_urls
 from common.regular_expressions import (
     USERNAME_REGEX, PASSWORD_REGEX, NAME_REGEX, NICKNAME_REGEX, MOBILE_NUMBER_REGEX, PHONE_NUMBER_REGEX,
     BASIC_SPECIAL_CHARACTER_REGEX, ZIP_CODE_REGEX,
 )
-from common.serializers import MAXIMUM_NUMBER_OF_ITEMS
+from common.serializers import MAXIMUM_NUMBER_OF_ITEMS, DynamicFieldsModelSerializer, PrefetchedPrimaryKeyRelatedField
+from common.validators import claim_image_urls
 from coupon.models import Coupon, CouponClassification
+from product.models import Option
 from .models import (
-    is_shopper, is_wholesaler, OutstandingToken, BlacklistedToken, ShopperShippingAddress, Membership, User, Shopper,
+    is_shopper, is_wholesaler, OutstandingToken, ShopperShippingAddress, Membership, User, Shopper,
     Wholesaler, PointHistory, Building, Cart, ShopperCoupon
 )
 from .validators import PasswordSimilarityValidator
+from .tokens import RotatingRefreshToken, blacklist_user_tokens
+from .carts import add_carts
 
 
 def get_token_time(token):
@@ -55,17 +58,30 @@ class IssuingTokenSerializer(TokenObtainPairSerializer):
 
 class RefreshingTokenSerializer(TokenRefreshSerializer):
     def validate(self, attrs):
-        token = super().validate(attrs)
-        refresh = RefreshToken(token['refresh'])
-    
+        refresh = RotatingRefreshToken(attrs['refresh'])
+        data = {'access': str(refresh.access_token)}
+
+        refresh.blacklist()
+        refresh.set_jti()
+        refresh.set_exp()
+        refresh.set_iat()
+        data['refresh'] = str(refresh)
+
         OutstandingToken.objects.create(
-            user=User.objects.get(id=refresh['user_id']),
+            user_id=refresh['user_id'],
             jti=refresh['jti'],
-            token=str(refresh),
+            token=data['refresh'],
             **get_token_time(refresh),
         )
         
-        return token
+        return data
+
+
+class BlacklistingTokenSerializer(TokenBlacklistSerializer):
+    def validate(self, attrs):
+        RotatingRefreshToken(attrs['refresh']).blacklist()
+
+        return {}
 
 
 class MembershipSerializer(ModelSerializer):
@@ -139,39 +155,50 @@ class WholesalerSerializer(UserSerializer):
         model = Wholesaler
         fields = '__all__'
 
+    def validate_business_registration_image_url(self, value):
+        if self.instance is None or value != self.instance.business_registration_image_url.name:
+            claim_image_urls([value.split(BASE_IMAGE_URL)[-1]])
 
-class CartListSerializer(ListSerializer):
-    __product_fields = ['product_id', 'product_name', 'image']
+        return value
 
-    def to_representation(self, data):
-        initial_results = super().to_representation(data)
 
-        index_mapping = {}
-        for index, result in enumerate(initial_results):
-            product_id = result['product_id']
-            if product_id in index_mapping:
-                index_mapping[product_id].append(index)
-            else:
-                index_mapping[product_id] = [index]
-
-        results = []
-        for indexes in index_mapping.values():
-            result = {}
+CART_PRODUCT_FIELDS = ('product_id', 'product_name', 'image', 'image_variants')
+CART_REQUIRED_FIELDS = ('product_id', 'product_name', 'count', 'base_discounted_price')
 
-            for field in self.__product_fields:
-                result[field] = initial_results[indexes[0]][field]
 
-            result['carts'] = []
+class CartListSerializer(ListSerializer):
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, Manager) else data
+        cart_fields = self.context.get('cart_fields', None)
 
-            for index in indexes:
-                for field in self.__product_fields:
-                    initial_results[index].pop(field)
+        results = {}
+        self.totals = {'total_sale_price': None, 'total_base_discounted_price': None}
+        for cart in iterable:
+            result = self.child.to_representation(cart)
+            product_id = result['product_id']
+            if product_id not in results:
+                results[product_id] = {field: result[field] for field in CART_PRODUCT_FIELDS}
+                results[product_id]['carts'] = []
+
+            self.totals['total_sale_price'] = (self.totals['total_sale_price'] or 0) \
+                + cart.option.product_color.product.sale_price * cart.count
+            self.totals['total_base_discounted_price'] = (self.totals['total_base_discounted_price'] or 0) \
+                + result['base_discounted_price']
+
+            if cart_fields is None:
+                for field in CART_PRODUCT_FIELDS:
+                    result.pop(field)
+            else:
+                result = {field: result[field] for field in cart_fields}
+            results[product_id]['carts'].append(result)
 
-                result['carts'].append(initial_results[index])
+        return list(results.values())
 
-            results.append(result)
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            self.child.fields['option'].prefetch([item.get('option') for item in data if isinstance(item, dict)])
 
-        return results
+        return super().to_internal_value(data)
 
     def validate(self, attrs):
         if self.instance is None:
@@ -184,37 +211,26 @@ class CartListSerializer(ListSerializer):
 
     def create(self, validated_data):
         shopper = self.context['shopper']
+        counts = {data['option'].id: data['count'] for data in validated_data}
+        prices = {data['option'].id: data['option'].product_color.product.base_discounted_price for data in validated_data}
+        add_carts(shopper.id, counts, prices)
 
-        input_data = {}
-        for data in validated_data:
-            input_data[data['option'].id] = data
-            input_data[data['option'].id].pop('option')
-
-        existing_option_id = list(shopper.carts.all().values_list('option__id', flat=True))
-        input_option_id = input_data.keys()
-        
-        create_option_id = set(input_option_id) - set(existing_option_id)
-        update_option_id = set(input_option_id) - set(create_option_id)
-
-        for option_id in update_option_id:
-            cart = shopper.carts.get(option_id=option_id)
-            cart.count += input_data[option_id]['count']
-            cart.save()
-
-        carts = [self.child.Meta.model(shopper=shopper, option_id=option_id, **input_data[option_id]) for option_id in create_option_id]
-        return self.child.Meta.model.objects.bulk_create(carts)
+        return [self.child.Meta.model(shopper=shopper, option_id=option_id, count=count) for option_id, count in counts.items()]
 
 
-class CartSerializer(ModelSerializer):
+class CartSerializer(DynamicFieldsModelSerializer):
     product_name = CharField(read_only=True, source='option.product_color.product.name')
     base_discounted_price = IntegerField(read_only=True, source='option.product_color.product.base_discounted_price')
     display_color_name = CharField(read_only=True, source='option.product_color.display_color_name')
     size = CharField(read_only=True, source='option.size.name')
     product_id = IntegerField(read_only=True, source='option.product_color.product.id')
+    option = PrefetchedPrimaryKeyRelatedField(queryset=Option.objects.select_related('product_color__product'))
+    is_available = BooleanField(read_only=True)
+    price_difference = IntegerField(read_only=True)
 
     class Meta:
         model = Cart
-        exclude = ['shopper', 'created_at']
+        exclude = ['shopper', 'created_at', 'added_base_discounted_price']
         extra_kwargs = {
             'count': {'min_value': 1, 'max_value': 100}, 
         }
@@ -224,10 +240,13 @@ class CartSerializer(ModelSerializer):
         result = super().to_representation(instance)
 
         result['base_discounted_price'] *= result['count'] 
-        if instance.option.product_color.product.images.all().exists():
-            result['image'] = BASE_IMAGE_URL + instance.option.product_color.product.images.all()[0].image_url
+        images = list(instance.option.product_color.product.images.all())
+        if images:
+            result['image'] = BASE_IMAGE_URL + images[0].image_url
+            result['image_variants'] = get_image_variant_urls(images[0])
         else:
             result['image'] = DEFAULT_IMAGE_URL
+            result['image_variants'] = None
 
         return result
 
@@ -255,8 +274,7 @@ class UserPasswordSerializer(Serializer):
         return attrs
 
     def __discard_refresh_token(self, user_id):
-        discarding_tokens = OutstandingToken.objects.filter(user_id=user_id, expires_at__gt=timezone.now(), blacklistedtoken__isnull=True).all()
-        BlacklistedToken.objects.bulk_create([BlacklistedToken(token=token) for token in discarding_tokens])
+        blacklist_user_tokens(user_id)
 
     def update(self, instance, validated_data):
         instance.password = validated_data['new_password']
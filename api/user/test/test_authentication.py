@@ -0,0 +1,126 @@
+from unittest.mock import patch
+
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.test import APITestCase
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from product.test.factories import ProductColorFactory
+from .factories import UserFactory, ShopperFactory, WholesalerFactory, CartFactory
+from ..authentication import CachedJWTAuthentication
+from ..models import Shopper, Wholesaler
+from ..caches import get_cached_authenticated_user, invalidate_authenticated_user
+
+
+class CachedJWTAuthenticationTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.__shopper = ShopperFactory()
+        cls.__wholesaler = WholesalerFactory()
+
+    def setUp(self):
+        self.__authentication = CachedJWTAuthentication()
+        invalidate_authenticated_user(self.__shopper.id)
+        invalidate_authenticated_user(self.__wholesaler.id)
+
+    def __get_user(self, user):
+        return self.__authentication.get_user(AccessToken.for_user(user))
+
+    def test_get_user_from_cache(self):
+        self.__get_user(self.__shopper)
+
+        with self.assertNumQueries(0):
+            user = self.__get_user(self.__shopper)
+
+        self.assertEqual(user.id, self.__shopper.id)
+
+    def test_cached_user_flags(self):
+        self.__get_user(self.__shopper)
+
+        with self.assertNumQueries(0):
+            user = self.__get_user(self.__shopper)
+            self.assertTrue(user.is_active)
+            self.assertFalse(user.is_admin)
+            self.assertTrue(user.is_shopper)
+            self.assertFalse(user.is_wholesaler)
+
+    def test_load_fresh_shopper(self):
+        self.__get_user(self.__shopper)
+        Shopper.objects.filter(id=self.__shopper.id).update(point=F('point') + 100)
+
+        with self.assertNumQueries(1):
+            shopper = self.__get_user(self.__shopper).shopper
+
+        self.assertEqual(shopper.point, self.__shopper.point + 100)
+
+    def test_load_fresh_wholesaler(self):
+        self.__get_user(self.__wholesaler)
+        Wholesaler.objects.filter(id=self.__wholesaler.id).update(name='new name')
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.__get_user(self.__wholesaler).wholesaler.name, 'new name')
+
+    def test_load_deferred_fields(self):
+        self.__get_user(self.__shopper)
+
+        self.assertEqual(self.__get_user(self.__shopper).username, self.__shopper.username)
+
+    def test_invalidate_on_delete(self):
+        user = UserFactory()
+        self.__get_user(user)
+        user.delete()
+
+        self.assertIsNone(get_cached_authenticated_user(user.id))
+        self.assertRaisesRegex(AuthenticationFailed, 'User is inactive', self.__get_user, user)
+
+    def test_invalidate_on_password_update(self):
+        self.__get_user(self.__shopper)
+        self.__shopper.password = 'New_password00'
+        self.__shopper.save(update_fields=['password'])
+
+        self.assertIsNone(get_cached_authenticated_user(self.__shopper.id))
+
+    def test_do_not_cache_inactive_user(self):
+        user = UserFactory(is_active=False)
+
+        self.assertRaisesRegex(AuthenticationFailed, 'User is inactive', self.__get_user, user)
+        self.assertIsNone(get_cached_authenticated_user(user.id))
+
+
+class AuthenticationQueryCountTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.__shopper = ShopperFactory()
+        product_color = ProductColorFactory()
+        CartFactory.create_batch(3, shopper=cls.__shopper, option__product_color=product_color)
+
+    def setUp(self):
+        invalidate_authenticated_user(self.__shopper.id)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer {}'.format(AccessToken.for_user(self.__shopper)))
+
+    def __get_number_of_queries(self, url, authentication_class):
+        with patch.object(APIView, 'authentication_classes', [authentication_class]):
+            self.client.get(url)
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+
+        return len(context.captured_queries)
+
+    def __test_number_of_queries(self, url, saved_queries):
+        number_of_queries = self.__get_number_of_queries(url, JWTAuthentication)
+        number_of_queries_with_cache = self.__get_number_of_queries(url, CachedJWTAuthentication)
+
+        self.assertEqual(number_of_queries - number_of_queries_with_cache, saved_queries)
+
+    def test_products(self):
+        self.__test_number_of_queries('/products', 2)
+
+    def test_shopper_carts(self):
+        self.__test_number_of_queries('/users/shoppers/carts', 2)
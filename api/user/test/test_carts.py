@@ -0,0 +1,73 @@
+from unittest.mock import patch
+
+from rest_framework.test import APITestCase
+
+from product.models import Product
+from product.test.factories import OptionFactory
+from .factories import ShopperFactory, CartFactory
+from ..models import Cart
+from ..carts import add_carts, annotate_cart_status
+
+
+class AddCartsTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.__shopper = ShopperFactory()
+        cls.__cart = CartFactory(shopper=cls.__shopper, count=2)
+        cls.__option = OptionFactory()
+
+    def __add_carts(self):
+        add_carts(self.__shopper.id, {self.__cart.option_id: 3, self.__option.id: 1}, {self.__cart.option_id: 5000, self.__option.id: 7000})
+
+    def __assert_carts(self):
+        self.assertDictEqual(
+            dict(self.__shopper.carts.values_list('option_id', 'count')),
+            {self.__cart.option_id: 5, self.__option.id: 1}
+        )
+        self.assertEqual(self.__shopper.carts.get(option_id=self.__cart.option_id).id, self.__cart.id)
+        self.assertDictEqual(
+            dict(self.__shopper.carts.values_list('option_id', 'added_base_discounted_price')),
+            {self.__cart.option_id: 5000, self.__option.id: 7000}
+        )
+
+    def test_upsert_in_a_single_query(self):
+        with self.assertNumQueries(1):
+            self.__add_carts()
+
+        self.__assert_carts()
+
+    def test_update_and_create_without_upsert(self):
+        with patch.dict('user.carts.UPSERTING_CONFLICT_CLAUSES', clear=True):
+            self.__add_carts()
+
+        self.__assert_carts()
+
+    def test_empty_counts(self):
+        with self.assertNumQueries(0):
+            add_carts(self.__shopper.id, {})
+
+
+class AnnotateCartStatusTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.__cart = CartFactory()
+
+    def __get_annotated_cart(self):
+        return annotate_cart_status(Cart.objects.filter(id=self.__cart.id)).get()
+
+    def test_available(self):
+        cart = self.__get_annotated_cart()
+
+        self.assertTrue(cart.is_available)
+        self.assertIsNone(cart.price_difference)
+
+    def test_unavailable(self):
+        Product.objects.filter(id=self.__cart.option.product_color.product_id).update(on_sale=False)
+
+        self.assertFalse(self.__get_annotated_cart().is_available)
+
+    def test_price_difference(self):
+        product = self.__cart.option.product_color.product
+        Cart.objects.filter(id=self.__cart.id).update(added_base_discounted_price=product.base_discounted_price + 500)
+
+        self.assertEqual(self.__get_annotated_cart().price_difference, -500)
@@ -0,0 +1,83 @@
+from io import StringIO
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .factories import UserFactory
+from ..models import OutstandingToken, BlacklistedToken
+from ..uniqueness import UNIQUE_VALUE_FILTERS
+
+
+class DeleteExpiredTokensCommandTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = UserFactory()
+        cls.__tokens = [RefreshToken.for_user(user) for _ in range(5)]
+        cls.__tokens[0].blacklist()
+        OutstandingToken.objects.filter(jti__in=[token['jti'] for token in cls.__tokens[:3]]) \
+            .update(expires_at=timezone.now() - timedelta(days=1))
+
+    def __call_command(self, *args):
+        stdout = StringIO()
+        call_command('delete_expired_tokens', *args, stdout=stdout)
+
+        return stdout.getvalue()
+
+    @patch('user.management.commands.delete_expired_tokens.time.sleep')
+    def test_delete_expired_tokens(self, mock):
+        output = self.__call_command('--batch-size', '2', '--interval', '0.5')
+
+        self.assertListEqual(
+            list(OutstandingToken.objects.order_by('id').values_list('jti', flat=True)), [token['jti'] for token in self.__tokens[3:]]
+        )
+        self.assertFalse(BlacklistedToken.objects.exists())
+        mock.assert_called_once_with(0.5)
+        self.assertIn('3 expired outstanding tokens to delete.', output)
+        self.assertIn('Deleted 2 outstanding tokens and 1 blacklisted tokens', output)
+        self.assertIn('1 remaining', output)
+        self.assertIn('0 remaining', output)
+        self.assertIn('2 outstanding tokens remain.', output)
+
+    def test_invalid_batch_size(self):
+        self.assertRaisesRegex(CommandError, r'^batch-size must be greater than 0.$', self.__call_command, '--batch-size', '0')
+
+    def test_invalid_interval(self):
+        self.assertRaisesRegex(CommandError, r'^interval must not be negative.$', self.__call_command, '--interval', '-1')
+
+
+class MeasureUniqueFiltersCommandTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        UserFactory.create_batch(3)
+
+    def __call_command(self, *args):
+        stdout = StringIO()
+        call_command('measure_unique_filters', *args, stdout=stdout)
+
+        return stdout.getvalue()
+
+    def test_measure(self):
+        output = self.__call_command('username', '--sample-size', '100')
+
+        self.assertTrue(output.startswith('username: 3 values'))
+        self.assertIn('measured false positive rate', output)
+
+    def test_keep_served_filters(self):
+        bloom_filter = UNIQUE_VALUE_FILTERS['username'].bloom_filter
+        self.__call_command('username', '--sample-size', '0')
+
+        self.assertIs(UNIQUE_VALUE_FILTERS['username'].bloom_filter, bloom_filter)
+
+    def test_measure_all_fields(self):
+        output = self.__call_command('--sample-size', '0')
+
+        self.assertEqual(len(output.splitlines()), len(UNIQUE_VALUE_FILTERS))
+
+    def test_invalid_field(self):
+        self.assertRaisesRegex(CommandError, r'^Invalid field name: invalid_field.$', self.__call_command, 'invalid_field')
@@ -1,6 +1,10 @@
+from unittest.mock import patch
+
+from django.db import connection
 from django.forms import model_to_dict
 from django.test import TestCase
 from django.contrib.auth.models import AnonymousUser
+from django.test.utils import CaptureQueriesContext
 
 from rest_framework.exceptions import APIException
 
@@ -173,6 +177,26 @@ class ShopperTestCase(ModelTestCase):
 
         self.assertEqual(self._shopper.nickname, self._test_data['username'])
         self.assertTrue(shopper.nickname.startswith('omios_'))
+
+    def test_check_default_nickname_candidates_in_a_single_query(self):
+        self._test_data['username'] = 'shopper2'
+        self._test_data['mobile_number'] = '01012341234'
+
+        with CaptureQueriesContext(connection) as context:
+            self._get_model_after_creation()
+
+        self.assertEqual(len([query for query in context.captured_queries if 'nickname' in query['sql'] and ' IN (' in query['sql']]), 1)
+
+    def test_retry_default_nickname_on_conflict(self):
+        self._test_data['username'] = 'shopper2'
+        self._test_data['mobile_number'] = '01012341234'
+
+        with patch('user.models.get_first_unused_value', side_effect=[self._shopper.nickname, 'omios_retried']) as mock:
+            shopper = self._get_model_after_creation()
+
+        self.assertEqual(mock.call_count, 2)
+        self.assertEqual(shopper.nickname, 'omios_retried')
+        self.assertTrue(shopper.check_password(self._test_data['password']))
     
     def test_delete(self):
         self._shopper.delete()
@@ -1,11 +1,15 @@
 from datetime import datetime, timedelta, date
 
 from rest_framework.exceptions import ValidationError
+from rest_framework_simplejwt.tokens import RefreshToken
 
 from common.test.test_cases import FunctionTestCase, SerializerTestCase, ListSerializerTestCase
 from common.utils import gmt_to_kst, datetime_to_iso, BASE_IMAGE_URL, DEFAULT_IMAGE_URL
 from coupon.test.factories import CouponFactory, CouponClassificationFactory
 from common.serializers import MAXIMUM_NUMBER_OF_ITEMS
+from common.models import TemporaryImage
+from common.test.factories import TemporaryImageFactory
+from common.images import get_image_variant_urls
 from coupon.models import CouponClassification, Coupon
 from product.test.factories import ProductFactory, ProductImageFactory, ProductColorFactory, OptionFactory
 from order.test.factories import create_orders_with_items, StatusFactory
@@ -14,10 +18,10 @@ from .factories import (
     MembershipFactory, UserFactory, ShopperFactory, WholesalerFactory, CartFactory, BuildingWithFloorFactory,
     ShopperShippingAddressFactory, PointHistoryFactory, ShopperCouponFactory,
 )
-from ..models import OutstandingToken, Floor
+from ..models import OutstandingToken, Floor, Cart
 from ..serializers import (
     get_token_time,
-    IssuingTokenSerializer, RefreshingTokenSerializer, RefreshToken, MembershipSerializer, 
+    IssuingTokenSerializer, RefreshingTokenSerializer, MembershipSerializer, 
     UserSerializer, ShopperSerializer, WholesalerSerializer, CartSerializer, BuildingSerializer, UserPasswordSerializer,
     ShopperShippingAddressSerializer, PointHistorySerializer, ShopperCouponSerializer,
 )
@@ -201,6 +205,24 @@ class WholesalerSerializerTestCase(SerializerTestCase):
             'is_approved': wholesaler.is_approved,
         })
 
+    def test_claim_business_registration_image(self):
+        image_url = TemporaryImageFactory(image_url='business_registration/business_registration_1.jpeg').image_url
+        self._get_serializer_after_validation(data={'business_registration_image_url': BASE_IMAGE_URL + image_url}, partial=True)
+
+        self.assertFalse(TemporaryImage.objects.filter(image_url=image_url).exists())
+
+    def test_raise_validation_error_on_unclaimed_business_registration_image(self):
+        self._test_serializer_raise_validation_error(
+            'business_registration/missing.jpeg is not found.',
+            data={'business_registration_image_url': BASE_IMAGE_URL + 'business_registration/missing.jpeg'}, partial=True
+        )
+
+    def test_keep_business_registration_image_on_update(self):
+        wholesaler = WholesalerFactory()
+        self._get_serializer_after_validation(
+            wholesaler, data={'business_registration_image_url': wholesaler.business_registration_image_url.name}, partial=True
+        )
+
 
 class CartSerializerTestCase(SerializerTestCase):
     _serializer_class = CartSerializer
@@ -223,6 +245,7 @@ class CartSerializerTestCase(SerializerTestCase):
             'product_id': self.__cart.option.product_color.product.id,
             'product_name': self.__cart.option.product_color.product.name,
             'image': BASE_IMAGE_URL + self.__cart.option.product_color.product.images.all()[0].image_url,
+            'image_variants': get_image_variant_urls(self.__cart.option.product_color.product.images.all()[0]),
             'base_discounted_price': self.__cart.option.product_color.product.base_discounted_price * self.__cart.count,
         })
 
@@ -239,6 +262,7 @@ class CartSerializerTestCase(SerializerTestCase):
             'product_id': cart.option.product_color.product.id,
             'product_name': cart.option.product_color.product.name,
             'image': DEFAULT_IMAGE_URL,
+            'image_variants': None,
             'base_discounted_price': cart.option.product_color.product.base_discounted_price * cart.count,
         })
 
@@ -270,6 +294,7 @@ class CartListSerializerTestCase(ListSerializerTestCase):
                 'product_id': product.id,
                 'product_name': product.name,
                 'image': BASE_IMAGE_URL + product.images.all()[0].image_url,
+                'image_variants': get_image_variant_urls(product.images.all()[0]),
                 'carts': [
                     {
                         'id': cart.id,
@@ -285,6 +310,22 @@ class CartListSerializerTestCase(ListSerializerTestCase):
 
         self.assertListEqual(expected_data, serializer.data)
 
+    def test_totals(self):
+        serializer = self._get_serializer(self.__shopper.carts.all())
+        serializer.data
+        carts = self.__shopper.carts.all()
+
+        self.assertDictEqual(serializer.totals, {
+            'total_sale_price': sum(cart.option.product_color.product.sale_price * cart.count for cart in carts),
+            'total_base_discounted_price': sum(cart.option.product_color.product.base_discounted_price * cart.count for cart in carts),
+        })
+
+    def test_totals_of_empty_carts(self):
+        serializer = self._get_serializer(Cart.objects.none())
+        serializer.data
+
+        self.assertDictEqual(serializer.totals, {'total_sale_price': None, 'total_base_discounted_price': None})
+
     def test_validate_count_of_carts(self):
         product_color = ProductColorFactory(product=self.__product_1)
         data = [{'option': OptionFactory(product_color=product_color).id, 'count': 1} for _ in range(MAXIMUM_NUMBER_OF_ITEMS)]
@@ -306,6 +347,7 @@ class CartListSerializerTestCase(ListSerializerTestCase):
         self.assertEqual(cart.option.id, data[0]['option']),
         self.assertEqual(cart.shopper, self.__shopper)
         self.assertEqual(cart.count, data[0]['count'])
+        self.assertEqual(cart.added_base_discounted_price, self.__product_1.base_discounted_price)
 
     def test_create_option_already_exists(self):
         cart = self.__shopper.carts.first()
@@ -320,6 +362,16 @@ class CartListSerializerTestCase(ListSerializerTestCase):
         self.assertEqual(updated_cart, cart)
         self.assertEqual(updated_cart.count, cart.count + data[0]['count'])
 
+    def test_create_in_constant_number_of_queries(self):
+        data = [{'option': cart.option.id, 'count': 1} for cart in self.__shopper.carts.all()]
+        data += [{'option': OptionFactory(product_color=self.__product_color_1).id, 'count': 1} for _ in range(5)]
+
+        with self.assertNumQueries(3):
+            serializer = self._get_serializer_after_validation(data=data, context={'shopper': self.__shopper})
+            serializer.save()
+
+        self.assertEqual(self.__shopper.carts.count(), 9)
+
 
 class BuildingSerializerTestCase(SerializerTestCase):
     _serializer_class = BuildingSerializer
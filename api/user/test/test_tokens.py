@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .factories import UserFactory
+from ..models import OutstandingToken, BlacklistedToken
+from ..serializers import RefreshingTokenSerializer
+from ..tokens import RotatingRefreshToken, blacklist_token_by_jti, blacklist_user_tokens, delete_expired_tokens
+
+
+class BlacklistTokenByJtiTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.__token = RefreshToken.for_user(UserFactory())
+
+    def test_blacklist(self):
+        with self.assertNumQueries(3):
+            self.assertEqual(blacklist_token_by_jti(self.__token['jti']), 1)
+
+        self.assertTrue(BlacklistedToken.objects.filter(token__jti=self.__token['jti']).exists())
+
+    def test_raise_token_error_on_blacklisted_token(self):
+        blacklist_token_by_jti(self.__token['jti'])
+
+        self.assertRaisesRegex(TokenError, r'^Token is blacklisted$', blacklist_token_by_jti, self.__token['jti'])
+
+    def test_non_outstanding_token(self):
+        self.assertEqual(blacklist_token_by_jti('non_outstanding_jti'), 0)
+
+
+class BlacklistUserTokensTestCase(APITestCase):
+    def test_blacklist_user_tokens(self):
+        user = UserFactory()
+        tokens = [RefreshToken.for_user(user) for _ in range(3)]
+        tokens[0].blacklist()
+        OutstandingToken.objects.filter(jti=tokens[1]['jti']).update(expires_at=timezone.now())
+        other_token = RefreshToken.for_user(UserFactory())
+
+        with self.assertNumQueries(1):
+            self.assertEqual(blacklist_user_tokens(user.id), 1)
+
+        self.assertEqual(BlacklistedToken.objects.filter(token__user=user).count(), 2)
+        self.assertTrue(BlacklistedToken.objects.filter(token__jti=tokens[2]['jti']).exists())
+        self.assertFalse(BlacklistedToken.objects.filter(token__jti=other_token['jti']).exists())
+
+
+class DeleteExpiredTokensTestCase(APITestCase):
+    def test_delete_expired_tokens(self):
+        user = UserFactory()
+        tokens = [RefreshToken.for_user(user) for _ in range(5)]
+        tokens[0].blacklist()
+        tokens[4].blacklist()
+        OutstandingToken.objects.filter(jti__in=[token['jti'] for token in tokens[:3]]).update(expires_at=timezone.now() - timedelta(days=1))
+
+        self.assertEqual(delete_expired_tokens(batch_size=2), 3)
+        self.assertListEqual(
+            list(OutstandingToken.objects.order_by('id').values_list('jti', flat=True)), [token['jti'] for token in tokens[3:]]
+        )
+        self.assertListEqual(list(BlacklistedToken.objects.values_list('token__jti', flat=True)), [tokens[4]['jti']])
+
+
+class RotatingRefreshTokenTestCase(APITestCase):
+    def test_skip_blacklist_query_on_creation(self):
+        token = str(RefreshToken.for_user(UserFactory()))
+
+        with self.assertNumQueries(0):
+            RotatingRefreshToken(token)
+
+    def test_blacklist_non_outstanding_token(self):
+        token = RotatingRefreshToken.for_user(UserFactory())
+        OutstandingToken.objects.filter(jti=token['jti']).delete()
+        token.blacklist()
+
+        self.assertTrue(BlacklistedToken.objects.filter(token__jti=token['jti']).exists())
+
+    def test_number_of_refreshing_queries(self):
+        token = str(RefreshToken.for_user(UserFactory()))
+        serializer = RefreshingTokenSerializer(data={'refresh': token})
+
+        with self.assertNumQueries(4):
+            serializer.is_valid(raise_exception=True)
+
+        self.assertRaisesRegex(TokenError, r'^Token is blacklisted$', RotatingRefreshToken(token).blacklist)
@@ -0,0 +1,172 @@
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.utils import timezone
+
+from rest_framework.test import APITestCase
+
+from .factories import UserFactory, ShopperFactory, WholesalerFactory
+from ..models import User, UniqueValueChange
+from ..uniqueness import UNIQUE_VALUE_FILTERS, UniqueValueFilter, normalize_unique_value
+
+
+class NormalizeUniqueValueTestCase(APITestCase):
+    def test_normalize(self):
+        self.assertEqual(normalize_unique_value('Omios_User  '), 'omios_user')
+
+
+class UniqueValueFilterTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.__user = UserFactory()
+
+    def setUp(self):
+        self.__filter = UniqueValueFilter('user.User', 'username')
+        self.__filter.build()
+
+    def test_absent_value_without_query(self):
+        with self.assertNumQueries(0):
+            self.assertFalse(self.__filter.exists('absent_username'))
+
+    def test_existing_value(self):
+        with self.assertNumQueries(1):
+            self.assertTrue(self.__filter.exists(self.__user.username))
+
+    def test_fall_through_regardless_of_case(self):
+        with self.assertNumQueries(1):
+            self.__filter.exists(self.__user.username.upper())
+
+    def test_refresh(self):
+        User.objects.bulk_create([User(username='bulk_created_user', password='password', last_update_password=self.__user.created_at)])
+        self.__filter.refresh()
+
+        self.assertTrue(self.__filter.exists('bulk_created_user'))
+
+    def test_refresh_updated_value(self):
+        UniqueValueChange.objects.create(model_label='user.User', column='username', value='updated_username')
+        self.__filter.refresh()
+
+        self.assertIn('updated_username', self.__filter.bloom_filter)
+
+    def test_log_statistics_on_refresh(self):
+        with self.assertLogs('user.uniqueness', 'INFO') as logs:
+            self.__filter.refresh()
+
+        self.assertIn('observed_false_positive_rate', logs.output[0])
+
+    def test_statistics(self):
+        self.__filter.add('false_positive_username')
+        self.__filter.exists('false_positive_username')
+        self.__filter.exists('absent_username')
+        self.__filter.exists(self.__user.username)
+        statistics = self.__filter.get_statistics()
+
+        self.assertEqual(statistics['lookup_count'], 3)
+        self.assertEqual(statistics['query_count'], 2)
+        self.assertEqual(statistics['false_positive_count'], 1)
+        self.assertEqual(statistics['observed_false_positive_rate'], 0.5)
+
+
+class ImmediateThread:
+    def __init__(self, target, args, daemon):
+        self.__target = target
+        self.__args = args
+
+    def start(self):
+        self.__target(*self.__args)
+
+
+@patch('user.uniqueness.connections')
+@patch('user.uniqueness.Thread', ImmediateThread)
+class UniqueValueFilterMaintenanceTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.__user = UserFactory()
+
+    def setUp(self):
+        self.__filter = UniqueValueFilter('user.User', 'username')
+
+    def test_fall_through_before_build(self, *mocks):
+        with self.assertNumQueries(1):
+            self.assertTrue(self.__filter.exists(self.__user.username))
+
+        self.assertIsNone(self.__filter.bloom_filter)
+
+    def test_start(self, *mocks):
+        self.__filter.start()
+
+        with self.assertNumQueries(0):
+            self.assertFalse(self.__filter.exists('absent_username'))
+
+    def test_keep_values_added_during_build(self, *mocks):
+        get_rows = self.__filter._UniqueValueFilter__get_rows
+
+        def add_during_build(queryset):
+            self.__filter.add('added_username')
+            return get_rows(queryset)
+
+        with patch.object(self.__filter, '_UniqueValueFilter__get_rows', add_during_build):
+            self.__filter.build()
+
+        self.assertIn('added_username', self.__filter.bloom_filter)
+
+    def test_refresh_in_background(self, *mocks):
+        self.__filter.start()
+        User.objects.bulk_create([User(username='bulk_created_user', password='password', last_update_password=self.__user.created_at)])
+
+        with patch('user.uniqueness.time.monotonic', return_value=time.monotonic() + 60):
+            self.assertTrue(self.__filter.exists('bulk_created_user'))
+
+    def test_skip_maintenance_of_unstarted_filter(self, *mocks):
+        self.__filter.build()
+        User.objects.bulk_create([User(username='bulk_created_user', password='password', last_update_password=self.__user.created_at)])
+
+        with patch('user.uniqueness.time.monotonic', return_value=time.monotonic() + 60):
+            self.assertFalse(self.__filter.exists('bulk_created_user'))
+
+
+class AddUniqueValuesTestCase(APITestCase):
+    def setUp(self):
+        for unique_value_filter in UNIQUE_VALUE_FILTERS.values():
+            unique_value_filter.build()
+
+    def __assert_in_filter(self, key, value):
+        self.assertIn(normalize_unique_value(value), UNIQUE_VALUE_FILTERS[key].bloom_filter)
+
+    def test_add_shopper_values(self):
+        shopper = ShopperFactory()
+
+        self.__assert_in_filter('username', shopper.username)
+        self.__assert_in_filter('shopper_nickname', shopper.nickname)
+
+    def test_add_wholesaler_values(self):
+        wholesaler = WholesalerFactory()
+
+        self.__assert_in_filter('username', wholesaler.username)
+        self.__assert_in_filter('wholesaler_name', wholesaler.name)
+        self.__assert_in_filter('wholesaler_company_registration_number', wholesaler.company_registration_number)
+
+    def test_add_updated_value(self):
+        shopper = ShopperFactory()
+        shopper.nickname = 'updated_nickname'
+        shopper.save(update_fields=['nickname'])
+
+        self.__assert_in_filter('shopper_nickname', 'updated_nickname')
+
+    def test_share_updated_value(self):
+        shopper = ShopperFactory()
+        unique_value_filter = UniqueValueFilter('user.Shopper', 'nickname')
+        unique_value_filter.build()
+        shopper.nickname = 'updated_nickname'
+        shopper.save(update_fields=['nickname'])
+        unique_value_filter.refresh()
+
+        self.assertIn('updated_nickname', unique_value_filter.bloom_filter)
+
+    def test_delete_expired_changes_on_build(self):
+        change = UniqueValueChange.objects.create(model_label='user.Shopper', column='nickname', value='expired_nickname')
+        UniqueValueChange.objects.filter(id=change.id).update(created_at=timezone.now() - timedelta(days=1))
+        UNIQUE_VALUE_FILTERS['shopper_nickname'].build()
+
+        self.assertFalse(UniqueValueChange.objects.filter(id=change.id).exists())
@@ -1,6 +1,10 @@
 from datetime import date, timedelta
+from unittest.mock import patch
 
+from django.db import connection
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.forms import model_to_dict
+from django.test.utils import CaptureQueriesContext
 from django.db.models import Sum, F, Case, When
 
 from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
@@ -8,10 +12,11 @@ from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 from freezegun import freeze_time
 
 from common.test.test_cases import ViewTestCase, FREEZE_TIME
-from common.utils import datetime_to_iso
+from common.utils import datetime_to_iso, BASE_IMAGE_URL
+from common.test.factories import TemporaryImageFactory
 from coupon.test.factories import CouponFactory, CouponClassificationFactory
 from coupon.serializers import CouponSerializer
-from product.test.factories import ProductFactory, ProductColorFactory, OptionFactory
+from product.test.factories import ProductFactory, ProductColorFactory, ProductImageFactory, OptionFactory
 from .factories import (
     MembershipFactory, get_factory_password, get_factory_authentication_data, 
     FloorFactory, BuildingFactory, ShopperShippingAddressFactory, PointHistoryFactory, CartFactory,
@@ -25,6 +30,7 @@ from ..serializers import (
     BuildingSerializer, ShopperShippingAddressSerializer, PointHistorySerializer, ShopperCouponSerializer,
 )
 from ..views import PointHistoryView
+from ..carts import annotate_cart_status
 from ..paginations import PointHistoryPagination
 
 
@@ -235,6 +241,7 @@ class WholesalerViewSetTestCase(ViewTestCase):
             "base_address": "서울특별시 중구 다산로 293 (신당동, 디오트)",
             "detail_address": "디오트 1층 102호"
         }
+        TemporaryImageFactory(image_url=self._test_data['business_registration_image_url'].split(BASE_IMAGE_URL)[-1])
         self._post()
         user = Wholesaler.objects.get(username=self._test_data['username'])
 
@@ -272,6 +279,13 @@ class UploadBusinessRegistrationImageTestCase(ViewTestCase):
     def test_success(self):
        self._test_image_upload(middle_path='/business_registration/business_registration_')
 
+    @patch('common.storage.MediaStorage.save')
+    def test_reject_non_image_file_while_streaming(self, mock):
+        self._post({'image': [SimpleUploadedFile('document.pdf', b'content', content_type='application/pdf')]}, 400)
+
+        self._assert_failure(400, ['document.pdf is not an image file.'])
+        mock.assert_not_called()
+
 
 class GetBuildingTestCase(ViewTestCase):
     _url = '/users/wholesalers/buildings'
@@ -464,13 +478,55 @@ class CartViewSetTestCase(ViewTestCase):
             total_sale_price=Sum(F('option__product_color__product__sale_price') * F('count')),
             total_base_discounted_price=Sum(F('option__product_color__product__base_discounted_price') * F('count'))
         )
-        serializer = CartSerializer(queryset, many=True)
+        serializer = CartSerializer(annotate_cart_status(queryset), many=True)
         self._get()
 
         self.assertListEqual(self._response_data['results'], serializer.data)
         self.assertEqual(self._response_data['total_sale_price'], aggregate_data['total_sale_price'])
         self.assertEqual(self._response_data['total_base_discounted_price'], aggregate_data['total_base_discounted_price'])
 
+    def test_list_in_constant_number_of_queries(self):
+        self._get()
+        with CaptureQueriesContext(connection) as context:
+            self._get()
+
+        for _ in range(3):
+            product_color = ProductColorFactory()
+            ProductImageFactory.create_batch(2, product=product_color.product)
+            CartFactory.create_batch(2, option__product_color=product_color, shopper=self._user)
+
+        with self.assertNumQueries(len(context.captured_queries)):
+            self._get()
+
+        self.assertEqual(len(self._response_data['results']), 4)
+
+    def test_list_sparse_fields(self):
+        with CaptureQueriesContext(connection) as context:
+            self._get({'fields': 'id,count'})
+
+        self.assertCountEqual(self._response_data['results'][0]['carts'], [{'id': cart.id, 'count': cart.count} for cart in self.__carts])
+        self.assertIn('image', self._response_data['results'][0])
+        self.assertFalse(any('"setting_item"' in query['sql'] for query in context.captured_queries))
+
+    def test_failure_unavailable_sparse_fields(self):
+        self._get({'fields': 'id,product_name'})
+
+        self._assert_failure(400, 'Query parameter fields contains unavailable fields: product_name.')
+
+    def test_list_availability_and_price_difference(self):
+        product = self.__product_color.product
+        self.__carts[0].added_base_discounted_price = product.base_discounted_price - 1000
+        self.__carts[0].save(update_fields=['added_base_discounted_price'])
+        self.__carts[1].option.on_sale = False
+        self.__carts[1].option.save(update_fields=['on_sale'])
+        self._get()
+        carts = {cart['id']: cart for cart in self._response_data['results'][0]['carts']}
+
+        self.assertTrue(carts[self.__carts[0].id]['is_available'])
+        self.assertEqual(carts[self.__carts[0].id]['price_difference'], 1000)
+        self.assertFalse(carts[self.__carts[1].id]['is_available'])
+        self.assertIsNone(carts[self.__carts[1].id]['price_difference'])
+
     def test_create(self):
         self._test_data = [{
             'option': OptionFactory(product_color=self.__product_color).id,
@@ -552,6 +608,15 @@ class CartViewSetTestCase(ViewTestCase):
         
         self._assert_failure(403, 'You do not have permission to perform this action.')
 
+    def test_remove_unavailable(self):
+        unavailable_cart = CartFactory(option__product_color__on_sale=False, shopper=self._user)
+        self._url += '/remove-unavailable'
+        self._post(status_code=200)
+
+        self._assert_success()
+        self.assertListEqual(self._response_data['id'], [unavailable_cart.id])
+        self.assertListEqual(list(self._user.carts.order_by('id').values_list('id', flat=True)), [cart.id for cart in self.__carts])
+
 
 class ShopperShippingAddressViewSetTestCase(ViewTestCase):
     _url = '/users/shoppers/addresses'
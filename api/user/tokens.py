@@ -0,0 +1,93 @@
+from django.db import connection, transaction, IntegrityError
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
+
+
+EXPIRED_TOKEN_DELETION_BATCH_SIZE = 1000
+
+
+def _get_blacklisting_sql(condition):
+    return (
+        'INSERT INTO {blacklisted_token} (token_id, blacklisted_at) '
+        'SELECT outstanding_token.id, %s FROM {outstanding_token} outstanding_token '
+        'WHERE {condition}'
+    ).format(
+        blacklisted_token=connection.ops.quote_name(BlacklistedToken._meta.db_table),
+        outstanding_token=connection.ops.quote_name(OutstandingToken._meta.db_table),
+        condition=condition,
+    )
+
+
+def _execute(sql, params):
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def _get_now_value():
+    return connection.ops.adapt_datetimefield_value(timezone.now())
+
+
+def blacklist_token_by_jti(jti):
+    sql = _get_blacklisting_sql('outstanding_token.jti = %s')
+
+    try:
+        with transaction.atomic():
+            return _execute(sql, [_get_now_value(), jti])
+    except IntegrityError:
+        raise TokenError(_('Token is blacklisted'))
+
+
+def blacklist_user_tokens(user_id):
+    sql = _get_blacklisting_sql(
+        'outstanding_token.user_id = %s AND outstanding_token.expires_at > %s AND NOT EXISTS '
+        '(SELECT 1 FROM {} blacklisted_token WHERE blacklisted_token.token_id = outstanding_token.id)'.format(
+            connection.ops.quote_name(BlacklistedToken._meta.db_table)
+        )
+    )
+    now = _get_now_value()
+
+    return _execute(sql, [now, user_id, now])
+
+
+def get_expired_tokens(expires_at=None):
+    return OutstandingToken.objects.filter(expires_at__lte=expires_at or timezone.now())
+
+
+def iterate_expired_token_deletion(batch_size=EXPIRED_TOKEN_DELETION_BATCH_SIZE):
+    queryset = get_expired_tokens().order_by('id')
+    last_id = 0
+
+    while True:
+        token_id_list = list(queryset.filter(id__gt=last_id).values_list('id', flat=True)[:batch_size])
+        if not token_id_list:
+            return
+
+        with transaction.atomic():
+            blacklisted_token_count = BlacklistedToken.objects.filter(token_id__in=token_id_list).delete()[0]
+            OutstandingToken.objects.filter(id__in=token_id_list).delete()
+
+        last_id = token_id_list[-1]
+        yield len(token_id_list), blacklisted_token_count
+
+        if len(token_id_list) < batch_size:
+            return
+
+
+def delete_expired_tokens(batch_size=EXPIRED_TOKEN_DELETION_BATCH_SIZE):
+    return sum(outstanding_token_count for outstanding_token_count, blacklisted_token_count in iterate_expired_token_deletion(batch_size))
+
+
+class RotatingRefreshToken(RefreshToken):
+    def check_blacklist(self):
+        # Membership is decided by blacklist(): inserting the blacklist row fails if the token is already blacklisted.
+        pass
+
+    def blacklist(self):
+        if not blacklist_token_by_jti(self.payload[api_settings.JTI_CLAIM]):
+            return super().blacklist()
@@ -0,0 +1,202 @@
+import time
+import logging
+from threading import Lock, Thread
+
+from datetime import timedelta
+
+from django.apps import apps
+from django.db import connections
+from django.db.models import Max
+from django.utils import timezone
+
+from common.bloom_filter import BloomFilter
+
+
+UNIQUE_VALUE_FILTER_FALSE_POSITIVE_RATE = 0.01
+UNIQUE_VALUE_FILTER_MINIMUM_CAPACITY = 10000
+UNIQUE_VALUE_FILTER_REFRESH_INTERVAL = 60
+UNIQUE_VALUE_FILTER_REBUILD_INTERVAL = 3600
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_unique_value(value):
+    return str(value).rstrip().casefold()
+
+
+class UniqueValueFilter:
+    """
+    A bloom filter of the values of a unique column, which answers definite misses without a query.
+
+    Building and refreshing scan the table, so request threads never do it. A started filter is built, refreshed and
+    rebuilt on a background thread and swapped in when ready, and lookups fall through to the database until then.
+    Refreshing reads the rows inserted since the last refresh, and the values updated on existing rows from the shared
+    UniqueValueChange log, so every worker sees the changes made by the others.
+    """
+    def __init__(self, model_label, column):
+        self.model_label = model_label
+        self.column = column
+        self.bloom_filter = None
+        self.lookup_count = self.query_count = self.false_positive_count = 0
+        self.__last_pk = self.__last_change_id = 0
+        self.__built_at = self.__refreshed_at = 0
+        self.__pending_values = None
+        self.__started = self.__maintaining = False
+        self.__lock = Lock()
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def __add_rows(self, bloom_filter, rows):
+        last_pk = None
+        for pk, value in rows:
+            bloom_filter.add(normalize_unique_value(value))
+            last_pk = pk
+
+        return last_pk
+
+    def __get_rows(self, queryset):
+        return queryset.order_by('pk').values_list('pk', self.column).iterator()
+
+    def __get_changes(self):
+        return apps.get_model('user.UniqueValueChange').objects.filter(model_label=self.model_label, column=self.column)
+
+    def __delete_expired_changes(self):
+        expired_at = timezone.now() - timedelta(seconds=UNIQUE_VALUE_FILTER_REBUILD_INTERVAL * 2)
+        self.__get_changes().filter(created_at__lt=expired_at).delete()
+
+    def build(self, false_positive_rate=UNIQUE_VALUE_FILTER_FALSE_POSITIVE_RATE):
+        with self.__lock:
+            self.__pending_values = []
+
+        self.__delete_expired_changes()
+        last_change_id = self.__get_changes().aggregate(last_id=Max('id'))['last_id'] or 0
+        queryset = self.model.objects.all()
+        bloom_filter = BloomFilter(max(queryset.count() * 2, UNIQUE_VALUE_FILTER_MINIMUM_CAPACITY), false_positive_rate)
+        last_pk = self.__add_rows(bloom_filter, self.__get_rows(queryset)) or 0
+
+        with self.__lock:
+            for value in self.__pending_values:
+                bloom_filter.add(value)
+            self.__pending_values = None
+            self.__last_pk = last_pk
+            self.__last_change_id = last_change_id
+            self.bloom_filter = bloom_filter
+            self.__built_at = self.__refreshed_at = time.monotonic()
+
+        return bloom_filter
+
+    def refresh(self):
+        rows = list(self.__get_rows(self.model.objects.filter(pk__gt=self.__last_pk)))
+        changes = list(self.__get_changes().filter(id__gt=self.__last_change_id).order_by('id').values_list('id', 'value'))
+
+        with self.__lock:
+            last_pk = self.__add_rows(self.bloom_filter, rows)
+            if last_pk is not None:
+                self.__last_pk = last_pk
+            last_change_id = self.__add_rows(self.bloom_filter, changes)
+            if last_change_id is not None:
+                self.__last_change_id = last_change_id
+            self.__refreshed_at = time.monotonic()
+
+        logger.info('Unique value filter of %s.%s: %s', self.model_label, self.column, self.get_statistics())
+
+    def __maintain(self, task):
+        try:
+            task()
+        except Exception:
+            logger.exception('Failed to maintain the unique value filter of %s.%s.', self.model_label, self.column)
+        finally:
+            connections.close_all()
+            self.__maintaining = False
+
+    def __schedule(self, task):
+        with self.__lock:
+            if self.__maintaining:
+                return
+            self.__maintaining = True
+
+        Thread(target=self.__maintain, args=(task,), daemon=True).start()
+
+    def start(self):
+        self.__started = True
+        self.__schedule(self.build)
+
+    def __schedule_maintenance(self):
+        if not self.__started or self.bloom_filter is None:
+            return
+
+        now = time.monotonic()
+        if self.bloom_filter.count > self.bloom_filter.capacity or now - self.__built_at >= UNIQUE_VALUE_FILTER_REBUILD_INTERVAL:
+            self.__schedule(self.build)
+        elif now - self.__refreshed_at >= UNIQUE_VALUE_FILTER_REFRESH_INTERVAL:
+            self.__schedule(self.refresh)
+
+    def add(self, value):
+        if value is None:
+            return
+
+        with self.__lock:
+            if self.__pending_values is not None:
+                self.__pending_values.append(normalize_unique_value(value))
+            if self.bloom_filter is not None:
+                self.bloom_filter.add(normalize_unique_value(value))
+
+    def exists(self, value):
+        self.__schedule_maintenance()
+        bloom_filter = self.bloom_filter
+        if bloom_filter is None:
+            return self.model.objects.filter(**{self.column: value}).exists()
+
+        self.lookup_count += 1
+        if normalize_unique_value(value) not in bloom_filter:
+            return False
+
+        self.query_count += 1
+        if self.model.objects.filter(**{self.column: value}).exists():
+            return True
+
+        self.false_positive_count += 1
+        return False
+
+    def get_statistics(self):
+        absent_lookup_count = self.lookup_count - self.query_count + self.false_positive_count
+
+        return {
+            'count': self.bloom_filter.count if self.bloom_filter is not None else 0,
+            'lookup_count': self.lookup_count,
+            'query_count': self.query_count,
+            'false_positive_count': self.false_positive_count,
+            'estimated_false_positive_rate': self.bloom_filter.get_estimated_false_positive_rate() if self.bloom_filter is not None else 0,
+            'observed_false_positive_rate': self.false_positive_count / absent_lookup_count if absent_lookup_count else 0,
+        }
+
+
+UNIQUE_VALUE_FILTERS = {
+    'username': UniqueValueFilter('user.User', 'username'),
+    'shopper_nickname': UniqueValueFilter('user.Shopper', 'nickname'),
+    'wholesaler_name': UniqueValueFilter('user.Wholesaler', 'name'),
+    'wholesaler_company_registration_number': UniqueValueFilter('user.Wholesaler', 'company_registration_number'),
+}
+
+
+def add_unique_values(instance, update_fields=None):
+    changes = []
+    for unique_value_filter in UNIQUE_VALUE_FILTERS.values():
+        if isinstance(instance, unique_value_filter.model) \
+            and (update_fields is None or unique_value_filter.column in update_fields):
+            value = getattr(instance, unique_value_filter.column)
+            unique_value_filter.add(value)
+            if update_fields is not None and value is not None:
+                changes.append(apps.get_model('user.UniqueValueChange')(
+                    model_label=unique_value_filter.model_label, column=unique_value_filter.column, value=value
+                ))
+
+    if changes:
+        apps.get_model('user.UniqueValueChange').objects.bulk_create(changes)
+
+
+def start_unique_value_filters():
+    for unique_value_filter in UNIQUE_VALUE_FILTERS.values():
+        unique_value_filter.start()
@@ -3,7 +3,7 @@ from datetime import date
 from django.db.models.query import Prefetch
 from django.shortcuts import get_object_or_404
 from django.db import connection, transaction
-from django.db.models import Sum, F, Case, When
+from django.db.models import Case, When
 
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.views import APIView
@@ -12,26 +12,29 @@ from rest_framework.viewsets import GenericViewSet
 from rest_framework.mixins import ListModelMixin
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.views import TokenViewBase
 
-from common.utils import get_response, get_response_body
+from common.utils import get_response, get_response_body, get_paginated_data, get_sparse_fields
 from common.views import upload_image_view
 from common.permissions import IsAuthenticatedShopper, IsAuthenticatedWholesaler
 from product.models import Product
 from coupon.serializers import CouponSerializer
 from coupon.models import Coupon
 from .models import (
-    ShopperShippingAddress, User, Shopper, Wholesaler, Building, ProductLike, PointHistory, Cart,
+    ShopperShippingAddress, Shopper, Wholesaler, Building, ProductLike, PointHistory, Cart,
     ShopperCoupon,
 )
 from .serializers import (
-    IssuingTokenSerializer, RefreshingTokenSerializer, TokenBlacklistSerializer,
+    IssuingTokenSerializer, RefreshingTokenSerializer, BlacklistingTokenSerializer,
     UserPasswordSerializer, ShopperSerializer, WholesalerSerializer, BuildingSerializer,
     ShopperShippingAddressSerializer, PointHistorySerializer, CartSerializer, ShopperCouponSerializer,
+    CART_PRODUCT_FIELDS, CART_REQUIRED_FIELDS,
 )
 from .paginations import PointHistoryPagination
 from .permissions import AllowAny, IsAuthenticated, IsAuthenticatedExceptCreate
+from .authentication import CachedJWTAuthentication
+from .uniqueness import UNIQUE_VALUE_FILTERS
+from .carts import annotate_cart_status, get_availability_condition
 
 
 @api_view(['POST'])
@@ -60,21 +63,13 @@ def change_password(request):
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def is_unique(request):
-    mapping = {
-        'username': {'model': User, 'column': 'username'},
-        'shopper_nickname': {'model': Shopper, 'column': 'nickname'},
-        'wholesaler_name': {'model': Wholesaler, 'column': 'name'},
-        'wholesaler_company_registration_number': {'model': Wholesaler, 'column': 'company_registration_number'},
-    }
-
     request_data = list(request.query_params.items())
     if len(request.query_params) != 1:
         return get_response(status=HTTP_400_BAD_REQUEST, message='Only one parameter is allowed.')
-    elif request_data[0][0] not in mapping.keys():
+    elif request_data[0][0] not in UNIQUE_VALUE_FILTERS.keys():
         return get_response(status=HTTP_400_BAD_REQUEST, message='Invalid parameter name.')
 
-    mapping_data = mapping[request_data[0][0]]
-    if mapping_data['model'].objects.filter(**{mapping_data['column']: request_data[0][1]}).exists():
+    if UNIQUE_VALUE_FILTERS[request_data[0][0]].exists(request_data[0][1]):
         return get_response(data={'is_unique': False})
 
     return get_response(data={'is_unique': True})
@@ -94,9 +89,9 @@ class RefreshingTokenView(TokenView):
 
 
 class BlacklistingTokenView(TokenView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAuthenticated]
-    serializer_class = TokenBlacklistSerializer
+    serializer_class = BlacklistingTokenSerializer
 
     def post(self, request, *args, **kwargs):
         response = super().post(request, *args, **kwargs)
@@ -180,7 +175,7 @@ class PointHistoryView(GenericAPIView):
     def get(self, request):
         serializer = self.get_serializer(self.paginate_queryset(self.get_queryset()), many=True)
 
-        return get_response(data=self.get_paginated_response(serializer.data).data)
+        return get_response(data=get_paginated_data(self.paginator, serializer.data))
 
 
 class ProductLikeView(APIView):
@@ -217,31 +212,45 @@ class ProductLikeView(APIView):
 class CartViewSet(GenericViewSet):
     permission_classes = [IsAuthenticatedShopper]
     serializer_class = CartSerializer
+    read_replica_actions = ('list',)
     lookup_field = 'id'
     lookup_url_kwarg = 'cart_id'
     lookup_value_regex = r'[0-9]+'
     __patchable_fields = set(['count'])
     pagination_class = None
 
+    def __get_cart_fields(self):
+        available_fields = [field for field in CartSerializer().fields if field not in CART_PRODUCT_FIELDS]
+
+        return get_sparse_fields(self.request.query_params, available_fields)
+
     def get_queryset(self):
         queryset = self.request.user.shopper.carts.all()
         if self.action == 'list':
-            queryset = queryset.select_related(
-                'option__product_color__product'
-            ).prefetch_related('option__product_color__product__images')
+            cart_fields = self.__get_cart_fields()
+            queryset = queryset.select_related('option__product_color__product'). \
+                prefetch_related('option__product_color__product__images')
+
+            if cart_fields is None or 'size' in cart_fields:
+                queryset = queryset.select_related('option__size')
+            if cart_fields is None or 'is_available' in cart_fields or 'price_difference' in cart_fields:
+                queryset = annotate_cart_status(queryset)
 
         return queryset
 
     def list(self, request):
+        cart_fields = self.__get_cart_fields()
         queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        aggregate_data = queryset.aggregate(
-            total_sale_price=Sum(F('option__product_color__product__sale_price') * F('count')),
-            total_base_discounted_price=Sum(F('option__product_color__product__base_discounted_price') * F('count'))
-        )
+        if cart_fields is None:
+            serializer = self.get_serializer(queryset, many=True)
+        else:
+            allow_fields = list(CART_REQUIRED_FIELDS) + [field for field in cart_fields if field not in CART_REQUIRED_FIELDS]
+            serializer = self.get_serializer(
+                queryset, many=True, allow_fields=allow_fields, context=dict(self.get_serializer_context(), cart_fields=cart_fields)
+            )
 
         response_data = {'results': serializer.data}
-        response_data.update(aggregate_data)
+        response_data.update(serializer.totals)
 
         return get_response(data=response_data)
 
@@ -274,6 +283,14 @@ class CartViewSet(GenericViewSet):
         if queryset.filter(id__in=delete_id_list).count() != len(delete_id_list):
             raise PermissionDenied()
 
+        return self.__delete(delete_id_list)
+
+    def remove_unavailable(self, request):
+        delete_id_list = list(self.get_queryset().exclude(get_availability_condition()).values_list('id', flat=True))
+
+        return self.__delete(delete_id_list)
+
+    def __delete(self, delete_id_list):
         self.get_queryset().filter(id__in=delete_id_list).delete()
 
         return get_response(data={'id': delete_id_list})